@@ -1,17 +1,37 @@
 from flask import Flask
 from flask_cors import CORS
 from auth import auth_bp
+from db import create_indexes_command
 from hackathons import hackathons_bp
+from http_cache import init_compression
+from json_provider import FastJSONProvider
+from metrics import init_metrics
+from ratelimit import init_rate_limits
 
 app = Flask(__name__)
+# orjson-backed when installed; also encodes ObjectId/datetime (see json_provider.py)
+app.json_provider_class = FastJSONProvider
+app.json = FastJSONProvider(app)
 app.config['SECRET_KEY'] = 'your_secret_key'  # Replace with a strong secret key
 # Enable CORS for all routes (auth + hackathons)
-CORS(app, resources={r"/*": {"origins": "*"}}, methods=["GET","POST","OPTIONS"], allow_headers=["Content-Type","Authorization"])
+CORS(app, resources={r"/*": {"origins": "*"}}, methods=["GET","POST","OPTIONS"], allow_headers=["Content-Type","Authorization"], expose_headers=["Retry-After"])
 
 # Register the authentication blueprint
 app.register_blueprint(auth_bp, url_prefix='/auth')
 app.register_blueprint(hackathons_bp, url_prefix='/hackathons')
 
+# Route latency, Mongo round trips per request and /metrics (see metrics.py)
+init_metrics(app)
+
+# 429 + Retry-After on the hot write endpoints (see ratelimit.py)
+init_rate_limits(app)
+
+# gzip/brotli for large JSON/CSV bodies
+init_compression(app)
+
+# One-shot migration: flask --app app create-indexes
+app.cli.add_command(create_indexes_command)
+
 @app.route('/')
 def index():
     return "Flask app is running!"
@@ -0,0 +1,43 @@
+"""
+Optional ASGI serving mode (install requirements-async.txt):
+
+    uvicorn asgi:app --workers 4
+
+Routes implemented in async_views.py run natively on the event loop against the
+Motor client; everything else is passed through to the Flask app, which asgiref
+runs in a thread pool.
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+
+import async_views
+from app import app as flask_app
+
+
+class AsyncApp:
+    def __init__(self, wsgi_app):
+        self.fallback = WsgiToAsgi(wsgi_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http':
+            handler, params, rule = async_views.match(scope['method'], scope['path'])
+            if handler is not None:
+                await async_views.dispatch(scope, receive, send, handler, params, rule)
+                return
+        await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        # Nothing to set up: both Mongo clients connect lazily on first use
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = AsyncApp(flask_app)
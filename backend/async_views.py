@@ -0,0 +1,232 @@
+"""
+Async (ASGI) implementations of the I/O-bound hackathon and auth routes.
+
+Each handler runs the same input checks, queries and replies as its Flask view
+in hackathons.py / auth.py (shared helpers), but awaits the Motor client and
+runs independent lookups concurrently. Routes not listed in ROUTES are served
+by the regular Flask app (see asgi.py), so both modes return the same
+responses.
+
+These routes bypass Flask's request hooks: their latency and status still go
+to /metrics, but without Mongo command counts or a Server-Timing header, and
+their (small) bodies are not compressed. None of them sends an ETag.
+"""
+
+import asyncio
+import logging
+import re
+import time
+
+from bson import ObjectId
+
+from db import get_async_db
+import auth
+import hackathons
+import json_provider
+import metrics
+import ratelimit
+import team_formation
+from tokens import decode_jwt
+
+logger = logging.getLogger('inovatehub.asgi')
+
+
+class Request:
+    def __init__(self, scope, receive, params: dict):
+        self.scope = scope
+        self.receive = receive
+        self.params = params
+
+    async def body(self) -> bytes:
+        chunks = []
+        while True:
+            message = await self.receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    def client_ip(self) -> str:
+        headers = dict(self.scope.get('headers') or [])
+        forwarded = headers.get(b'x-forwarded-for', b'').decode('latin-1')
+        return ratelimit.client_ip((self.scope.get('client') or ('',))[0], forwarded)
+
+    async def json(self) -> dict:
+        # Same leniency as request.get_json(force=True) or {} in the Flask views
+        try:
+            return json_provider.loads(await self.body() or b'null') or {}
+        except ValueError:
+            return {}
+
+
+async def send_json(send, payload, status: int = 200, headers: dict = None):
+    body = json_provider.dumps_bytes(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            # Mirrors the app-wide CORS policy in app.py
+            (b'access-control-allow-origin', b'*'),
+        ] + [(k.encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def rate_limited(req: Request, endpoint: str, decoded):
+    """429 reply when the Flask endpoint's rate limit buckets are empty (see ratelimit.py), else None."""
+    wait = await ratelimit.check_async(endpoint, (decoded or {}).get('sub'), req.client_ip())
+    if wait > 0:
+        return {'message': 'Too many requests, please slow down'}, 429, {'retry-after': ratelimit.retry_after_header(wait)}
+    return None
+
+
+# --- Hackathon routes ---
+# Input checks, queries and replies come from the helpers next to the Flask
+# views; only the awaiting differs.
+
+async def join_team(req: Request, hackathon_id: str):
+    decoded, team_code, error = hackathons.parse_join_team(await req.json())
+    if error:
+        return error
+
+    db = get_async_db()
+    user_id = ObjectId(decoded['sub'])
+    error = hackathons.join_team_error(*await find_each(hackathons.join_team_lookups(hackathon_id, user_id)), team_code)
+    if error:
+        return error
+
+    team_filter = {'hackathon_id': ObjectId(hackathon_id), 'code': team_code}
+    added = await db['teams'].find_one_and_update(*hackathons.add_member_query(team_filter, user_id), projection={'_id': 1})
+    if added is None:
+        team = await db['teams'].find_one(team_filter, {'members': 1})
+        return hackathons.JOIN_FAILURES[hackathons.member_failure_reason(team, user_id)]
+    lost = await lost_join_race(ObjectId(hackathon_id), added['_id'], user_id)
+
+    # Same ETag revision bump as hackathons.bump_revision, after every membership write
+    await db['hackathons'].update_one({'_id': ObjectId(hackathon_id)}, {'$inc': {'revision': 1}})
+    hackathons.forget_revision(hackathon_id)
+    if lost:
+        return hackathons.JOIN_FAILURES['in_team']
+    return {'message': 'Successfully joined team'}, 200
+
+
+async def lost_join_race(hackathon_oid: ObjectId, team_id: ObjectId, user_id: ObjectId) -> bool:
+    """hackathons.lost_join_race: the user stays on their oldest team only."""
+    db = get_async_db()
+    teams = await db['teams'].find(*team_formation.memberships_query(hackathon_oid, [user_id])).to_list(length=None)
+    extra = team_formation.extra_memberships(teams, [user_id])
+    for other_id, uid in extra:
+        await db['teams'].update_one({'_id': other_id}, team_formation.pull_member_update(uid))
+        team = await db['teams'].find_one({'_id': other_id, 'leader_id': uid}, {'members': 1})
+        if team and team.get('members'):
+            await db['teams'].update_one({'_id': other_id}, {'$set': {'leader_id': team['members'][0]}})
+    return (team_id, user_id) in extra
+
+
+async def find_each(lookups: list) -> list:
+    db = get_async_db()
+    return await asyncio.gather(*(db[name].find_one(query, projection) for name, query, projection in lookups))
+
+
+async def request_join_team(req: Request, hackathon_id: str):
+    decoded, team_id, message, error = hackathons.parse_request_join(await req.json())
+    limited = await rate_limited(req, 'hackathons.request_join_team', decoded)
+    if limited:
+        return limited
+    if error:
+        return error
+
+    user_id = ObjectId(decoded['sub'])
+    error = hackathons.request_join_error(*await find_each(hackathons.request_join_lookups(hackathon_id, user_id, team_id)))
+    if error:
+        return error
+
+    await get_async_db()['team_requests'].insert_one(hackathons.join_request_doc(hackathon_id, team_id, user_id, message))
+    return {'message': 'Request sent successfully'}, 201
+
+
+async def invite_participant(req: Request, hackathon_id: str):
+    decoded, user_id, message, error = hackathons.parse_invite(await req.json())
+    limited = await rate_limited(req, 'hackathons.invite_participant', decoded)
+    if limited:
+        return limited
+    if error:
+        return error
+
+    leader_team, reg, existing_team = await find_each(hackathons.invite_lookups(hackathon_id, decoded['sub'], user_id))
+    error = hackathons.invite_error(leader_team, reg, existing_team)
+    if error:
+        return error
+
+    try:
+        await get_async_db()['team_requests'].update_one(
+            *hackathons.invitation_upsert(hackathon_id, leader_team['_id'], user_id, message), upsert=True,
+        )
+    except Exception as e:
+        return {'message': f'Failed to send invitation: {str(e)}'}, 500
+    return {'message': 'Invitation sent'}, 200
+
+
+async def get_my_team(req: Request, hackathon_id: str):
+    data = await req.json()
+    decoded = decode_jwt(data.get('token') or '')
+    if not decoded:
+        return {'message': 'Unauthorized'}, 401
+
+    db = get_async_db()
+    team = await db['teams'].find_one(hackathons.my_team_query(hackathon_id, decoded['sub']))
+    if not team:
+        return {'team': None}, 200
+
+    users = await db['users'].find(*hackathons.team_members_query(team)).to_list(length=None)
+    return hackathons.my_team_reply(team, users), 200
+
+
+# --- Auth routes ---
+
+async def get_profile(req: Request):
+    decoded, error = auth.parse_token(await req.json())
+    if error:
+        return error
+    try:
+        prof = await get_async_db()['profiles'].find_one({'user_id': ObjectId(decoded.get('sub'))})
+    except Exception:
+        prof = None
+    return auth.profile_reply(prof), 200
+
+
+# (method, path pattern, handler); path groups become handler arguments
+ROUTES = [
+    ('POST', r'/hackathons/teams/join/(?P<hackathon_id>[^/]+)', join_team),
+    ('POST', r'/hackathons/teams/request/(?P<hackathon_id>[^/]+)', request_join_team),
+    ('POST', r'/hackathons/teams/invite/(?P<hackathon_id>[^/]+)', invite_participant),
+    ('POST', r'/hackathons/teams/my-team/(?P<hackathon_id>[^/]+)', get_my_team),
+    ('POST', r'/auth/profile/get', get_profile),
+]
+_COMPILED = [
+    # The Flask-style rule ('/hackathons/teams/join/<hackathon_id>') keys the route's metrics
+    (method, re.compile(pattern + r'/?$'), re.sub(r'\(\?P<(\w+)>[^)]*\)', r'<\1>', pattern), handler)
+    for method, pattern, handler in ROUTES
+]
+
+
+def match(method: str, path: str):
+    """(handler, path params, route rule), or (None, None, None) if Flask serves it."""
+    for route_method, pattern, rule, handler in _COMPILED:
+        if route_method == method:
+            m = pattern.match(path)
+            if m:
+                return handler, m.groupdict(), rule
+    return None, None, None
+
+
+async def dispatch(scope, receive, send, handler, params: dict, rule: str):
+    started = time.perf_counter()
+    try:
+        result = await handler(Request(scope, receive, params), **params)
+    except Exception:
+        logger.exception('unhandled error in %s %s', scope['method'], scope['path'])
+        result = {'message': 'Internal server error'}, 500
+    await send_json(send, *result)
+    metrics.record_route(f"{scope['method']} {rule}", result[1], (time.perf_counter() - started) * 1000)
@@ -1,59 +1,33 @@
-from datetime import datetime, timedelta, timezone
-import os
-from typing import Optional
-from urllib.parse import quote_plus
+from datetime import datetime
 
 from flask import Blueprint, jsonify, request
-from pymongo import MongoClient, ASCENDING
+from pymongo import ASCENDING
 from pymongo.errors import DuplicateKeyError
-from werkzeug.security import generate_password_hash, check_password_hash
-import jwt
 from bson import ObjectId
 
+from db import collection, declare_index
+from hashing import HashingBusy, hash_password, needs_rehash, verify_password
+from tokens import create_jwt, decode_jwt
+
 
 # Blueprint for auth routes
 auth_bp = Blueprint('auth', __name__)
 
 
-# --- Configuration ---
-# Prefer explicit MONGODB_URI if provided; otherwise build Atlas SRV URI using MONGODB_PASSWORD
-MONGODB_PASSWORD = "darshan"
-DEFAULT_ATLAS_URI = f"mongodb+srv://dar:{quote_plus(MONGODB_PASSWORD) if MONGODB_PASSWORD else '<db_password>'}@cluster0.g3jy5p4.mongodb.net/?retryWrites=true&w=majority&appName=Cluster0"
-MONGODB_URI = os.environ.get('MONGODB_URI', DEFAULT_ATLAS_URI)
-MONGODB_DB = os.environ.get('MONGODB_DB', 'inovatehub')
-JWT_SECRET = os.environ.get('JWT_SECRET', 'change_me_dev_secret')
-JWT_EXPIRES_MINUTES = int(os.environ.get('JWT_EXPIRES_MINUTES', '60'))
-
-
 # --- Database Setup ---
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client[MONGODB_DB]
-users_col = db['users']
-profiles_col = db['profiles']
-
-# Ensure unique index on email for users, and unique user_id for profiles
-users_col.create_index([('email', ASCENDING)], unique=True)
-profiles_col.create_index([('user_id', ASCENDING)], unique=True)
+# Connection settings live in db.py; the client is created on first use
+users_col = collection('users')
+profiles_col = collection('profiles')
 
-
-def create_jwt(user_id: str, email: str, user_type: str, name: str) -> str:
-    now = datetime.now(timezone.utc)
-    payload = {
-        'sub': user_id,
-        'email': email,
-        'user_type': user_type,
-        'name': name,
-        'iat': int(now.timestamp()),
-        'exp': int((now + timedelta(minutes=JWT_EXPIRES_MINUTES)).timestamp()),
-    }
-    return jwt.encode(payload, JWT_SECRET, algorithm='HS256')
+# Unique index on email for users, and unique user_id for profiles (created by `flask create-indexes`)
+declare_index(users_col, [('email', ASCENDING)], unique=True)
+declare_index(profiles_col, [('user_id', ASCENDING)], unique=True)
 
 
-def decode_jwt(token: str) -> Optional[dict]:
-    try:
-        return jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-    except Exception:
-        return None
+def busy_response():
+    res = jsonify({'message': 'Server is busy, please try again shortly'})
+    res.headers['Retry-After'] = '1'
+    return res, 503
 
 
 @auth_bp.route('/signup', methods=['POST'])
@@ -67,7 +41,10 @@ def signup():
     if not name or not email or not password:
         return jsonify({'message': 'Name, email and password are required'}), 400
 
-    hashed = generate_password_hash(password)
+    try:
+        hashed = hash_password(password)
+    except HashingBusy:
+        return busy_response()
 
     try:
         user_doc = {
@@ -104,8 +81,17 @@ def login():
         return jsonify({'message': 'Email and password are required'}), 400
 
     user = users_col.find_one({'email': email})
-    if not user or not check_password_hash(user.get('password_hash', ''), password):
-        return jsonify({'message': 'Invalid email or password'}), 401
+    try:
+        if not user or not verify_password(user.get('password_hash', ''), password):
+            return jsonify({'message': 'Invalid email or password'}), 401
+        # Transparently upgrade hashes made with older parameters
+        if needs_rehash(user.get('password_hash', '')):
+            users_col.update_one(
+                {'_id': user['_id']},
+                {'$set': {'password_hash': hash_password(password), 'updated_at': datetime.utcnow()}},
+            )
+    except HashingBusy:
+        return busy_response()
 
     token = create_jwt(user_id=str(user['_id']), email=user['email'], user_type=user.get('user_type', 'participant'), name=user.get('name', ''))
     return jsonify({
@@ -144,16 +130,28 @@ def logout():
     return jsonify({'message': 'Logged out'}), 200
 
 
-@auth_bp.route('/profile/get', methods=['POST'])
-def get_profile():
-    data = request.get_json(force=True) or {}
+def parse_token(data: dict) -> tuple:
+    """(decoded token, error reply as (payload, status))."""
     token = data.get('token')
     if not token:
-        return jsonify({'message': 'Token is required'}), 400
-
+        return None, ({'message': 'Token is required'}, 400)
     decoded = decode_jwt(token)
     if not decoded:
-        return jsonify({'message': 'Invalid or expired token'}), 401
+        return None, ({'message': 'Invalid or expired token'}, 401)
+    return decoded, None
+
+
+def profile_reply(prof) -> dict:
+    # Shared with the ASGI get_profile in async_views.py
+    profile_data = (prof or {}).get('data') or {}
+    return {'profile': profile_data, 'exists': bool(profile_data)}
+
+
+@auth_bp.route('/profile/get', methods=['POST'])
+def get_profile():
+    decoded, error = parse_token(request.get_json(force=True) or {})
+    if error:
+        return jsonify(error[0]), error[1]
 
     user_id = decoded.get('sub')
     try:
@@ -161,9 +159,7 @@ def get_profile():
     except Exception:
         prof = None
 
-    profile_data = (prof or {}).get('data') or {}
-    exists = bool(profile_data)
-    return jsonify({'profile': profile_data, 'exists': exists}), 200
+    return jsonify(profile_reply(prof)), 200
 
 
 @auth_bp.route('/profile/update', methods=['POST'])
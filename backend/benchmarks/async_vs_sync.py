@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Requests/sec of POST /hackathons/teams/join under simulated database latency:
+sync Flask views on a fixed number of worker slots (like gunicorn sync workers)
+versus the ASGI mode's async views on one event loop.
+
+Data lives in mongomock; every collection call first waits --latency-ms to stand
+in for an Atlas round trip. Needs benchmarks/requirements.txt and
+requirements-async.txt installed, but no MongoDB server.
+
+    python backend/benchmarks/async_vs_sync.py --latency-ms 20 --requests 400
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import mongomock  # noqa: E402
+from bson import ObjectId  # noqa: E402
+
+import async_views  # noqa: E402
+import db  # noqa: E402
+from app import app as flask_app  # noqa: E402
+from asgi import app as asgi_app  # noqa: E402
+from tokens import create_jwt  # noqa: E402
+
+
+class SlowCollection:
+    def __init__(self, col, latency):
+        self._col = col
+        self._latency = latency
+
+    def __getattr__(self, attr):
+        target = getattr(self._col, attr)
+        if not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            time.sleep(self._latency)
+            return target(*args, **kwargs)
+        return call
+
+
+class AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def to_list(self, length=None):
+        return list(self._cursor)
+
+
+class AsyncSlowCollection:
+    def __init__(self, col, latency):
+        self._col = col
+        self._latency = latency
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._col.find(*args, **kwargs))
+
+    def __getattr__(self, attr):
+        target = getattr(self._col, attr)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(self._latency)
+            return target(*args, **kwargs)
+        return call
+
+
+class SlowDatabase:
+    def __init__(self, database, latency, wrapper):
+        self._db = database
+        self._latency = latency
+        self._wrapper = wrapper
+
+    def __getitem__(self, name):
+        return self._wrapper(self._db[name], self._latency)
+
+
+def seed(database, n: int):
+    """n registered users and n one-member teams, so every join succeeds."""
+    hackathon_id = ObjectId()
+    database['hackathons'].insert_one({'_id': hackathon_id, 'name': 'Bench'})
+    users = [ObjectId() for _ in range(n)]
+    database['registrations'].insert_many([{'hackathon_id': hackathon_id, 'user_id': u} for u in users])
+    database['teams'].insert_many([
+        {'hackathon_id': hackathon_id, 'name': f'team-{i}', 'code': f'C{i:06d}', 'members': [ObjectId()]}
+        for i in range(n)
+    ])
+    tokens = [create_jwt(str(u), f'{u}@example.com', 'participant', 'Bench') for u in users]
+    return hackathon_id, [(tokens[i], f'C{i:06d}') for i in range(n)]
+
+
+def run_sync(hackathon_id, jobs, workers: int) -> float:
+    def worker(chunk):
+        client = flask_app.test_client()
+        for token, code in chunk:
+            res = client.post(f'/hackathons/teams/join/{hackathon_id}', json={'token': token, 'team_code': code})
+            assert res.status_code == 200, res.get_json()
+
+    chunks = [jobs[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(worker, chunks))
+    return len(jobs) / (time.perf_counter() - start)
+
+
+async def asgi_post(path: str, payload: dict) -> int:
+    body = json.dumps(payload).encode()
+    scope = {'type': 'http', 'method': 'POST', 'path': path, 'headers': [(b'content-type', b'application/json')]}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(scope, receive, send)
+    return sent[0]['status']
+
+
+async def run_async(hackathon_id, jobs, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(token, code):
+        async with sem:
+            status = await asgi_post(f'/hackathons/teams/join/{hackathon_id}', {'token': token, 'team_code': code})
+            assert status == 200, status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(token, code) for token, code in jobs))
+    return len(jobs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--sync-workers', type=int, default=4, help='concurrent requests in sync mode')
+    parser.add_argument('--concurrency', type=int, default=64, help='in-flight requests in async mode')
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    store = mongomock.MongoClient()
+    sync_db = store['sync']
+    db.get_db = lambda: SlowDatabase(sync_db, latency, SlowCollection)
+    hackathon_id, jobs = seed(sync_db, args.requests)
+    sync_rps = run_sync(hackathon_id, jobs, args.sync_workers)
+
+    async_db = store['async']
+    async_views.get_async_db = lambda: SlowDatabase(async_db, latency, AsyncSlowCollection)
+    hackathon_id, jobs = seed(async_db, args.requests)
+    async_rps = asyncio.run(run_async(hackathon_id, jobs, args.concurrency))
+
+    print(f'simulated latency  : {args.latency_ms:.0f} ms per round trip')
+    print(f'sync  ({args.sync_workers:>3} workers): {sync_rps:8.1f} req/s')
+    print(f'async ({args.concurrency:>3} in flight): {async_rps:8.1f} req/s  ({async_rps / sync_rps:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Generate a large, realistic hackathon dataset for scale testing.
+
+Writes users, hackathons, registrations, teams, team_requests and
+team_messages in the shapes built by signup, create_hackathon, register,
+create_team, request_join_team / invite_participant and send_team_message,
+with insert_many in batches of --batch-size. Distributions:
+
+    registrations per hackathon   Zipf-like, a few events draw most sign-ups
+    skills, role, experience      role-correlated skills, 1-6 per registrant
+    teams                         1-5 members (MAX_TEAM_MEMBERS), --team-fill of registrants placed
+    team_requests                 approved (members who asked or were invited),
+                                  pending / rejected requests and pending invitations
+    team_messages                 log-normal count per team, sent in bursts during the event
+
+Everything, including ObjectIds and timestamps, follows from --seed, so two
+runs with the same arguments produce identical data (only the salt of the
+shared password hash differs; every seeded user's password is 'password123').
+Indexes are created after loading.
+
+Needs a disposable MongoDB (never point it at production); the database is dropped first:
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/generate_data.py --registrations 100000
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from db import create_indexes, get_client, get_db  # noqa: E402
+from hackathons import MAX_TEAM_MEMBERS  # noqa: E402
+from hashing import PASSWORD_HASH_METHOD  # noqa: E402
+
+PASSWORD = 'password123'
+FIRST_NAMES = ['Aarav', 'Priya', 'Liam', 'Sofia', 'Wei', 'Amara', 'Noah', 'Yuki', 'Diego', 'Fatima',
+               'Ethan', 'Zara', 'Kofi', 'Mia', 'Arjun', 'Elena', 'Omar', 'Hana', 'Lucas', 'Isla']
+LAST_NAMES = ['Sharma', 'Smith', 'Chen', 'Garcia', 'Okafor', 'Tanaka', 'Müller', 'Rossi', 'Khan', 'Silva',
+              'Nguyen', 'Patel', 'Kim', 'Novak', 'Haddad', 'Larsen', 'Mensah', 'Reyes', 'Ivanova', 'Das']
+THEMES = ['AI', 'Web3', 'Climate', 'Health', 'FinTech', 'Education', 'Gaming', 'Open Source', 'Mobility', 'Space']
+TRACKS = ['Beginner Friendly', 'Best Design', 'Social Impact', 'Best Use of AI', 'Sustainability', 'Hardware']
+ROLE_SKILLS = {
+    'Frontend Developer': ['react', 'typescript', 'next.js', 'tailwind', 'vue', 'css'],
+    'Backend Developer': ['python', 'node.js', 'go', 'mongodb', 'postgresql', 'docker'],
+    'Full Stack Developer': ['react', 'node.js', 'typescript', 'mongodb', 'python', 'aws'],
+    'Mobile Developer': ['flutter', 'kotlin', 'swift', 'react native', 'firebase'],
+    'Data Scientist': ['python', 'pytorch', 'pandas', 'sql', 'ml', 'tensorflow'],
+    'Designer': ['figma', 'ui design', 'ux research', 'illustrator', 'prototyping'],
+    'Product Manager': ['roadmapping', 'user research', 'figma', 'sql', 'pitching'],
+}
+ROLE_WEIGHTS = [22, 20, 18, 10, 12, 10, 8]
+GENERAL_SKILLS = ['git', 'linux', 'docker', 'aws', 'rust', 'solidity', 'c++', 'java']
+CODE_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+LEVEL_WEIGHTS = [40, 40, 20]
+TEAM_SIZE_WEIGHTS = {1: 5, 2: 15, 3: 25, 4: 25, 5: 30}
+MESSAGES = ['hey team!', 'pushed the API changes', 'can someone review my PR?', 'demo in 10 minutes',
+            'who is on the pitch deck?', 'the build is green again', 'lunch?', 'found the bug, fixing now',
+            'uploading the video', 'judges are coming to our table']
+EPOCH = datetime(1970, 1, 1)
+
+
+def oid(rng: random.Random, when: datetime) -> ObjectId:
+    """Deterministic ObjectId whose embedded time is `when` (naive UTC), so _id order follows created_at."""
+    seconds = int((when - EPOCH).total_seconds())
+    return ObjectId(seconds.to_bytes(4, 'big') + rng.getrandbits(64).to_bytes(8, 'big'))
+
+
+class BatchWriter:
+    """Buffers documents per collection and writes them with insert_many."""
+
+    def __init__(self, database, batch_size: int):
+        self.database = database
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.written = Counter()
+
+    def add(self, name: str, doc: dict):
+        buffer = self.buffers.setdefault(name, [])
+        buffer.append(doc)
+        if len(buffer) >= self.batch_size:
+            self.flush(name)
+
+    def flush(self, name: str = None):
+        for coll in [name] if name else list(self.buffers):
+            buffer = self.buffers.get(coll)
+            if buffer:
+                self.database[coll].insert_many(buffer, ordered=False)
+                self.written[coll] += len(buffer)
+                self.buffers[coll] = []
+
+
+def zipf_counts(total: int, n: int, cap: int, rng: random.Random, s: float = 1.1) -> list:
+    """Split total over n buckets with Zipf weights (shuffled), each in [min(5, cap), cap]."""
+    weights = [1 / (i + 1) ** s for i in range(n)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+    return [max(min(5, cap), min(cap, round(w * scale))) for w in weights]
+
+
+def make_users(writer: BatchWriter, rng: random.Random, n: int, user_type: str, start: datetime) -> list:
+    password_hash = generate_password_hash(PASSWORD, PASSWORD_HASH_METHOD)
+    ids = []
+    for i in range(n):
+        created = start - timedelta(days=rng.uniform(30, 400))
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        doc = {
+            '_id': oid(rng, created),
+            'name': f'{first} {last}',
+            'email': f'{first.lower()}.{last.lower()}.{user_type[0]}{i}@example.com',
+            'password_hash': password_hash,
+            'user_type': user_type,
+            'created_at': created,
+            'updated_at': created,
+        }
+        writer.add('users', doc)
+        ids.append((doc['_id'], doc['name']))
+    return ids
+
+
+def unique_code(rng: random.Random, taken: set) -> str:
+    # Team codes are unique across hackathons, as create_team ensures
+    while True:
+        code = ''.join(rng.choices(CODE_ALPHABET, k=6))
+        if code not in taken:
+            taken.add(code)
+            return code
+
+
+def make_profile(rng: random.Random) -> dict:
+    role = rng.choices(list(ROLE_SKILLS), ROLE_WEIGHTS)[0]
+    pool = ROLE_SKILLS[role]
+    skills = rng.sample(pool, rng.randint(1, min(4, len(pool))))
+    skills += rng.sample(GENERAL_SKILLS, rng.choice([0, 0, 1, 2]))
+    return {'role': role, 'skills': skills, 'experience_level': rng.choices(LEVELS, LEVEL_WEIGHTS)[0]}
+
+
+def make_hackathon(rng: random.Random, index: int, organizer_id, start: datetime, span_days: int) -> dict:
+    start_date = start + timedelta(days=rng.uniform(0, span_days))
+    end_date = start_date + timedelta(days=rng.choice([1, 2, 2, 3, 7]))
+    created = start_date - timedelta(days=rng.uniform(14, 90))
+    theme = rng.choice(THEMES)
+    return {
+        '_id': oid(rng, created),
+        'name': f'{theme} Hack {index + 1}',
+        'description': f'A {theme.lower()} hackathon for builders of every level. ' * rng.randint(3, 12),
+        'theme': theme,
+        'locationType': rng.choices(['online', 'offline'], [60, 40])[0],
+        'location': None,
+        'date': '',
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'rounds': [],
+        'prize': rng.choice([0, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000]),
+        'image': 'https://placehold.co/1200x600.png',
+        'hint': 'hackathon banner',
+        'tracks': rng.sample(TRACKS, rng.randint(1, 3)),
+        'rules': '',
+        'prizes': '',
+        'sponsors': [],
+        'faq': [],
+        'team_size': MAX_TEAM_MEMBERS,
+        'registration_count': 0,
+        'team_count': 0,
+        'organizer_id': organizer_id,
+        'created_at': created,
+        'updated_at': created,
+        # Not stored by create_hackathon; used below for the event window
+        '_start': start_date,
+        '_end': end_date,
+    }
+
+
+def team_sizes(n: int, rng: random.Random) -> list:
+    sizes, sizes_left = [], n
+    choices, weights = list(TEAM_SIZE_WEIGHTS), list(TEAM_SIZE_WEIGHTS.values())
+    while sizes_left > 0:
+        size = min(sizes_left, rng.choices(choices, weights)[0], MAX_TEAM_MEMBERS)
+        sizes.append(size)
+        sizes_left -= size
+    return sizes
+
+
+def message_times(rng: random.Random, count: int, start: datetime, end: datetime) -> list:
+    """count timestamps in bursts: a few burst centres, short exponential gaps around each."""
+    window = max((end - start).total_seconds(), 3600)
+    centres = [rng.uniform(0, window) for _ in range(1 + count // 25)]
+    return sorted(start + timedelta(seconds=min(window, rng.choice(centres) + rng.expovariate(1 / 90)))
+                  for _ in range(count))
+
+
+def generate(database, rng: random.Random, hackathons: int, users: int, registrations: int, organizers: int,
+             team_fill: float, messages_per_team: float, start: datetime, batch_size: int) -> Counter:
+    """Write the dataset into database; returns documents written per collection."""
+    writer = BatchWriter(database, batch_size)
+    organizer_ids = [uid for uid, _ in make_users(writer, rng, organizers, 'organizer', start)]
+    participants = make_users(writer, rng, users, 'participant', start)
+    counts = zipf_counts(registrations, hackathons, users, rng)
+    codes = set()
+
+    for h, n_regs in enumerate(counts):
+        hack = make_hackathon(rng, h, rng.choice(organizer_ids), start, 365)
+        event_start, event_end = hack.pop('_start'), hack.pop('_end')
+        registrants = rng.sample(participants, n_regs)
+        regs = []
+        for uid, name in registrants:
+            created = hack['created_at'] + timedelta(seconds=rng.uniform(0, (event_start - hack['created_at']).total_seconds()))
+            regs.append({
+                '_id': oid(rng, created),
+                'hackathon_id': hack['_id'],
+                'user_id': uid,
+                'created_at': created,
+                'motivation': 'Here to learn and ship something fun.',
+                'looking_for_team': True,
+                'team_code': '',
+                'portfolio_link': '',
+                'full_name': name,
+                **make_profile(rng),
+                'github': '',
+                'linkedin': '',
+                'resume_link': '',
+                'status': 'Confirmed',
+                'updated_at': created,
+            })
+
+        # Teams from the first team_fill of the (already shuffled) registrants
+        placed = int(len(regs) * team_fill)
+        teams, pos = [], 0
+        for size in team_sizes(placed, rng):
+            members = regs[pos:pos + size]
+            pos += size
+            created = max(r['created_at'] for r in members)
+            code = unique_code(rng, codes)
+            team = {
+                '_id': oid(rng, created),
+                'hackathon_id': hack['_id'],
+                'name': f'Team {code}',
+                'description': '',
+                'code': code,
+                'leader_id': members[0]['user_id'],
+                'members': [r['user_id'] for r in members],
+                'max_members': MAX_TEAM_MEMBERS,
+                'created_at': created,
+                'updated_at': created,
+            }
+            teams.append(team)
+            for reg in members:
+                reg['looking_for_team'] = False
+            # How non-leaders got in: a join request, a leader's invitation, or the team code
+            for reg in members[1:]:
+                how = rng.choices(['request', 'invitation', 'code'], [60, 20, 20])[0]
+                if how != 'code':
+                    writer.add('team_requests', request_doc(
+                        rng, hack['_id'], team['_id'], reg['user_id'], 'approved', created, how == 'invitation'))
+
+        # Unplaced registrants: pending and rejected requests, pending invitations
+        if teams:
+            for reg in regs[placed:]:
+                asked = set()
+                for status, invited, p in (('pending', False, 0.3), ('rejected', False, 0.15), ('pending', True, 0.1)):
+                    if rng.random() < p:
+                        team = rng.choice(teams)
+                        if team['_id'] not in asked:
+                            asked.add(team['_id'])
+                            writer.add('team_requests', request_doc(
+                                rng, hack['_id'], team['_id'], reg['user_id'], status, reg['created_at'], invited))
+
+        for team in teams:
+            count = int(rng.lognormvariate(math.log(max(messages_per_team, 1)) - 0.5, 1.0)) if messages_per_team else 0
+            for at in message_times(rng, count, event_start, event_end):
+                writer.add('team_messages', {
+                    '_id': oid(rng, at),
+                    'team_id': team['_id'],
+                    'sender_id': rng.choice(team['members']),
+                    'message': rng.choice(MESSAGES),
+                    'created_at': at,
+                })
+
+        hack['registration_count'] = len(regs)
+        hack['team_count'] = len(teams)
+        writer.add('hackathons', hack)
+        for reg in regs:
+            writer.add('registrations', reg)
+        for team in teams:
+            writer.add('teams', team)
+
+    writer.flush()
+    return writer.written
+
+
+def request_doc(rng: random.Random, hackathon_id, team_id, user_id, status: str, created: datetime,
+                invited: bool) -> dict:
+    doc = {
+        '_id': oid(rng, created),
+        'hackathon_id': hackathon_id,
+        'team_id': team_id,
+        'user_id': user_id,
+        'message': 'Team invitation' if invited else 'Would love to join!',
+        'status': status,
+        'created_at': created,
+        'updated_at': created + timedelta(hours=rng.uniform(0, 48)) if status != 'pending' else created,
+    }
+    if invited:
+        doc['invited_by_leader'] = True
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hackathons', type=int, default=300)
+    parser.add_argument('--users', type=int, default=60000, help='participant accounts')
+    parser.add_argument('--organizers', type=int, default=50)
+    parser.add_argument('--registrations', type=int, default=100000, help='approximate total')
+    parser.add_argument('--team-fill', type=float, default=0.6, help='share of registrants placed in teams')
+    parser.add_argument('--messages-per-team', type=float, default=40, help='mean messages per team')
+    parser.add_argument('--start', default='2025-01-01', help='first possible event date (YYYY-MM-DD)')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    get_client().drop_database(BENCH_DB)
+    began = time.perf_counter()
+    written = generate(
+        get_db(), random.Random(args.seed), args.hackathons, args.users, args.registrations, args.organizers,
+        args.team_fill, args.messages_per_team, datetime.strptime(args.start, '%Y-%m-%d'), args.batch_size,
+    )
+    load_s = time.perf_counter() - began
+    began = time.perf_counter()
+    create_indexes()
+    index_s = time.perf_counter() - began
+
+    total = sum(written.values())
+    for name, n in sorted(written.items()):
+        print(f'{name:<15} {n:>10}')
+    statuses = Counter((r['status'], bool(r.get('invited_by_leader'))) for r in get_db()['team_requests'].find(
+        {}, {'status': 1, 'invited_by_leader': 1}))
+    print('team_requests by (status, invitation):', dict(sorted(statuses.items())))
+    print(f'loaded {total} documents in {load_s:.1f}s ({total / load_s:,.0f} docs/s); indexes in {index_s:.1f}s')
+    print(f'database {BENCH_DB} left in place for benchmarks; drop it when done')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Time to encode an organizer participants payload: Flask's default provider
+versus json_provider.FastJSONProvider (orjson when installed, otherwise the
+compact standard-library fallback).
+
+Needs no database:
+
+    python backend/benchmarks/json_encoding.py --participants 5000
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import json_provider  # noqa: E402
+import serializers  # noqa: E402
+
+
+def payload(n: int) -> dict:
+    start = datetime(2025, 1, 1)
+    team = {'_id': ObjectId(), 'name': 'Team', 'code': 'ABC123'}
+    participants = []
+    for i in range(n):
+        reg = {
+            'user_id': ObjectId(),
+            'full_name': f'Participant {i}',
+            'motivation': 'Building things with friends ' * 4,
+            'skills': ['python', 'react', 'mongodb'],
+            'role': 'developer',
+            'created_at': start + timedelta(minutes=i),
+        }
+        user = {'email': f'user{i}@example.com'}
+        participants.append(serializers.participant_for_organizer(reg, user, serializers.team_summary(team)))
+    return {'participants': participants}
+
+
+def run(provider, obj, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        provider.dumps(obj)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--participants', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    obj = payload(args.participants)
+    default_ms = run(DefaultJSONProvider(app), obj, args.rounds)
+    fast_ms = run(json_provider.FastJSONProvider(app), obj, args.rounds)
+
+    print(f'participants : {args.participants}')
+    print(f'default      : {default_ms:8.2f} ms per response')
+    print(f'{json_provider.JSON_BACKEND:<13}: {fast_ms:8.2f} ms per response  ({default_ms / fast_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
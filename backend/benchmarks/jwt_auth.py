@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request token verification: full HS256 decode on every
+call versus the verified-claims cache used by decode_jwt.
+
+Needs no database:
+
+    python backend/benchmarks/jwt_auth.py --tokens 50 --calls 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tokens import create_jwt, decode_jwt, jwt_cache, verify_jwt  # noqa: E402
+
+
+def run(fn, tokens, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        assert fn(tokens[i % len(tokens)]) is not None
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=50, help='distinct tokens (active sessions)')
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    tokens = [create_jwt(f'{i:024x}', f'user{i}@example.com', 'participant', f'User {i}') for i in range(args.tokens)]
+
+    uncached = run(verify_jwt, tokens, args.calls)
+    jwt_cache.clear()
+    cached = run(decode_jwt, tokens, args.calls)
+    stats = jwt_cache.stats()
+
+    print(f'uncached jwt.decode : {uncached:8.2f} us/call')
+    print(f'cached decode_jwt   : {cached:8.2f} us/call  ({uncached / cached:.1f}x faster)')
+    print(f"cache hit rate      : {stats['hit_rate']:.4f} ({stats['hits']} hits, {stats['misses']} misses)")
+
+
+if __name__ == '__main__':
+    main()
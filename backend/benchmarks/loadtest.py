@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Load test of the Flask app under concurrent clients, reporting p50/p95/p99
+latency, error count and throughput per endpoint as JSON, so runs on two
+commits can be compared.
+
+Seeds hackathons, users, registrations, teams and messages with
+generate_data.py (a small, deterministic dataset by default), then runs
+--clients threads, each with its own test client, that repeatedly pick a
+weighted scenario:
+
+    browse     list, search, detail, teams and public participants of an event
+    register   register for an event and read my registrations
+    teams      create a team, request to join it, list and approve the request
+    chat       send a team message and read the team's messages
+    organizer  organizer dashboard and participant list of an owned event
+
+Requests go through app.test_client(), so this measures the app and the
+database, not a WSGI server. Run against a disposable mongod, or an
+in-memory stand-in (mongomock, see requirements.txt) with --backend memory:
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/loadtest.py --duration 30 --output after.json
+    python backend/benchmarks/loadtest.py --backend memory --compare before.json
+
+mongomock numbers are only comparable with other mongomock runs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BACKENDS = ('mongod', 'memory')
+SCENARIO_WEIGHTS = {'browse': 50, 'register': 10, 'teams': 10, 'chat': 25, 'organizer': 5}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=BACKENDS, default='mongod')
+    parser.add_argument('--hackathons', type=int, default=20)
+    parser.add_argument('--users', type=int, default=2000, help='participant accounts')
+    parser.add_argument('--registrations', type=int, default=4000, help='approximate total')
+    parser.add_argument('--messages', type=float, default=20, help='mean seeded messages per team')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent virtual clients')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of measured load')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds of unmeasured load first')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--rate-limits', action='store_true', help='keep the per-user/IP rate limits on')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='earlier JSON report to print per-endpoint deltas against')
+    return parser.parse_args()
+
+
+args = parse_args()
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+if not args.rate_limits:
+    # Every virtual client shares one IP, which the limits would throttle
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+if args.backend == 'memory':
+    import mongomock
+    import pymongo
+    # Before db.py imports MongoClient; mongomock has no sessions
+    pymongo.MongoClient = mongomock.MongoClient
+    os.environ['MONGO_TRANSACTIONS'] = '0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from app import app  # noqa: E402
+from auth import users_col  # noqa: E402
+from db import create_indexes, get_client, get_db  # noqa: E402
+from tokens import create_jwt  # noqa: E402
+import generate_data  # noqa: E402
+import hackathons  # noqa: E402
+
+
+class World:
+    """Seeded ids the scenarios draw from, with tokens minted on first use."""
+
+    def __init__(self):
+        self.hackathons = []              # ObjectId
+        self.organizers = {}              # hackathon id -> organizer id
+        self.members = defaultdict(list)  # hackathon id -> ids of users on a team
+        self.tokens = {}
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    def token(self, user_id, user_type='participant') -> str:
+        token = self.tokens.get(user_id)
+        if token is None:
+            token = self.tokens[user_id] = create_jwt(str(user_id), f'{user_id}@example.com', user_type, 'Load User')
+        return token
+
+    def new_user(self, user_type='participant'):
+        """Token of a user inserted now (scenarios that need a fresh account)."""
+        with self.lock:
+            self.counter += 1
+            n = self.counter
+        user_id = users_col.insert_one({
+            'name': f'Load User {n}', 'email': f'load{n}-{ObjectId()}@example.com', 'password_hash': '',
+            'user_type': user_type, 'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow(),
+        }).inserted_id
+        return create_jwt(str(user_id), f'load{n}@example.com', user_type, f'Load User {n}')
+
+
+def seed(rng: random.Random) -> World:
+    """Generate the dataset (see generate_data.py) and index what the scenarios need."""
+    generate_data.generate(
+        get_db(), rng, args.hackathons, args.users, args.registrations, max(1, args.hackathons // 4),
+        0.6, args.messages, datetime(2025, 1, 1), 5000,
+    )
+    world = World()
+    for hack in hackathons.hackathons_col.find({}, {'organizer_id': 1}):
+        world.hackathons.append(hack['_id'])
+        world.organizers[hack['_id']] = hack['organizer_id']
+    for team in hackathons.teams_col.find({}, {'hackathon_id': 1, 'members': 1}):
+        world.members[team['hackathon_id']].extend(team['members'])
+    return world
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # endpoint -> latencies in ms
+        self.errors = defaultdict(int)
+        self.enabled = False
+        self.lock = threading.Lock()
+
+    def call(self, client, endpoint: str, path: str, body=None, ok=(200, 201)):
+        method = endpoint.split(' ', 1)[0]
+        began = time.perf_counter()
+        res = client.get(path) if method == 'GET' else client.post(path, json=body)
+        elapsed = (time.perf_counter() - began) * 1000
+        if self.enabled:
+            with self.lock:
+                self.samples[endpoint].append(elapsed)
+                if res.status_code not in ok:
+                    self.errors[endpoint] += 1
+        return res
+
+
+def browse(client, rec, world, rng):
+    hid = rng.choice(world.hackathons)
+    rec.call(client, 'GET /hackathons/list', '/hackathons/list?limit=12')
+    rec.call(client, 'GET /hackathons/search', f'/hackathons/search?theme={rng.choice(generate_data.THEMES)}&sort=newest')
+    rec.call(client, 'GET /hackathons/get/<id>', f'/hackathons/get/{hid}')
+    rec.call(client, 'GET /hackathons/teams/list/<id>', f'/hackathons/teams/list/{hid}')
+    rec.call(client, 'GET /hackathons/participants/public/<id>', f'/hackathons/participants/public/{hid}')
+
+
+def register(client, rec, world, rng):
+    hid = rng.choice(world.hackathons)
+    token = world.new_user()
+    profile = generate_data.make_profile(rng)
+    rec.call(client, 'POST /hackathons/register/<id>', f'/hackathons/register/{hid}', {'token': token, 'details': {
+        'fullName': 'Load Tester', 'role': profile['role'], 'skills': profile['skills'],
+        'experienceLevel': profile['experience_level'], 'motivation': 'load test',
+    }})
+    rec.call(client, 'POST /hackathons/my-registrations', '/hackathons/my-registrations', {'token': token})
+
+
+def teams(client, rec, world, rng):
+    hid = rng.choice(world.hackathons)
+    leader, joiner = world.new_user(), world.new_user()
+    for token in (leader, joiner):
+        client.post(f'/hackathons/register/{hid}', json={'token': token, 'details': {'fullName': 'Load Tester'}})
+    res = rec.call(client, 'POST /hackathons/teams/create/<id>', f'/hackathons/teams/create/{hid}', {
+        'token': leader, 'team': {'name': f'Load Team {ObjectId()}', 'description': 'load test'},
+    })
+    team_id = (res.get_json() or {}).get('team_id')
+    if not team_id:
+        return
+    rec.call(client, 'POST /hackathons/teams/request/<id>', f'/hackathons/teams/request/{hid}',
+             {'token': joiner, 'team_id': team_id, 'message': 'let me in'})
+    res = rec.call(client, 'POST /hackathons/teams/requests/<id>', f'/hackathons/teams/requests/{hid}', {'token': leader})
+    for req in (res.get_json() or {}).get('requests', []):
+        rec.call(client, 'POST /hackathons/teams/requests/respond', '/hackathons/teams/requests/respond',
+                 {'token': leader, 'request_id': req['id'], 'action': 'approve'})
+
+
+def chat(client, rec, world, rng):
+    hid = rng.choice(world.hackathons)
+    if not world.members[hid]:
+        return
+    token = world.token(rng.choice(world.members[hid]))
+    rec.call(client, 'POST /hackathons/teams/messages/send/<id>', f'/hackathons/teams/messages/send/{hid}',
+             {'token': token, 'message': 'ping from the load test'})
+    rec.call(client, 'POST /hackathons/teams/messages/<id>', f'/hackathons/teams/messages/{hid}', {'token': token})
+    rec.call(client, 'POST /hackathons/teams/my-team/<id>', f'/hackathons/teams/my-team/{hid}', {'token': token})
+
+
+def organizer(client, rec, world, rng):
+    hid = rng.choice(world.hackathons)
+    token = world.token(world.organizers[hid], 'organizer')
+    rec.call(client, 'POST /hackathons/organizer/hackathons', '/hackathons/organizer/hackathons', {'token': token})
+    rec.call(client, 'POST /hackathons/organizer/participants/<id>', f'/hackathons/organizer/participants/{hid}',
+             {'token': token})
+
+
+SCENARIOS = {'browse': browse, 'register': register, 'teams': teams, 'chat': chat, 'organizer': organizer}
+
+
+def run_load(world: World, rec: Recorder) -> float:
+    """Run the clients through warmup and the measured window; returns its length in seconds."""
+    names = list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[n] for n in names]
+    stop = threading.Event()
+
+    def client_loop(i):
+        rng = random.Random(args.seed * 1000 + i)
+        client = app.test_client()
+        while not stop.is_set():
+            SCENARIOS[rng.choices(names, weights)[0]](client, rec, world, rng)
+
+    threads = [threading.Thread(target=client_loop, args=(i,), daemon=True) for i in range(args.clients)]
+    for t in threads:
+        t.start()
+    time.sleep(args.warmup)
+    rec.enabled = True
+    began = time.perf_counter()
+    time.sleep(args.duration)
+    rec.enabled = False
+    window = time.perf_counter() - began
+    stop.set()
+    for t in threads:
+        t.join()
+    return window
+
+
+def percentile(ordered: list, q: float) -> float:
+    # Nearest rank
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+def summarize(values: list, errors: int, window: float) -> dict:
+    ordered = sorted(values)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': round(len(ordered) / window, 2),
+        'mean_ms': round(sum(ordered) / len(ordered), 3),
+        'p50_ms': round(percentile(ordered, 0.50), 3),
+        'p95_ms': round(percentile(ordered, 0.95), 3),
+        'p99_ms': round(percentile(ordered, 0.99), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+def report(rec: Recorder, window: float) -> dict:
+    everything = [v for values in rec.samples.values() for v in values]
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'started_at': datetime.utcnow().isoformat() + 'Z',
+            'backend': args.backend,
+            'python': platform.python_version(),
+            'window_s': round(window, 2),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'total': summarize(everything, sum(rec.errors.values()), window) if everything else {},
+        'endpoints': {
+            endpoint: summarize(values, rec.errors[endpoint], window)
+            for endpoint, values in sorted(rec.samples.items())
+        },
+    }
+
+
+def print_comparison(before: dict, after: dict):
+    print(f"{'endpoint':<48} {'p50 ms':>16} {'p95 ms':>16} {'rps':>14}", file=sys.stderr)
+    rows = [('TOTAL', before.get('total', {}), after.get('total', {}))]
+    rows += [(e, before['endpoints'].get(e, {}), stats) for e, stats in after['endpoints'].items()]
+
+    def delta(old, new, key):
+        if key not in old or key not in new:
+            return f"{new.get(key, '-'):>16}"
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        return f'{new[key]:>8.2f} {change:+6.1f}%'
+
+    for endpoint, old, new in rows:
+        print(f"{endpoint:<48} {delta(old, new, 'p50_ms')} {delta(old, new, 'p95_ms')} {delta(old, new, 'rps')}",
+              file=sys.stderr)
+
+
+def main():
+    get_client().drop_database(BENCH_DB)
+    create_indexes()
+    began = time.perf_counter()
+    world = seed(random.Random(args.seed))
+    print(f'seeded {args.hackathons} hackathons, ~{args.registrations} registrations '
+          f'in {time.perf_counter() - began:.1f}s; running {args.clients} clients for {args.duration:g}s',
+          file=sys.stderr)
+
+    rec = Recorder()
+    window = run_load(world, rec)
+    result = report(rec, window)
+    out = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(out + '\n')
+    else:
+        print(out)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), result)
+    get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
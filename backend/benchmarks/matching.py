@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Latency of teammate matching (matching.SkillIndex) for one large hackathon:
+time to build the index from scratch, to apply one incremental registration,
+and to answer top-k participant and team queries.
+
+Needs no database:
+
+    python backend/benchmarks/matching.py --registrants 20000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+
+import matching  # noqa: E402
+
+SKILLS = ['python', 'react', 'node.js', 'mongodb', 'figma', 'rust', 'go', 'typescript', 'pytorch', 'sql',
+          'docker', 'kubernetes', 'swift', 'kotlin', 'flutter', 'tailwind', 'ui design', 'ml', 'aws', 'solidity']
+ROLES = ['Frontend Developer', 'Backend Developer', 'Designer', 'Data Scientist', 'Mobile Developer', 'Product Manager']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced', '']
+
+
+def registrations(n: int, rng: random.Random) -> list:
+    start = datetime(2025, 1, 1)
+    return [{
+        'user_id': ObjectId(),
+        'full_name': f'Participant {i}',
+        'skills': rng.sample(SKILLS, rng.randint(1, 5)),
+        'role': rng.choice(ROLES),
+        'experience_level': rng.choice(LEVELS),
+        'looking_for_team': rng.random() < 0.7,
+        'updated_at': start + timedelta(seconds=i),
+    } for i in range(n)]
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registrants', type=int, default=20000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    regs = registrations(args.registrants, rng)
+    began = time.perf_counter()
+    index = matching.SkillIndex()
+    for reg in regs:
+        index.upsert(reg)
+    build_ms = (time.perf_counter() - began) * 1000
+
+    # Teams of 1-4 existing registrants
+    teams, pos = [], 0
+    while pos < len(regs) // 3:
+        size = rng.randint(1, 4)
+        teams.append({'_id': ObjectId(), 'name': f'team-{len(teams)}', 'members': [r['user_id'] for r in regs[pos:pos + size]]})
+        pos += size
+    in_team = {str(m) for t in teams for m in t['members']}
+    user = regs[-1]['user_id']
+
+    upsert_ms = timed(lambda: index.upsert({**regs[-1], 'skills': rng.sample(SKILLS, 3)}), args.runs)
+    people_ms = timed(lambda: index.top_candidates(user, in_team, args.k), args.runs)
+    teams_ms = timed(lambda: index.top_teams(user, teams, args.k), args.runs)
+
+    print(f'registrants      : {args.registrants} ({len(teams)} open teams)')
+    print(f'full build       : {build_ms:9.1f} ms')
+    print(f'incremental upsert: {upsert_ms:8.3f} ms')
+    print(f'top-{args.k} people     : {people_ms:8.2f} ms')
+    print(f'top-{args.k} teams      : {teams_ms:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark /hackathons/organizer/hackathons for organizers with 1, 50 and 500 events.
+
+Reports the number of MongoDB commands issued per request and the request latency,
+both with stored counters and for legacy documents that still need a backfill.
+
+Needs a disposable MongoDB (never point it at production):
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/organizer_dashboard.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pymongo import monitoring
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from bson import ObjectId  # noqa: E402
+from app import app  # noqa: E402
+from auth import create_jwt  # noqa: E402
+from db import create_indexes, get_client  # noqa: E402
+import hackathons  # noqa: E402
+
+
+def seed(organizer_id: ObjectId, n_hackathons: int, regs_per_hackathon: int):
+    hackathons.hackathons_col.delete_many({})
+    hackathons.registrations_col.delete_many({})
+    hackathons.teams_col.delete_many({})
+    now = datetime.utcnow()
+    docs = [{
+        '_id': ObjectId(),
+        'name': f'Bench Hackathon {i}',
+        'description': 'x' * 500,
+        'theme': 'AI',
+        'locationType': 'online',
+        'organizer_id': organizer_id,
+        'created_at': now - timedelta(minutes=i),
+        'updated_at': now,
+    } for i in range(n_hackathons)]
+    hackathons.hackathons_col.insert_many(docs)
+    regs, teams = [], []
+    for h in docs:
+        for j in range(regs_per_hackathon):
+            regs.append({'hackathon_id': h['_id'], 'user_id': ObjectId(), 'created_at': now})
+        for j in range(regs_per_hackathon // 5):
+            teams.append({'hackathon_id': h['_id'], 'name': f'team-{j}', 'code': f'C{j:05d}', 'members': []})
+    if regs:
+        hackathons.registrations_col.insert_many(regs)
+    if teams:
+        hackathons.teams_col.insert_many(teams)
+
+
+def measure(client, token: str, runs: int):
+    commands, latencies = [], []
+    for _ in range(runs):
+        before = counter.count
+        start = time.perf_counter()
+        res = client.post('/hackathons/organizer/hackathons', json={'token': token})
+        latencies.append((time.perf_counter() - start) * 1000)
+        commands.append(counter.count - before)
+        assert res.status_code == 200, res.get_json()
+    return commands, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,50,500')
+    parser.add_argument('--regs', type=int, default=20, help='registrations per hackathon')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    create_indexes()
+    organizer_id = ObjectId()
+    token = create_jwt(str(organizer_id), 'bench@example.com', 'organizer', 'Bench')
+    client = app.test_client()
+
+    print(f"{'events':>7} {'mode':>8} {'cmds/req':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        seed(organizer_id, size, args.regs)
+        # First request backfills the legacy documents, later ones read stored counters
+        for mode in ('legacy', 'stored'):
+            runs = 1 if mode == 'legacy' else args.runs
+            commands, latencies = measure(client, token, runs)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f'{size:>7} {mode:>8} {statistics.mean(commands):>9.1f} {statistics.median(latencies):>8.2f} {p95:>8.2f}')
+
+    get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
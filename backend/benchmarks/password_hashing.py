@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark for the password-hashing pool.
+
+Concurrent clients call verify_password (the CPU-bound half of /auth/login) for a
+fixed time at each pool size; pool size 0 is the old inline behaviour. Also
+reports how many calls were shed with HashingBusy at the configured queue limit.
+
+    python backend/benchmarks/password_hashing.py --sizes 0,1,2,4 --clients 16
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import hashing  # noqa: E402
+
+
+def run(pool_size: int, clients: int, seconds: float, max_pending: int, password_hash: str):
+    hashing.shutdown()
+    hashing.HASH_POOL_SIZE = pool_size
+    hashing.HASH_MAX_PENDING = max_pending
+    if pool_size:
+        hashing.verify_password(password_hash, 'password123')  # warm up the workers
+
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        done = shed = 0
+        while time.perf_counter() < deadline:
+            try:
+                assert hashing.verify_password(password_hash, 'password123')
+                done += 1
+            except hashing.HashingBusy:
+                shed += 1
+                time.sleep(0.01)
+        return done, shed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda _: client(), range(clients)))
+    elapsed = time.perf_counter() - start
+    done = sum(r[0] for r in results)
+    shed = sum(r[1] for r in results)
+    return done / elapsed, shed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='0,1,2,4')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--max-pending', type=int, default=None, help='defaults to 8 x pool size')
+    args = parser.parse_args()
+
+    password_hash = hashing.generate_password_hash('password123', hashing.PASSWORD_HASH_METHOD)
+    print(f"{'pool':>5} {'logins/s':>10} {'shed (503)':>11}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        max_pending = args.max_pending or max(1, size) * 8
+        rate, shed = run(size, args.clients, args.seconds, max_pending, password_hash)
+        print(f'{size:>5} {rate:>10.1f} {shed:>11}')
+    hashing.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Overhead of the rate limiter (ratelimit.py) per request.
+
+Times ratelimit.check() on one hot key and spread over many keys, from one
+thread and from --threads threads at once. It also times the whole
+before_request hook (JSON body parse, cached JWT decode and a user plus an IP
+bucket) as the app runs it.
+
+The memory backend needs no database. For the shared backend pass --backend
+mongo and a disposable MongoDB, or --backend mongomock for the in-memory
+stand-in (only comparable with itself):
+
+    python backend/benchmarks/rate_limiting.py
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/rate_limiting.py --backend mongo
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--backend', choices=('memory', 'mongo', 'mongomock'), default='memory')
+parser.add_argument('--calls', type=int, default=50000)
+parser.add_argument('--keys', type=int, default=100000, help='distinct identities in the spread run')
+parser.add_argument('--threads', type=int, default=8)
+args = parser.parse_args()
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+os.environ['RATE_LIMIT_BACKEND'] = 'memory' if args.backend == 'memory' else 'mongo'
+if args.backend == 'mongomock':
+    import mongomock
+    import pymongo
+    pymongo.MongoClient = mongomock.MongoClient
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app  # noqa: E402
+from db import get_client  # noqa: E402
+from tokens import create_jwt  # noqa: E402
+import ratelimit  # noqa: E402
+
+ENDPOINT = 'hackathons.send_team_message'
+# Large enough that nothing is rejected: the allowed path is what every request pays
+ratelimit.RULES[ENDPOINT] = [ratelimit.Limit('user', 10 ** 9, 1), ratelimit.Limit('ip', 10 ** 9, 1)]
+
+
+def per_call_us(fn, calls: int) -> float:
+    began = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - began) / calls * 1e6
+
+
+def threaded_us(fn, calls: int, threads: int) -> float:
+    """Wall time per call with `threads` threads sharing the calls."""
+    each = calls // threads
+    start = threading.Barrier(threads + 1)
+
+    def worker(offset):
+        start.wait()
+        for i in range(each):
+            fn(offset + i)
+
+    pool = [threading.Thread(target=worker, args=(t * each,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in pool:
+        t.join()
+    return (time.perf_counter() - began) / (each * threads) * 1e6
+
+
+def main():
+    calls = args.calls if args.backend == 'memory' else min(args.calls, 5000)
+    hot = lambda i: ratelimit.check(ENDPOINT, 'user-1', '10.0.0.1')  # noqa: E731
+    spread = lambda i: ratelimit.check(ENDPOINT, f'user-{i % args.keys}', f'10.0.{i % 250}.1')  # noqa: E731
+
+    token = create_jwt('64b000000000000000000001', 'bench@example.com', 'participant', 'Bench')
+    body = {'token': token, 'message': 'hello'}
+
+    def hook(i):
+        with app.test_request_context(f'/hackathons/teams/messages/send/{i}', method='POST', json=body,
+                                      environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            request_bound()
+
+    def baseline(i):
+        with app.test_request_context(f'/hackathons/teams/messages/send/{i}', method='POST', json=body,
+                                      environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            pass
+
+    def request_bound():
+        assert ratelimit.limit_request() is None
+
+    if args.backend != 'memory':
+        get_client().drop_database(BENCH_DB)
+    rows = [
+        ('check, one hot key', per_call_us(hot, calls)),
+        (f'check, {args.keys} keys', per_call_us(spread, calls)),
+        (f'check, one hot key, {args.threads} threads', threaded_us(hot, calls, args.threads)),
+        (f'check, {args.keys} keys, {args.threads} threads', threaded_us(spread, calls, args.threads)),
+    ]
+    # Hook cost net of building the request context
+    samples = [per_call_us(hook, calls // 10) - per_call_us(baseline, calls // 10) for _ in range(3)]
+    rows.append(('before_request hook (net)', statistics.median(samples)))
+
+    print(f'backend: {args.backend}')
+    for label, us in rows:
+        print(f'{label:<40} {us:8.2f} us/call')
+    if args.backend == 'memory':
+        print(f'buckets held: {len(ratelimit.backend)}')
+    else:
+        get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
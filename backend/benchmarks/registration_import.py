@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Throughput of the organizer bulk registration import
+(/hackathons/organizer/registrations/import) for a 50k-row file, as CSV and
+NDJSON. Each file is imported twice, first creating every registration and
+then updating them in place. A sample sent one row at a time through
+/register gives the baseline.
+
+Needs a disposable MongoDB (never point it at production):
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/registration_import.py --rows 50000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+# One client address sends every request here
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from app import app  # noqa: E402
+from auth import users_col  # noqa: E402
+from db import create_indexes, get_client  # noqa: E402
+from tokens import create_jwt  # noqa: E402
+import hackathons  # noqa: E402
+
+SKILLS = ['python', 'react', 'node.js', 'mongodb', 'figma', 'rust', 'go', 'typescript', 'pytorch', 'sql']
+ROLES = ['Frontend Developer', 'Backend Developer', 'Designer', 'Data Scientist', 'Product Manager']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+COLUMNS = ['email', 'name', 'role', 'skills', 'experience_level', 'looking_for_team', 'github']
+
+
+def seed_users(n: int) -> list:
+    now = datetime.utcnow()
+    users = [{'_id': ObjectId(), 'name': f'Cohort {i}', 'email': f'cohort{i}@example.com',
+              'password_hash': '', 'user_type': 'participant', 'created_at': now, 'updated_at': now}
+             for i in range(n)]
+    for i in range(0, n, 5000):
+        users_col.insert_many(users[i:i + 5000])
+    return users
+
+
+def make_hackathon(organizer_id) -> ObjectId:
+    return hackathons.hackathons_col.insert_one({
+        'name': 'Import Bench', 'description': '', 'theme': 'AI', 'locationType': 'online',
+        'organizer_id': organizer_id, 'registration_count': 0, 'team_count': 0,
+        'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow(),
+    }).inserted_id
+
+
+def rows_for(users: list, rng: random.Random) -> list:
+    return [{
+        'email': u['email'],
+        'name': u['name'],
+        'role': rng.choice(ROLES),
+        'skills': rng.sample(SKILLS, rng.randint(1, 4)),
+        'experience_level': rng.choice(LEVELS),
+        'looking_for_team': rng.random() < 0.7,
+        'github': f'https://github.com/cohort{i}',
+    } for i, u in enumerate(users)]
+
+
+def to_csv(rows: list) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, 'skills': ';'.join(row['skills']), 'looking_for_team': str(row['looking_for_team']).lower()})
+    return buf.getvalue().encode()
+
+
+def to_ndjson(rows: list) -> bytes:
+    return ''.join(json.dumps(row) + '\n' for row in rows).encode()
+
+
+def timed_import(client, hackathon_id, token: str, body: bytes, filename: str):
+    began = time.perf_counter()
+    res = client.post(
+        f'/hackathons/organizer/registrations/import/{hackathon_id}?report=errors',
+        data={'token': token, 'file': (io.BytesIO(body), filename)},
+        content_type='multipart/form-data',
+    )
+    elapsed = time.perf_counter() - began
+    assert res.status_code == 200, res.get_json()
+    return elapsed, res.get_json()['summary']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--baseline', type=int, default=1000, help='rows sent one at a time through /register')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    get_client().drop_database(BENCH_DB)
+    create_indexes()
+    users = seed_users(args.rows)
+    rows = rows_for(users, rng)
+    organizer_id = ObjectId()
+    token = create_jwt(str(organizer_id), 'bench@example.com', 'organizer', 'Bench')
+    client = app.test_client()
+
+    print(f"{'format':>7} {'pass':>7} {'size MB':>8} {'seconds':>8} {'rows/s':>9}  result")
+    for fmt, body in (('csv', to_csv(rows)), ('ndjson', to_ndjson(rows))):
+        hackathon_id = make_hackathon(organizer_id)
+        for label in ('create', 'update'):
+            elapsed, summary = timed_import(client, hackathon_id, token, body, f'cohort.{fmt}')
+            outcome = f"created={summary['created']} updated={summary['updated']} errors={summary['error']}"
+            print(f'{fmt:>7} {label:>7} {len(body) / 1e6:>8.1f} {elapsed:>8.2f} {args.rows / elapsed:>9,.0f}  {outcome}')
+
+    # Baseline: the same rows one request each through /register
+    hackathon_id = make_hackathon(organizer_id)
+    sample = list(zip(users, rows))[:args.baseline]
+    began = time.perf_counter()
+    for user, row in sample:
+        participant = create_jwt(str(user['_id']), user['email'], 'participant', user['name'])
+        res = client.post(f'/hackathons/register/{hackathon_id}', json={'token': participant, 'details': {
+            'fullName': row['name'], 'role': row['role'], 'skills': row['skills'],
+            'experienceLevel': row['experience_level'], 'hasTeam': not row['looking_for_team'], 'github': row['github'],
+        }})
+        assert res.status_code == 201, res.get_json()
+    elapsed = time.perf_counter() - began
+    print(f"{'/register':>7} {'create':>7} {'':>8} {elapsed:>8.2f} {len(sample) / elapsed:>9,.0f}  "
+          f'one request per row ({len(sample)} rows)')
+    get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
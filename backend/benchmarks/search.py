@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Latency of GET /hackathons/search over 100k hackathon documents: text queries
+of varying selectivity, with and without facet filters, and browsing without
+a query. A case-insensitive $regex scan over the same fields, which is what
+search would cost without the text index, is timed as the baseline.
+
+Needs a disposable MongoDB (never point it at production):
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/search.py --hackathons 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+# Measure the query, not the response cache
+os.environ['PUBLIC_CACHE_TTL'] = '0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app  # noqa: E402
+from db import create_indexes, get_client  # noqa: E402
+import search  # noqa: E402
+
+THEMES = ['Artificial Intelligence', 'Sustainability', 'Financial Technology', 'Healthcare', 'Creative Coding', 'Data Science']
+TRACKS = ['FinTech', 'Climate', 'Health', 'Education', 'Web3', 'Open Source', 'Accessibility', 'Robotics', 'Gaming']
+WORDS = ('build ship prototype model agent data platform mobile cloud api design community impact energy carbon '
+         'payments ledger privacy vision language sensor city farm water ocean learning student hardware').split()
+QUERIES = {
+    'common word': 'build',
+    'rare word': 'robotics',
+    'two words': 'carbon payments',
+    'phrase': '"language model"',
+}
+
+
+def seed(n: int, rng: random.Random):
+    now = datetime.utcnow()
+    batch = []
+    for i in range(n):
+        batch.append({
+            'name': f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Hack {i}',
+            'theme': rng.choice(THEMES),
+            'tracks': rng.sample(TRACKS, rng.randint(1, 3)),
+            'description': ' '.join(rng.choices(WORDS, k=60)),
+            'locationType': rng.choice(['online', 'offline']),
+            'prize': rng.choice([0, 500, 2500, 7500, 20000, 100000]),
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now,
+        })
+        if len(batch) == 5000:
+            search.hackathons_col.insert_many(batch)
+            batch = []
+    if batch:
+        search.hackathons_col.insert_many(batch)
+
+
+def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hackathons', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    get_client().drop_database(BENCH_DB)
+    create_indexes()
+    began = time.perf_counter()
+    seed(args.hackathons, random.Random(args.seed))
+    print(f'seeded {args.hackathons} hackathons in {time.perf_counter() - began:.1f}s')
+
+    client = app.test_client()
+
+    def endpoint(qs):
+        def call():
+            res = client.get(f'/hackathons/search?{qs}')
+            assert res.status_code == 200, res.get_json()
+        return call
+
+    cases = []
+    for label, q in QUERIES.items():
+        cases.append((f'text: {label}', endpoint(f'q={q}')))
+        cases.append((f'text: {label} + theme,prize', endpoint(f'q={q}&theme={THEMES[0]}&prize=1000-5000')))
+    cases.append(('browse (no q)', endpoint('sort=newest')))
+    cases.append(('browse + theme', endpoint(f'theme={THEMES[1]}&sort=prize_desc')))
+
+    def regex_scan(word):
+        def call():
+            pattern = {'$regex': word, '$options': 'i'}
+            list(search.hackathons_col.find(
+                {'$or': [{field: pattern} for field in search.TEXT_WEIGHTS]}, search.CARD_PROJECTION,
+            ).limit(20))
+            search.hackathons_col.count_documents({'$or': [{field: pattern} for field in search.TEXT_WEIGHTS]})
+        return call
+    cases.append(('baseline: $regex scan (rare word)', regex_scan('robotics')))
+
+    print(f'{"case":<40} {"p50 ms":>9} {"p95 ms":>9}')
+    for label, fn in cases:
+        p50, p95 = timed(fn, args.runs)
+        print(f'{label:<40} {p50:9.1f} {p95:9.1f}')
+    get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Worker startup time: lazy connection (current) versus the old eager bootstrap.
+
+Each sample runs in a fresh interpreter, as a newly booted gunicorn worker would.
+  lazy  - import the app and serve GET /
+  eager - the same plus what used to happen at import: connect and create every
+          index before serving (still what `flask create-indexes` does once)
+
+    BENCH_MONGODB_URI=mongodb+srv://... python backend/benchmarks/startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+from app import app
+if {eager}:
+    from db import create_indexes
+    create_indexes()
+app.test_client().get('/')
+print(time.perf_counter() - start)
+"""
+
+
+def sample(eager: bool, env: dict) -> float:
+    out = subprocess.run(
+        [sys.executable, '-c', SNIPPET.format(eager=eager)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+    env['MONGODB_DB'] = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+
+    print(f"{'mode':>6} {'median ms':>10} {'max ms':>8}")
+    for eager in (False, True):
+        times = [sample(eager, env) for _ in range(args.runs)]
+        print(f"{'eager' if eager else 'lazy':>6} {statistics.median(times):>10.1f} {max(times):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Time auto team formation (team_formation.form_teams) for one hackathon with
+tens of thousands of solo registrants, split into partitioning and writes.
+
+Needs a disposable MongoDB (never point it at production):
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/team_formation.py --registrants 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from db import create_indexes, get_client  # noqa: E402
+import team_formation  # noqa: E402
+
+SKILLS = ['python', 'react', 'node.js', 'mongodb', 'figma', 'rust', 'go', 'typescript', 'pytorch', 'sql']
+ROLES = ['Frontend Developer', 'Backend Developer', 'Designer', 'Data Scientist', 'Product Manager']
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+
+def seed(hackathon_id: ObjectId, n: int, rng: random.Random):
+    now = datetime.utcnow()
+    docs = [{
+        'hackathon_id': hackathon_id,
+        'user_id': ObjectId(),
+        'skills': rng.sample(SKILLS, rng.randint(1, 4)),
+        'role': rng.choice(ROLES),
+        'experience_level': rng.choice(LEVELS),
+        'looking_for_team': True,
+        'created_at': now,
+        'updated_at': now,
+    } for _ in range(n)]
+    for i in range(0, n, 5000):
+        team_formation.registrations_col.insert_many(docs[i:i + 5000])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registrants', type=int, default=50000)
+    parser.add_argument('--team-size', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    get_client().drop_database(BENCH_DB)
+    create_indexes()
+    hackathon_id = ObjectId()
+    seed(hackathon_id, args.registrants, rng)
+
+    began = time.perf_counter()
+    regs = team_formation.unteamed_registrants(hackathon_id)
+    load_s = time.perf_counter() - began
+    began = time.perf_counter()
+    groups = team_formation.partition(regs, args.team_size, 5)
+    partition_s = time.perf_counter() - began
+    began = time.perf_counter()
+    docs = team_formation.form_teams(hackathon_id, args.team_size, 5, rng=rng)
+    total_s = time.perf_counter() - began
+
+    roles_per_team = Counter(len({(r.get('role') or '') for r in g}) for g in groups)
+    print(f'registrants   : {args.registrants}')
+    print(f'load unteamed : {load_s:6.2f} s')
+    print(f'partition     : {partition_s:6.2f} s')
+    print(f'form_teams    : {total_s:6.2f} s end to end ({len(docs)} teams)')
+    print(f'team sizes    : {dict(Counter(len(d["members"]) for d in docs))}')
+    print(f'distinct roles per team: {dict(sorted(roles_per_team.items()))}')
+    get_client().drop_database(BENCH_DB)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for POST /hackathons/teams/join: hundreds of registered
+users race to join one team at once. Exactly MAX_TEAM_MEMBERS - 1 joins may
+succeed (the leader holds the first seat), every other one must get 'Team is
+full', and the stored team must never exceed MAX_TEAM_MEMBERS members.
+
+Needs a disposable MongoDB (never point it at production):
+
+    BENCH_MONGODB_URI=mongodb://localhost:27017 python backend/benchmarks/team_join_stress.py --joins 500
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCH_DB = os.environ.get('BENCH_MONGODB_DB', 'inovatehub_bench')
+os.environ['MONGODB_URI'] = os.environ.get('BENCH_MONGODB_URI', 'mongodb://localhost:27017')
+os.environ['MONGODB_DB'] = BENCH_DB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+from app import app  # noqa: E402
+from db import create_indexes, get_client  # noqa: E402
+from tokens import create_jwt  # noqa: E402
+import hackathons  # noqa: E402
+
+
+def seed(n_users: int):
+    now = datetime.utcnow()
+    hackathon_id = ObjectId()
+    leader = ObjectId()
+    users = [ObjectId() for _ in range(n_users)]
+    hackathons.hackathons_col.insert_one({'_id': hackathon_id, 'name': 'Stress', 'created_at': now})
+    hackathons.registrations_col.insert_many(
+        [{'hackathon_id': hackathon_id, 'user_id': u, 'created_at': now} for u in [leader] + users]
+    )
+    hackathons.teams_col.insert_one({
+        'hackathon_id': hackathon_id, 'name': 'Contested', 'code': 'RACE01',
+        'leader_id': leader, 'members': [leader], 'created_at': now,
+    })
+    tokens = [create_jwt(str(u), f'{u}@example.com', 'participant', 'Stress') for u in users]
+    return hackathon_id, tokens
+
+
+def run_round(hackathon_id, tokens, workers: int) -> Counter:
+    local = threading.local()
+    start = threading.Barrier(min(workers, len(tokens)))
+
+    def join(token):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+            start.wait()  # release the first wave together
+        res = local.client.post(f'/hackathons/teams/join/{hackathon_id}', json={'token': token, 'team_code': 'RACE01'})
+        return res.status_code, res.get_json()['message']
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return Counter(pool.map(join, tokens))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--joins', type=int, default=300, help='users racing for the team per round')
+    parser.add_argument('--workers', type=int, default=64)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    get_client().drop_database(BENCH_DB)
+    create_indexes()
+    failures = 0
+    for i in range(args.rounds):
+        hackathon_id, tokens = seed(args.joins)
+        began = time.perf_counter()
+        outcomes = run_round(hackathon_id, tokens, args.workers)
+        elapsed = time.perf_counter() - began
+        members = len(hackathons.teams_col.find_one({'hackathon_id': hackathon_id})['members'])
+        joined = outcomes[(200, 'Successfully joined team')]
+        ok = members == hackathons.MAX_TEAM_MEMBERS and joined == hackathons.MAX_TEAM_MEMBERS - 1
+        failures += not ok
+        print(f'round {i + 1}: {args.joins} joins in {elapsed:.2f}s -> {joined} joined, '
+              f'{members} members stored  {"OK" if ok else "OVERFLOW/MISMATCH"}  {dict(outcomes)}')
+    get_client().drop_database(BENCH_DB)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
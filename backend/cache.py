@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries also expire after `ttl` seconds.
+
+    Each gunicorn worker holds its own copy, so writes handled by another worker
+    are only picked up once the entry expires; keep `ttl` short.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING or entry[0] <= now:
+                if entry is not self._MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        """Store value; `ttl` overrides the cache-wide expiry for this entry."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        """Drop every tuple key starting with the elements of `prefix`, e.g.
+        ('get', id) drops ('get', id, revision); a bare value matches the
+        first element only."""
+        if not isinstance(prefix, tuple):
+            prefix = (prefix,)
+        n = len(prefix)
+        with self._lock:
+            for key in [k for k in self._data if isinstance(k, tuple) and k[:n] == prefix]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / total) if total else 0.0,
+            }
@@ -0,0 +1,141 @@
+"""
+Shared MongoDB access for every blueprint.
+
+The client is created on first use rather than at import, so workers start
+serving without waiting on SRV resolution, and modules can be imported without
+a reachable cluster. Indexes are declared next to the code that relies on them
+but only created by the one-shot migration command:
+
+    flask --app app create-indexes
+
+Deploys run it before serving: the Procfile's release phase and the backend
+container's start command.
+"""
+
+from threading import Lock
+from urllib.parse import quote_plus
+import os
+import time
+
+import click
+from pymongo import MongoClient
+
+
+# Prefer explicit MONGODB_URI if provided; otherwise build Atlas SRV URI using MONGODB_PASSWORD
+MONGODB_PASSWORD = "darshan"
+DEFAULT_ATLAS_URI = f"mongodb+srv://dar:{quote_plus(MONGODB_PASSWORD) if MONGODB_PASSWORD else '<db_password>'}@cluster0.g3jy5p4.mongodb.net/?retryWrites=true&w=majority&appName=Cluster0"
+MONGODB_URI = os.environ.get('MONGODB_URI', DEFAULT_ATLAS_URI)
+MONGODB_DB = os.environ.get('MONGODB_DB', 'inovatehub')
+
+# Connection tuning
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '50'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '20000'))
+# zlib ships with Python; add zstd/snappy here once their packages are installed
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', 'zlib')
+# Multi-document transactions need a replica set (Atlas always has one); set
+# MONGO_TRANSACTIONS=0 against a standalone mongod
+MONGO_TRANSACTIONS = os.environ.get('MONGO_TRANSACTIONS', '1') != '0'
+
+
+_client = None
+_lock = Lock()
+
+
+def client_options() -> dict:
+    options = {
+        'maxPoolSize': MONGO_MAX_POOL_SIZE,
+        'minPoolSize': MONGO_MIN_POOL_SIZE,
+        'connectTimeoutMS': MONGO_CONNECT_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'socketTimeoutMS': MONGO_SOCKET_TIMEOUT_MS,
+    }
+    if MONGO_COMPRESSORS:
+        options['compressors'] = MONGO_COMPRESSORS
+    return options
+
+
+def get_client() -> MongoClient:
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = MongoClient(MONGODB_URI, **client_options())
+    return _client
+
+
+def get_db():
+    return get_client()[MONGODB_DB]
+
+
+_async_client = None
+
+
+def get_async_client():
+    """Motor client for the ASGI mode (asgi.py); created inside the serving event loop."""
+    global _async_client
+    if _async_client is None:
+        # Optional dependency, see requirements-async.txt
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _async_client = AsyncIOMotorClient(MONGODB_URI, **client_options())
+    return _async_client
+
+
+def get_async_db():
+    return get_async_client()[MONGODB_DB]
+
+
+def run_transaction(callback):
+    """Return callback(session) run inside a transaction, retried by the driver
+    on transient errors. Without MONGO_TRANSACTIONS it runs with session=None."""
+    if not MONGO_TRANSACTIONS:
+        return callback(None)
+    with get_client().start_session() as session:
+        return session.with_transaction(callback)
+
+
+class LazyCollection:
+    """Stands in for a pymongo Collection until the first operation touches it."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def resolve(self):
+        return get_db()[self.name]
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f'LazyCollection({self.name!r})'
+
+
+def collection(name: str) -> LazyCollection:
+    return LazyCollection(name)
+
+
+# (collection name, keys, create_index kwargs), filled in at import by the blueprints
+INDEXES = []
+
+
+def declare_index(col: LazyCollection, keys, **kwargs):
+    INDEXES.append((col.name, keys, kwargs))
+
+
+def create_indexes(echo=None) -> int:
+    database = get_db()
+    for name, keys, kwargs in INDEXES:
+        created = database[name].create_index(keys, **kwargs)
+        if echo:
+            echo(f'{name}: {created}')
+    return len(INDEXES)
+
+
+@click.command('create-indexes')
+def create_indexes_command():
+    """Create every declared MongoDB index (idempotent)."""
+    start = time.perf_counter()
+    count = create_indexes(echo=click.echo)
+    click.echo(f'Ensured {count} indexes in {time.perf_counter() - start:.2f}s')
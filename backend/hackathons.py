@@ -1,91 +1,425 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
-from flask import Blueprint, jsonify, request
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from flask import Blueprint, Response, jsonify, request
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 from bson import ObjectId
-from urllib.parse import quote_plus
+import base64
+import csv
+import io
 import os
-import jwt
+import time
+import click
 from auth import users_col, profiles_col
-
-# Shared DB setup (reuse same env vars as auth)
-MONGODB_PASSWORD = "darshan"
-DEFAULT_ATLAS_URI = f"mongodb+srv://dar:{quote_plus(MONGODB_PASSWORD) if MONGODB_PASSWORD else '<db_password>'}@cluster0.g3jy5p4.mongodb.net/?retryWrites=true&w=majority&appName=Cluster0"
-MONGODB_URI = os.environ.get('MONGODB_URI', DEFAULT_ATLAS_URI)
-MONGODB_DB = os.environ.get('MONGODB_DB', 'inovatehub')
-JWT_SECRET = os.environ.get('JWT_SECRET', 'change_me_dev_secret')
-
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client[MONGODB_DB]
-hackathons_col = db['hackathons']
-registrations_col = db['registrations']
-teams_col = db['teams']
-team_requests_col = db['team_requests']
-submissions_col = db['submissions']
-
-# Create indexes
-hackathons_col.create_index([('created_at', DESCENDING)])
-registrations_col.create_index([('user_id', ASCENDING), ('hackathon_id', ASCENDING)], unique=True)
-teams_col.create_index([('hackathon_id', ASCENDING), ('name', ASCENDING)], unique=True)
-teams_col.create_index([('hackathon_id', ASCENDING), ('code', ASCENDING)], unique=True)
-team_requests_col.create_index([('team_id', ASCENDING), ('user_id', ASCENDING)], unique=True)
-team_requests_col.create_index([('hackathon_id', ASCENDING), ('user_id', ASCENDING)])
-submissions_col.create_index([('hackathon_id', ASCENDING)])
-submissions_col.create_index([('team_id', ASCENDING)])
+from cache import TTLCache
+from db import collection, declare_index, run_transaction
+from pubsub import Broker
+import http_cache
+import json_provider
+import matching
+import purge
+import registration_import
+import search
+import serializers
+import team_formation
+from tokens import decode_jwt, jwt_cache
+
+PUBLIC_CACHE_SIZE = int(os.environ.get('PUBLIC_CACHE_SIZE', '512'))
+PUBLIC_CACHE_TTL = float(os.environ.get('PUBLIC_CACHE_TTL', '30'))
+# Seconds a worker reuses a revision it read from MongoDB (0 reads it on every request)
+REVISION_CACHE_TTL = float(os.environ.get('REVISION_CACHE_TTL', '2'))
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+# Seconds between a message stream's catch-ups from MongoDB on messages
+# published by other workers; an idle stream also sends a keep-alive then.
+MESSAGE_STREAM_HEARTBEAT = float(os.environ.get('MESSAGE_STREAM_HEARTBEAT', '15'))
+MESSAGE_STREAM_MAX_SECONDS = float(os.environ.get('MESSAGE_STREAM_MAX_SECONDS', '300'))
+# How far back catch-ups re-read to pick up messages other workers inserted
+# out of order (covers insert latency and clock skew between app servers).
+MESSAGE_STREAM_OVERLAP = float(os.environ.get('MESSAGE_STREAM_OVERLAP', '10'))
+
+# Shared DB setup (db.py); the client is created on first use
+hackathons_col = collection('hackathons')
+registrations_col = collection('registrations')
+teams_col = collection('teams')
+team_requests_col = collection('team_requests')
+submissions_col = collection('submissions')
+
+# Indexes are declared here and created by `flask --app app create-indexes`
+declare_index(hackathons_col, [('created_at', DESCENDING)])
+# Keyset pagination and list filters (equality fields first, then the sort keys)
+declare_index(hackathons_col, [('created_at', DESCENDING), ('_id', DESCENDING)])
+declare_index(hackathons_col, [('theme', ASCENDING), ('locationType', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+declare_index(hackathons_col, [('locationType', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
+declare_index(registrations_col, [('user_id', ASCENDING), ('hackathon_id', ASCENDING)], unique=True)
+declare_index(registrations_col, [('hackathon_id', ASCENDING), ('_id', ASCENDING)])
+# Public participant filters (Find Team page)
+declare_index(registrations_col, [('hackathon_id', ASCENDING), ('looking_for_team', ASCENDING), ('_id', ASCENDING)])
+declare_index(registrations_col, [('hackathon_id', ASCENDING), ('role', ASCENDING), ('_id', ASCENDING)])
+declare_index(registrations_col, [('hackathon_id', ASCENDING), ('skills', ASCENDING)])
+# Incremental catch-up of the teammate matching index
+declare_index(registrations_col, [('hackathon_id', ASCENDING), ('updated_at', ASCENDING)])
+declare_index(teams_col, [('hackathon_id', ASCENDING), ('name', ASCENDING)], unique=True)
+declare_index(teams_col, [('hackathon_id', ASCENDING), ('code', ASCENDING)], unique=True)
+declare_index(teams_col, [('hackathon_id', ASCENDING), ('_id', ASCENDING)])
+declare_index(teams_col, [('hackathon_id', ASCENDING), ('members', ASCENDING)])
+declare_index(team_requests_col, [('team_id', ASCENDING), ('user_id', ASCENDING)], unique=True)
+declare_index(team_requests_col, [('hackathon_id', ASCENDING), ('user_id', ASCENDING)])
+declare_index(submissions_col, [('hackathon_id', ASCENDING)])
+declare_index(submissions_col, [('team_id', ASCENDING)])
 
 # Add team messages collection
-team_messages_col = db['team_messages']
-team_messages_col.create_index([('team_id', ASCENDING), ('created_at', DESCENDING)])
+team_messages_col = collection('team_messages')
+# Version counters for views not tied to one hackathon ({'_id': 'hackathons'} for /list)
+revisions_col = collection('revisions')
+declare_index(team_messages_col, [('team_id', ASCENDING), ('created_at', DESCENDING)])
+# Adds the _id tie-breaker so keyset paging by (created_at, _id) sorts from the index
+declare_index(team_messages_col, [('team_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)])
 
 hackathons_bp = Blueprint('hackathons', __name__)
 
+# New team messages fan out to open streams on channel str(team_id)
+message_broker = Broker()
+
+# Serialized public views keyed by version: ('list', <query args>, <list revision>)
+# and ('get', <hackathon id>, <revision>)
+public_cache = TTLCache(maxsize=PUBLIC_CACHE_SIZE, ttl=PUBLIC_CACHE_TTL)
+
+# Revisions behind those keys and the ETags: ('list',) and ('hackathon', <id>).
+# Cached hits then need no MongoDB round trip; the tradeoff is that a write
+# handled by another worker shows up here up to REVISION_CACHE_TTL late
+# (writes in this worker drop the entry at once).
+revision_cache = TTLCache(maxsize=PUBLIC_CACHE_SIZE, ttl=REVISION_CACHE_TTL)
+
+
+def count_by_hackathon(col, hackathon_ids: Optional[list] = None) -> dict:
+    """One grouped aggregation: {hackathon_id: number of documents in col}."""
+    pipeline = [{'$group': {'_id': '$hackathon_id', 'n': {'$sum': 1}}}]
+    if hackathon_ids is not None:
+        pipeline.insert(0, {'$match': {'hackathon_id': {'$in': hackathon_ids}}})
+    return {r['_id']: r['n'] for r in col.aggregate(pipeline)}
+
+
+# Stamped on documents whose registration_count/team_count are maintained by
+# $inc. Counters are only incremented on stamped documents, so a legacy
+# hackathon is backfilled from a full count before its first increment
+# rather than counting up from 0.
+COUNTERS_VERSION = 1
+
+
+def backfill_counters(hackathon_ids: list) -> dict:
+    """Count registrations/teams for unstamped hackathons and stamp them.
+
+    Returns {hackathon_id: counters} as counted. The write only applies while
+    the document is still unstamped, so a concurrent backfill or an increment
+    that already went through on a stamped document is never overwritten.
+    Two first writes racing on the same legacy hackathon can still leave it
+    off by one; `reconcile-counters` settles that.
+    """
+    reg_counts = count_by_hackathon(registrations_col, hackathon_ids)
+    team_counts = count_by_hackathon(teams_col, hackathon_ids)
+    counted = {}
+    ops = []
+    for hid in hackathon_ids:
+        counts = {
+            'registration_count': reg_counts.get(hid, 0),
+            'team_count': team_counts.get(hid, 0),
+        }
+        counted[hid] = counts
+        ops.append(UpdateOne(
+            {'_id': hid, 'counters_version': {'$ne': COUNTERS_VERSION}},
+            {'$set': {**counts, 'counters_version': COUNTERS_VERSION}, '$inc': {'revision': 1}},
+        ))
+    if ops:
+        hackathons_col.bulk_write(ops, ordered=False)
+    return counted
+
+
+def ensure_counters(hacks: list) -> list:
+    """Backfill counters on documents created before they were denormalized,
+    in a constant number of queries however many hackathons are passed. New
+    documents are stamped by create_hackathon."""
+    missing = [h for h in hacks if h.get('counters_version') != COUNTERS_VERSION]
+    if missing:
+        counted = backfill_counters([h['_id'] for h in missing])
+        for h in missing:
+            h.update(counted[h['_id']])
+            forget_revision(h['_id'])
+    return hacks
+
+
+def reconcile_counters() -> int:
+    """Recompute every hackathon's counters from registrations/teams in bulk.
+
+    Run it once after deploying the counters (and whenever they look off);
+    increments landing between the counts and the writes are overwritten.
+    """
+    reg_counts = count_by_hackathon(registrations_col)
+    team_counts = count_by_hackathon(teams_col)
+    ops = [
+        UpdateOne({'_id': h['_id']}, {'$set': {
+            'registration_count': reg_counts.get(h['_id'], 0),
+            'team_count': team_counts.get(h['_id'], 0),
+            'counters_version': COUNTERS_VERSION,
+        }, '$inc': {'revision': 1}})
+        for h in hackathons_col.find({}, {'_id': 1})
+    ]
+    for i in range(0, len(ops), 1000):
+        hackathons_col.bulk_write(ops[i:i + 1000], ordered=False)
+    return len(ops)
+
+
+@hackathons_bp.cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """Recompute denormalized registration/team counters."""
+    updated = reconcile_counters()
+    public_cache.clear()
+    click.echo(f'Reconciled counters on {updated} hackathons')
+
+
+def invalidate_hackathon_cache(hackathon_id: Optional[str] = None):
+    """A hackathon was created, edited or deleted: the card list changed."""
+    revisions_col.update_one({'_id': 'hackathons'}, {'$inc': {'n': 1}}, upsert=True)
+    revision_cache.delete(('list',))
+    public_cache.delete_prefix(('list',))
+    public_cache.delete_prefix(('search',))
+    if hackathon_id:
+        forget_revision(hackathon_id)
+        public_cache.delete_prefix(('get', str(hackathon_id)))
+
+
+def bump_revision(hackathon_id, **counters):
+    """Advance the revision behind the ETags of a hackathon's public views
+    (detail, teams, participants), optionally moving counters in the same write.
+
+    Call it after the registration/team write it accounts for: on a legacy
+    document the counters are backfilled from a full count instead, which
+    already includes that write.
+    """
+    oid = ObjectId(hackathon_id)
+    try:
+        if counters:
+            res = hackathons_col.update_one(
+                {'_id': oid, 'counters_version': COUNTERS_VERSION},
+                {'$inc': {'revision': 1, **counters}},
+            )
+            if res.matched_count:
+                return
+            backfill_counters([oid])
+        hackathons_col.update_one({'_id': oid}, {'$inc': {'revision': 1}})
+    finally:
+        forget_revision(hackathon_id)
+
+
+def forget_revision(hackathon_id):
+    """Drop this worker's cached revision of a hackathon after writing to it."""
+    revision_cache.delete(('hackathon', str(hackathon_id)))
+
+
+def list_revision() -> int:
+    revision = revision_cache.get(('list',))
+    if revision is None:
+        doc = revisions_col.find_one({'_id': 'hackathons'})
+        revision = doc['n'] if doc else 0
+        revision_cache.set(('list',), revision)
+    return revision
+
+
+def conditional_hackathon_view(kind: str, hackathon_id: str):
+    """(etag, 304 response or None) for a public per-hackathon view and its query args."""
+    args = tuple(sorted(request.args.items(multi=True)))
+    etag = http_cache.etag_for(kind, hackathon_id, args, hackathon_revision(hackathon_id))
+    return etag, http_cache.not_modified(etag)
+
+
+def hackathon_revision(hackathon_id: str) -> Optional[int]:
+    """Current revision, or None when the hackathon does not exist."""
+    key = ('hackathon', str(hackathon_id))
+    revision = revision_cache.get(key)
+    if revision is not None:
+        return revision
+    try:
+        doc = hackathons_col.find_one({'_id': ObjectId(hackathon_id)}, {'revision': 1})
+    except Exception:
+        doc = None
+    if not doc:
+        return None
+    revision_cache.set(key, doc.get('revision', 0))
+    return doc.get('revision', 0)
+
+
+# Fields needed to render a hackathon card (shared with search.py)
+LIST_PROJECTION = serializers.CARD_PROJECTION
+ORGANIZER_LIST_PROJECTION = {
+    **LIST_PROJECTION, 'description': 1, 'registration_count': 1, 'team_count': 1, 'counters_version': 1,
+}
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
-def decode_jwt(token: str) -> Optional[dict]:
+
+def encode_cursor(created_at, oid: ObjectId) -> str:
+    ts = created_at.isoformat() if isinstance(created_at, datetime) else ''
+    return base64.urlsafe_b64encode(f'{ts}|{oid}'.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Return (created_at, ObjectId) from an opaque cursor, or None if malformed."""
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
+        ts, oid = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+        return (datetime.fromisoformat(ts) if ts else None), ObjectId(oid)
     except Exception:
         return None
 
 
+def keyset_filter(created_at, oid: ObjectId) -> dict:
+    # Strictly "after" (created_at, _id) in descending order
+    if created_at is None:
+        return {'created_at': None, '_id': {'$lt': oid}}
+    return {'$or': [
+        {'created_at': {'$lt': created_at}},
+        {'created_at': created_at, '_id': {'$lt': oid}},
+        {'created_at': None},
+    ]}
+
+
+def keyset_newer_filter(created_at, oid: ObjectId) -> dict:
+    # Strictly "before" (created_at, _id) in descending order, i.e. newer documents
+    return {'$or': [
+        {'created_at': {'$gt': created_at}},
+        {'created_at': created_at, '_id': {'$gt': oid}},
+    ]}
+
+
+def parse_page_size(value) -> int:
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
 @hackathons_bp.route('/list', methods=['GET'])
 def list_hackathons():
-    docs = list(hackathons_col.find({}).sort('created_at', DESCENDING))
-    def to_public(h):
-        # Normalize rounds to include 'start'/'end' if only 'date' exists
-        rounds = []
-        for r in (h.get('rounds', []) or []):
-            if isinstance(r, dict):
-                rounds.append({
-                    'name': r.get('name', ''),
-                    'description': r.get('description', ''),
-                    'start': r.get('start') or r.get('date') or '',
-                    'end': r.get('end') or '',
-                })
-        
-        return {
-            'id': str(h['_id']),
-            'name': h.get('name', ''),
-            'theme': h.get('theme', ''),
-            'date': h.get('date', ''),
-            'start_date': h.get('start_date', h.get('date', '')),
-            'end_date': h.get('end_date', ''),
-            'rounds': rounds,
-            'prize': h.get('prize', 0),
-            'locationType': h.get('locationType', 'online'),
-            'image': h.get('image', ''),
-            'hint': h.get('hint', ''),
-            'description': h.get('description', ''),
-            'tracks': h.get('tracks', []),
-            'rules': h.get('rules', ''),
-            'prizes': h.get('prizes', ''),
-            'sponsors': h.get('sponsors', []),
-            'faq': h.get('faq', []),
-        }
-    return jsonify({'hackathons': [to_public(h) for h in docs]}), 200
+    """Cursor-paginated hackathon cards, newest first.
+
+    Query params: theme and locationType (comma-separated for several values),
+    starts_after / starts_before (ISO dates compared against start_date), limit
+    and cursor (next_cursor of the previous page). Without limit every matching
+    hackathon is returned.
+    """
+    args = tuple(sorted(request.args.items(multi=True)))
+    revision = list_revision()
+    etag = http_cache.etag_for('list', args, revision)
+    unchanged = http_cache.not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+    cache_key = ('list', args, revision)
+    cached = public_cache.get(cache_key)
+    if cached is not None:
+        return http_cache.with_etag(jsonify(cached), etag), 200
+
+    clauses = []
+    for field in ('theme', 'locationType'):
+        values = [v.strip() for v in (request.args.get(field) or '').split(',') if v.strip()]
+        if len(values) == 1:
+            clauses.append({field: values[0]})
+        elif values:
+            clauses.append({field: {'$in': values}})
+
+    date_window = {}
+    if request.args.get('starts_after'):
+        date_window['$gte'] = request.args['starts_after']
+    if request.args.get('starts_before'):
+        date_window['$lte'] = request.args['starts_before']
+    if date_window:
+        clauses.append({'start_date': date_window})
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        decoded_cursor = decode_cursor(cursor)
+        if not decoded_cursor:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        clauses.append(keyset_filter(*decoded_cursor))
+
+    query = {'$and': clauses} if len(clauses) > 1 else (clauses[0] if clauses else {})
+    docs_cursor = hackathons_col.find(query, LIST_PROJECTION).sort([('created_at', DESCENDING), ('_id', DESCENDING)])
+    limit = parse_page_size(request.args['limit']) if request.args.get('limit') else None
+    if limit:
+        # Fetch one extra document to know whether another page exists
+        docs_cursor = docs_cursor.limit(limit + 1)
+    docs = list(docs_cursor)
+    has_more = bool(limit) and len(docs) > limit
+    if has_more:
+        docs = docs[:limit]
+
+    next_cursor = encode_cursor(docs[-1].get('created_at'), docs[-1]['_id']) if has_more else None
+    payload = {'hackathons': [serializers.hackathon_card(h) for h in docs], 'next_cursor': next_cursor}
+    public_cache.set(cache_key, payload)
+    return http_cache.with_etag(jsonify(payload), etag), 200
+
+
+@hackathons_bp.route('/search', methods=['GET'])
+def search_hackathons():
+    """Ranked full-text search with facet counts.
+
+    Query params: q (words or "quoted phrase"; empty browses the newest
+    search.BROWSE_WINDOW hackathons), theme,
+    locationType and prize (comma-separated; prize takes facet values such as
+    1000-5000 or 50000+), sort (relevance, newest, prize_desc, prize_asc),
+    limit and offset.
+    """
+    args = tuple(sorted(request.args.items(multi=True)))
+    revision = list_revision()
+    etag = http_cache.etag_for('search', args, revision)
+    unchanged = http_cache.not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+    cache_key = ('search', args, revision)
+    cached = public_cache.get(cache_key)
+    if cached is not None:
+        return http_cache.with_etag(jsonify(cached), etag), 200
+
+    def values(name):
+        return [v.strip() for v in (request.args.get(name) or '').split(',') if v.strip()]
+
+    q = (request.args.get('q') or '').strip()
+    prizes = values('prize')
+    if any(p not in search.PRIZE_RANGES for p in prizes):
+        return jsonify({'message': f'prize must be one of {", ".join(search.PRIZE_RANGES)}'}), 400
+    sort = request.args.get('sort') or 'relevance'
+    if sort not in search.SORTS:
+        return jsonify({'message': f'sort must be one of {", ".join(search.SORTS)}'}), 400
+    try:
+        offset = max(0, int(request.args.get('offset') or 0))
+    except ValueError:
+        offset = 0
+    limit = min(parse_page_size(request.args.get('limit')), search.MAX_RESULTS)
+
+    found = search.search(q, values('theme'), values('locationType'), prizes, sort, offset, limit)
+    payload = {
+        'hackathons': [
+            {**serializers.hackathon_card(h), 'score': round(h['score'], 4) if 'score' in h else None}
+            for h in found['results']
+        ],
+        'total': found['total'],
+        'facets': found['facets'],
+        'next_offset': offset + limit if offset + limit < found['total'] else None,
+    }
+    public_cache.set(cache_key, payload)
+    return http_cache.with_etag(jsonify(payload), etag), 200
 
 
 @hackathons_bp.route('/get/<hackathon_id>', methods=['GET'])
 def get_hackathon(hackathon_id: str):
+    revision = hackathon_revision(hackathon_id)
+    if revision is None:
+        return jsonify({'message': 'Hackathon not found'}), 404
+    etag = http_cache.etag_for('get', hackathon_id, revision)
+    unchanged = http_cache.not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+    cache_key = ('get', hackathon_id, revision)
+    cached = public_cache.get(cache_key)
+    if cached is not None:
+        return http_cache.with_etag(jsonify(cached), etag), 200
     try:
         doc = hackathons_col.find_one({'_id': ObjectId(hackathon_id)})
     except Exception:
@@ -93,43 +427,10 @@ def get_hackathon(hackathon_id: str):
     if not doc:
         return jsonify({'message': 'Hackathon not found'}), 404
     # Return public-safe fields only
-    reg_count = registrations_col.count_documents({'hackathon_id': ObjectId(hackathon_id)})
-    team_count = teams_col.count_documents({'hackathon_id': ObjectId(hackathon_id)})
-    # Normalize rounds to include 'start'/'end' if only 'date' exists
-    rounds = []
-    for r in (doc.get('rounds', []) or []):
-        if isinstance(r, dict):
-            rounds.append({
-                'name': r.get('name', ''),
-                'description': r.get('description', ''),
-                'start': r.get('start') or r.get('date') or '',
-                'end': r.get('end') or '',
-            })
-
-    public = {
-        'id': str(doc['_id']),
-        'name': doc.get('name', ''),
-        'theme': doc.get('theme', ''),
-        'date': doc.get('date', ''),
-        'start_date': doc.get('start_date', doc.get('date', '')),
-        'end_date': doc.get('end_date', ''),
-        'rounds': rounds,
-        'prize': doc.get('prize', 0),
-        'locationType': doc.get('locationType', 'online'),
-        'location': doc.get('location'),
-        'image': doc.get('image', ''),
-        'hint': doc.get('hint', ''),
-        'description': doc.get('description', ''),
-        'tracks': doc.get('tracks', []),
-        'rules': doc.get('rules', ''),
-        'team_size': doc.get('team_size', 0),
-        'prizes': doc.get('prizes', ''),
-        'sponsors': doc.get('sponsors', []),
-        'faq': doc.get('faq', []),
-        'registration_count': reg_count,
-        'team_count': team_count,
-    }
-    return jsonify(public), 200
+    ensure_counters([doc])
+    public = serializers.hackathon_detail(doc)
+    public_cache.set(cache_key, public)
+    return http_cache.with_etag(jsonify(public), etag), 200
 
 
 @hackathons_bp.route('/create', methods=['POST'])
@@ -166,11 +467,15 @@ def create_hackathon():
         'sponsors': hack.get('sponsors', []),
         'faq': hack.get('faq', []),
         'team_size': int(hack.get('team_size', 0) or 0),
+        'registration_count': 0,
+        'team_count': 0,
+        'counters_version': COUNTERS_VERSION,
         'organizer_id': ObjectId(decoded['sub']),
         'created_at': datetime.utcnow(),
         'updated_at': datetime.utcnow(),
     }
     res = hackathons_col.insert_one(doc)
+    invalidate_hackathon_cache()
     return jsonify({'message': 'Hackathon created', 'id': str(res.inserted_id)}), 201
 
 
@@ -194,7 +499,8 @@ def update_hackathon(hackathon_id: str):
     allowed = {'name','description','theme','locationType','location','date','rounds','prize','image','hint','tracks','rules','prizes','sponsors','faq','team_size'}
     updates = {k: v for k, v in hack.items() if k in allowed}
     updates['updated_at'] = datetime.utcnow()
-    hackathons_col.update_one({'_id': ObjectId(hackathon_id)}, {'$set': updates})
+    hackathons_col.update_one({'_id': ObjectId(hackathon_id)}, {'$set': updates, '$inc': {'revision': 1}})
+    invalidate_hackathon_cache(hackathon_id)
     return jsonify({'message': 'Hackathon updated'}), 200
 
 
@@ -214,35 +520,49 @@ def delete_hackathon(hackathon_id: str):
     if str(doc.get('organizer_id')) != decoded.get('sub'):
         return jsonify({'message': 'Forbidden'}), 403
 
-    hackathons_col.delete_one({'_id': ObjectId(hackathon_id)})
-    registrations_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    teams_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    team_requests_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    return jsonify({'message': 'Hackathon deleted'}), 200
+    # The hackathon goes in a small transaction; its children are purged in the background
+    job_id = purge.delete_hackathon(doc['_id'], doc['organizer_id'])
+    matching.drop_index(hackathon_id)
+    invalidate_hackathon_cache(hackathon_id)
+    return jsonify({'message': 'Hackathon deleted', 'purge_job_id': str(job_id)}), 200
 
 
 # Alias delete route used by organizer dashboard client
 @hackathons_bp.route('/organizer/delete/<hackathon_id>', methods=['POST', 'DELETE'])
 def organizer_delete_hackathon(hackathon_id: str):
+    return delete_hackathon(hackathon_id)
+
+
+@hackathons_bp.route('/organizer/purge/<job_id>', methods=['POST'])
+def purge_progress(job_id: str):
+    """Progress of the background purge started by a hackathon delete."""
     data = request.get_json(force=True) or {}
-    token = data.get('token')
-    decoded = decode_jwt(token or '')
+    decoded = decode_jwt(data.get('token') or '')
     if not decoded:
         return jsonify({'message': 'Unauthorized'}), 401
     try:
-        doc = hackathons_col.find_one({'_id': ObjectId(hackathon_id)})
+        job = purge.purge_jobs_col.find_one({'_id': ObjectId(job_id)}, {'team_ids': 0})
     except Exception:
-        doc = None
-    if not doc:
+        job = None
+    if not job:
         return jsonify({'message': 'Not found'}), 404
-    if str(doc.get('organizer_id')) != decoded.get('sub'):
+    if str(job.get('organizer_id')) != decoded.get('sub'):
         return jsonify({'message': 'Forbidden'}), 403
+    return jsonify({'job': purge.job_progress(job)}), 200
 
-    hackathons_col.delete_one({'_id': ObjectId(hackathon_id)})
-    registrations_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    teams_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    team_requests_col.delete_many({'hackathon_id': ObjectId(hackathon_id)})
-    return jsonify({'message': 'Hackathon deleted'}), 200
+
+@hackathons_bp.cli.command('resume-purges')
+def resume_purges_command():
+    """Finish purges interrupted by a restart or failure."""
+    job_ids = purge.unfinished_jobs()
+    resumed = 0
+    for job_id in job_ids:
+        if not purge.run_purge(job_id):
+            click.echo(f'{job_id}: claimed by another worker, skipped')
+            continue
+        resumed += 1
+        click.echo(f'{job_id}: {purge.purge_jobs_col.find_one({"_id": job_id})["status"]}')
+    click.echo(f'Resumed {resumed} purge jobs')
 
 
 @hackathons_bp.route('/register/<hackathon_id>', methods=['POST'])
@@ -300,7 +620,10 @@ def register(hackathon_id: str):
     )
 
     if res.upserted_id is not None:
+        bump_revision(hackathon_id, registration_count=1)
         return jsonify({'message': 'Registered'}), 201
+    # Public participant fields (skills, role...) may have changed
+    bump_revision(hackathon_id)
     return jsonify({'message': 'Registration updated'}), 200
 
 
@@ -315,19 +638,61 @@ def my_registrations():
     regs = list(registrations_col.find({'user_id': ObjectId(decoded['sub'])}))
     hack_ids = [r['hackathon_id'] for r in regs]
     hacks = list(hackathons_col.find({'_id': {'$in': hack_ids}}))
-    return jsonify({'hackathons': [{
-        'id': str(h['_id']),
-        'name': h.get('name',''),
-        'theme': h.get('theme',''),
-        'date': h.get('date',''),
-        'rounds': h.get('rounds',[]),
-        'prize': h.get('prize',0),
-        'locationType': h.get('locationType','online'),
-        'image': h.get('image',''),
-        'hint': h.get('hint',''),
-        'description': h.get('description',''),
-        'registrationStatus': 'Confirmed',
-    } for h in hacks]}), 200
+    return jsonify({'hackathons': [serializers.hackathon_registered(h) for h in hacks]}), 200
+
+
+@hackathons_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        'public_cache': public_cache.stats(),
+        'revision_cache': revision_cache.stats(),
+        'jwt_cache': jwt_cache.stats(),
+    }), 200
+
+
+# Fixed team size limit (including leader)
+MAX_TEAM_MEMBERS = 5
+
+
+def add_member(team_filter: dict, user_id: ObjectId, session=None) -> Optional[dict]:
+    """Add user_id to the team matching team_filter in one conditional write.
+
+    Capacity and membership are checked by the filter itself, so concurrent
+    joins cannot push a team past MAX_TEAM_MEMBERS. Returns the updated team
+    ({'hackathon_id'} only), or None when nothing matched.
+    """
+    query, update = add_member_query(team_filter, user_id)
+    return teams_col.find_one_and_update(
+        query, update,
+        projection={'hackathon_id': 1},
+        return_document=ReturnDocument.AFTER,
+        session=session,
+    )
+
+
+def add_member_query(team_filter: dict, user_id: ObjectId) -> tuple:
+    """(filter, update) of add_member; also run by the ASGI join_team."""
+    return (
+        {
+            **team_filter,
+            'members': {'$ne': user_id},
+            f'members.{MAX_TEAM_MEMBERS - 1}': {'$exists': False},
+        },
+        {'$push': {'members': user_id}, '$set': {'updated_at': datetime.utcnow()}},
+    )
+
+
+def add_member_failure(team_filter: dict, user_id: ObjectId) -> str:
+    """Why add_member matched nothing: 'missing', 'member' or 'full'."""
+    return member_failure_reason(teams_col.find_one(team_filter, {'members': 1}), user_id)
+
+
+def member_failure_reason(team: Optional[dict], user_id: ObjectId) -> str:
+    if not team:
+        return 'missing'
+    if user_id in team.get('members', []):
+        return 'member'
+    return 'full'
 
 
 # Team Management Routes
@@ -364,8 +729,6 @@ def create_team(hackathon_id: str):
         code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
 
     now = datetime.utcnow()
-    # Fixed team size limit of 5 members (including leader)
-    max_members = 5
     team_doc = {
         'hackathon_id': ObjectId(hackathon_id),
         'name': name,
@@ -373,13 +736,14 @@ def create_team(hackathon_id: str):
         'code': code,
         'leader_id': ObjectId(decoded['sub']),
         'members': [ObjectId(decoded['sub'])],  # Leader is first member
-        'max_members': max_members,
+        'max_members': MAX_TEAM_MEMBERS,
         'created_at': now,
         'updated_at': now,
     }
     
     try:
         res = teams_col.insert_one(team_doc)
+        bump_revision(hackathon_id, team_count=1)
         return jsonify({
             'message': 'Team created successfully',
             'team_id': str(res.inserted_id),
@@ -391,141 +755,184 @@ def create_team(hackathon_id: str):
 
 @hackathons_bp.route('/teams/list/<hackathon_id>', methods=['GET'])
 def list_teams(hackathon_id: str):
+    """Teams of a hackathon with member names/emails resolved in one users query.
+
+    Query params: open=1 to return only teams below max_members; limit and
+    cursor (next_cursor of the previous page) to paginate. Without limit every
+    matching team is returned.
+    """
+    etag, unchanged = conditional_hackathon_view('teams', hackathon_id)
+    if unchanged is not None:
+        return unchanged
     try:
-        teams = list(teams_col.find({'hackathon_id': ObjectId(hackathon_id)}))
+        query = {'hackathon_id': ObjectId(hackathon_id)}
+        if request.args.get('open') in ('1', 'true'):
+            query['$expr'] = {'$lt': [{'$size': {'$ifNull': ['$members', []]}}, {'$ifNull': ['$max_members', 5]}]}
+        cursor = request.args.get('cursor')
+        if cursor:
+            if not ObjectId.is_valid(cursor):
+                return jsonify({'message': 'Invalid cursor'}), 400
+            query['_id'] = {'$gt': ObjectId(cursor)}
+
+        teams_cursor = teams_col.find(query).sort('_id', ASCENDING)
+        limit = parse_page_size(request.args['limit']) if request.args.get('limit') else None
+        if limit:
+            teams_cursor = teams_cursor.limit(limit + 1)
+        teams = list(teams_cursor)
+        has_more = bool(limit) and len(teams) > limit
+        if has_more:
+            teams = teams[:limit]
+
+        # Resolve every member of every team on this page in a single query
+        member_ids = list({m for team in teams for m in team.get('members', [])})
+        users = list(users_col.find({'_id': {'$in': member_ids}}, {'name': 1, 'email': 1})) if member_ids else []
+        user_map = {str(u['_id']): u for u in users}
+
+        team_list = [serializers.team_public(team, user_map) for team in teams]
         
-        # Get user details for team members
-        team_list = []
-        for team in teams:
-            member_ids = team.get('members', [])
-            users = list(users_col.find({'_id': {'$in': member_ids}}))
-            user_map = {str(u['_id']): u for u in users}
-            
-            team_info = {
-                'id': str(team['_id']),
-                'name': team.get('name', ''),
-                'description': team.get('description', ''),
-                'code': team.get('code', ''),
-                'leader_id': str(team.get('leader_id', '')),
-                'members': [
-                    {
-                        'id': str(member_id),
-                        'name': user_map.get(str(member_id), {}).get('name', 'Unknown'),
-                        'email': user_map.get(str(member_id), {}).get('email', '')
-                    }
-                    for member_id in member_ids
-                ],
-                'max_members': 5,
-                'created_at': team.get('created_at', ''),
-            }
-            team_list.append(team_info)
-        
-        return jsonify({'teams': team_list}), 200
+        next_cursor = str(teams[-1]['_id']) if has_more else None
+        return http_cache.with_etag(jsonify({'teams': team_list, 'next_cursor': next_cursor}), etag), 200
     except Exception as e:
         return jsonify({'message': f'Failed to list teams: {str(e)}'}), 500
 
 
-@hackathons_bp.route('/teams/join/<hackathon_id>', methods=['POST'])
-def join_team(hackathon_id: str):
-    data = request.get_json(force=True) or {}
-    token = data.get('token')
-    team_code = (data.get('team_code') or '').strip()
-    decoded = decode_jwt(token or '')
+# The join_team, request_join_team, invite_participant and get_my_team views
+# also run natively under ASGI (async_views.py). Their input checks, queries
+# and replies live in the helpers below so both paths return the same thing;
+# error helpers return a (payload, status) reply or None.
+
+NOT_REGISTERED = ({'message': 'You must register for this hackathon first'}, 400)
+JOIN_FAILURES = {
+    'missing': ({'message': 'Invalid team code'}, 404),
+    'member': ({'message': 'You are already a member of this team'}, 400),
+    'full': ({'message': 'Team is full'}, 400),
+    'in_team': ({'message': 'You are already in a team for this hackathon'}, 400),
+}
+
+
+def lost_join_race(hackathon_oid: ObjectId, team_id: ObjectId, user_id: ObjectId) -> bool:
+    """After adding user_id to team_id: settle a membership of another team
+    written concurrently (the older team wins); True if this join lost."""
+    return (team_id, user_id) in team_formation.resolve_double_membership(hackathon_oid, [user_id])
+
+
+def parse_join_team(data: dict) -> tuple:
+    """(decoded token, team code, error reply) from a /teams/join body."""
+    decoded = decode_jwt(data.get('token') or '')
     if not decoded:
-        return jsonify({'message': 'Unauthorized'}), 401
-    
+        return None, None, ({'message': 'Unauthorized'}, 401)
+    team_code = (data.get('team_code') or '').strip()
     if not team_code:
-        return jsonify({'message': 'Team code is required'}), 400
+        return decoded, None, ({'message': 'Team code is required'}, 400)
+    return decoded, team_code, None
 
-    # Check if user is registered for this hackathon
-    reg = registrations_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'user_id': ObjectId(decoded['sub'])
-    })
-    if not reg:
-        return jsonify({'message': 'You must register for this hackathon first'}), 400
 
-    # Find team by code
-    team = teams_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'code': team_code
-    })
-    if not team:
-        return jsonify({'message': 'Invalid team code'}), 404
+def registration_query(hackathon_id: str, user_id) -> dict:
+    return {'hackathon_id': ObjectId(hackathon_id), 'user_id': ObjectId(user_id)}
 
-    # Check if user is already in the team
-    if ObjectId(decoded['sub']) in team.get('members', []):
-        return jsonify({'message': 'You are already a member of this team'}), 400
 
-    # Check if team is full (prefer team's saved max_members; fallback to hackathon team_size)
-    try:
-        hack = hackathons_col.find_one({'_id': ObjectId(hackathon_id)})
-    except Exception:
-        hack = None
-    # Enforce fixed maximum size of 5
-    effective_max = 5
-    if len(team.get('members', [])) >= effective_max:
-        return jsonify({'message': 'Team is full'}), 400
+def join_team_lookups(hackathon_id: str, user_id: ObjectId) -> list:
+    """(collection, filter, projection) for the caller's registration and
+    current team; independent, so the ASGI view runs them concurrently."""
+    return [
+        ('registrations', registration_query(hackathon_id, user_id), {'_id': 1}),
+        ('teams', my_team_query(hackathon_id, user_id), {'code': 1}),
+    ]
 
-    # Add user to team
-    teams_col.update_one(
-        {'_id': team['_id']},
-        {
-            '$addToSet': {'members': ObjectId(decoded['sub'])},
-            '$set': {'updated_at': datetime.utcnow()}
-        }
-    )
+
+def join_team_error(reg: Optional[dict], current: Optional[dict], team_code: str) -> Optional[tuple]:
+    if not reg:
+        return NOT_REGISTERED
+    if current:
+        return JOIN_FAILURES['member' if current.get('code') == team_code else 'in_team']
+    return None
+
+
+@hackathons_bp.route('/teams/join/<hackathon_id>', methods=['POST'])
+def join_team(hackathon_id: str):
+    decoded, team_code, error = parse_join_team(request.get_json(force=True) or {})
+    if error:
+        return jsonify(error[0]), error[1]
+
+    # Registered for this hackathon, and not on a team yet
+    user_id = ObjectId(decoded['sub'])
+    error = join_team_error(*find_each(join_team_lookups(hackathon_id, user_id)), team_code)
+    if error:
+        return jsonify(error[0]), error[1]
+
+    team_filter = {'hackathon_id': ObjectId(hackathon_id), 'code': team_code}
+    added = add_member(team_filter, user_id)
+    if added is None:
+        payload, status = JOIN_FAILURES[add_member_failure(team_filter, user_id)]
+        return jsonify(payload), status
+    lost = lost_join_race(ObjectId(hackathon_id), added['_id'], user_id)
+    bump_revision(hackathon_id)
+    if lost:
+        return jsonify(JOIN_FAILURES['in_team'][0]), JOIN_FAILURES['in_team'][1]
 
     return jsonify({'message': 'Successfully joined team'}), 200
 
 
-@hackathons_bp.route('/teams/request/<hackathon_id>', methods=['POST'])
-def request_join_team(hackathon_id: str):
-    data = request.get_json(force=True) or {}
-    token = data.get('token')
-    team_id = data.get('team_id')
-    message = (data.get('message') or '').strip()
-    decoded = decode_jwt(token or '')
+def parse_request_join(data: dict) -> tuple:
+    """(decoded token, team id, message, error reply) from a /teams/request body."""
+    decoded = decode_jwt(data.get('token') or '')
     if not decoded:
-        return jsonify({'message': 'Unauthorized'}), 401
-    
+        return None, None, None, ({'message': 'Unauthorized'}, 401)
+    team_id = data.get('team_id')
     if not team_id:
-        return jsonify({'message': 'Team ID is required'}), 400
+        return decoded, None, None, ({'message': 'Team ID is required'}, 400)
+    return decoded, team_id, (data.get('message') or '').strip(), None
 
-    # Check if user is registered for this hackathon
-    reg = registrations_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'user_id': ObjectId(decoded['sub'])
-    })
-    if not reg:
-        return jsonify({'message': 'You must register for this hackathon first'}), 400
 
-    # Check if team exists
-    team = teams_col.find_one({'_id': ObjectId(team_id)})
-    if not team:
-        return jsonify({'message': 'Team not found'}), 404
+def request_join_lookups(hackathon_id: str, user_id: ObjectId, team_id: str) -> list:
+    """(collection, filter, projection) for the caller's registration, the team
+    and an earlier request; the answers go to request_join_error in order."""
+    return [
+        ('registrations', registration_query(hackathon_id, user_id), {'_id': 1}),
+        ('teams', {'_id': ObjectId(team_id)}, {'_id': 1}),
+        ('team_requests', {'team_id': ObjectId(team_id), 'user_id': user_id}, {'_id': 1}),
+    ]
 
-    # Check if request already exists
-    existing_request = team_requests_col.find_one({
-        'team_id': ObjectId(team_id),
-        'user_id': ObjectId(decoded['sub'])
-    })
+
+def request_join_error(reg, team, existing_request) -> Optional[tuple]:
+    if not reg:
+        return NOT_REGISTERED
+    if not team:
+        return {'message': 'Team not found'}, 404
     if existing_request:
-        return jsonify({'message': 'Request already sent'}), 400
+        return {'message': 'Request already sent'}, 400
+    return None
 
-    # Create request
+
+def join_request_doc(hackathon_id: str, team_id: str, user_id: ObjectId, message: str) -> dict:
     now = datetime.utcnow()
-    request_doc = {
+    return {
         'hackathon_id': ObjectId(hackathon_id),
         'team_id': ObjectId(team_id),
-        'user_id': ObjectId(decoded['sub']),
+        'user_id': user_id,
         'message': message,
         'status': 'pending',  # pending, approved, rejected
         'created_at': now,
         'updated_at': now,
     }
-    
-    team_requests_col.insert_one(request_doc)
+
+
+def find_each(lookups: list) -> list:
+    return [collection(name).find_one(query, projection) for name, query, projection in lookups]
+
+
+@hackathons_bp.route('/teams/request/<hackathon_id>', methods=['POST'])
+def request_join_team(hackathon_id: str):
+    decoded, team_id, message, error = parse_request_join(request.get_json(force=True) or {})
+    if error:
+        return jsonify(error[0]), error[1]
+
+    user_id = ObjectId(decoded['sub'])
+    error = request_join_error(*find_each(request_join_lookups(hackathon_id, user_id, team_id)))
+    if error:
+        return jsonify(error[0]), error[1]
+
+    team_requests_col.insert_one(join_request_doc(hackathon_id, team_id, user_id, message))
     return jsonify({'message': 'Request sent successfully'}), 201
 
 
@@ -597,30 +1004,32 @@ def respond_to_request():
         return jsonify({'message': 'Forbidden'}), 403
 
     if action == 'approve':
-        # Check if team is full (fixed at 5)
-        if len(team.get('members', [])) >= 5:
+        def approve(session):
+            # Membership and request status change together or not at all.
+            # The requester may have joined or formed another team since asking.
+            current = teams_col.find_one({'hackathon_id': team['hackathon_id'], 'members': req['user_id']}, {'_id': 1}, session=session)
+            if current:
+                return 'member' if current['_id'] == team['_id'] else 'in_team'
+            if add_member({'_id': team['_id']}, req['user_id'], session=session) is None:
+                return 'full'
+            team_requests_col.update_one(
+                {'_id': req['_id']},
+                {'$set': {'status': 'approved', 'updated_at': datetime.utcnow()}},
+                session=session,
+            )
+            return 'approved'
+
+        outcome = run_transaction(approve)
+        if outcome == 'approved':
+            if lost_join_race(team['hackathon_id'], team['_id'], req['user_id']):
+                outcome = 'in_team'
+            bump_revision(team['hackathon_id'])
+        if outcome == 'member':
+            return jsonify({'message': 'User is already a member of this team'}), 400
+        if outcome == 'in_team':
+            return jsonify({'message': 'User is already in a team for this hackathon'}), 400
+        if outcome == 'full':
             return jsonify({'message': 'Team is full'}), 400
-        
-        # Add user to team
-        teams_col.update_one(
-            {'_id': req['team_id']},
-            {
-                '$addToSet': {'members': req['user_id']},
-                '$set': {'updated_at': datetime.utcnow()}
-            }
-        )
-        
-        # Update request status
-        team_requests_col.update_one(
-            {'_id': ObjectId(request_id)},
-            {
-                '$set': {
-                    'status': 'approved',
-                    'updated_at': datetime.utcnow()
-                }
-            }
-        )
-        
         return jsonify({'message': 'Request approved'}), 200
     else:
         # Reject request
@@ -695,23 +1104,30 @@ def respond_invitation():
         return jsonify({'message': 'Team not found'}), 404
 
     if action == 'accept':
-        # Ensure user not already in another team for this hackathon
-        existing = teams_col.find_one({'hackathon_id': team['hackathon_id'], 'members': ObjectId(decoded['sub'])})
-        if existing:
+        user_id = ObjectId(decoded['sub'])
+
+        def accept(session):
+            # Ensure user not already in another team for this hackathon
+            if teams_col.find_one({'hackathon_id': team['hackathon_id'], 'members': user_id}, {'_id': 1}, session=session):
+                return 'in_team'
+            if add_member({'_id': team['_id']}, user_id, session=session) is None:
+                return 'full'
+            team_requests_col.update_one(
+                {'_id': req['_id']},
+                {'$set': {'status': 'approved', 'updated_at': datetime.utcnow()}},
+                session=session,
+            )
+            return 'accepted'
+
+        outcome = run_transaction(accept)
+        if outcome == 'accepted':
+            if lost_join_race(team['hackathon_id'], team['_id'], user_id):
+                outcome = 'in_team'
+            bump_revision(team['hackathon_id'])
+        if outcome == 'in_team':
             return jsonify({'message': 'You are already in a team for this hackathon'}), 400
-        # Check capacity
-        if len(team.get('members', [])) >= 5:
+        if outcome == 'full':
             return jsonify({'message': 'Team is full'}), 400
-        # Add member
-        teams_col.update_one(
-            {'_id': team['_id']},
-            {'$addToSet': {'members': ObjectId(decoded['sub'])}, '$set': {'updated_at': datetime.utcnow()}}
-        )
-        # Mark as approved
-        team_requests_col.update_one(
-            {'_id': ObjectId(request_id)},
-            {'$set': {'status': 'approved', 'updated_at': datetime.utcnow()}}
-        )
         return jsonify({'message': 'Invitation accepted'}), 200
     else:
         team_requests_col.update_one(
@@ -733,46 +1149,15 @@ def organizer_hackathons():
     if decoded.get('user_type') != 'organizer':
         return jsonify({'message': 'Forbidden'}), 403
 
-    hackathons = list(hackathons_col.find({'organizer_id': ObjectId(decoded['sub'])}).sort('created_at', DESCENDING))
-    
-    hackathon_list = []
-    for hack in hackathons:
-        # Count registrations
-        reg_count = registrations_col.count_documents({'hackathon_id': hack['_id']})
-        
-        # Count teams
-        team_count = teams_col.count_documents({'hackathon_id': hack['_id']})
-        
-        # Normalize rounds
-        rounds = []
-        for r in (hack.get('rounds', []) or []):
-            if isinstance(r, dict):
-                rounds.append({
-                    'name': r.get('name', ''),
-                    'description': r.get('description', ''),
-                    'start': r.get('start') or r.get('date') or '',
-                    'end': r.get('end') or '',
-                })
-
-        hack_info = {
-            'id': str(hack['_id']),
-            'name': hack.get('name', ''),
-            'theme': hack.get('theme', ''),
-            'date': hack.get('date', ''),
-            'start_date': hack.get('start_date', hack.get('date', '')),
-            'end_date': hack.get('end_date', ''),
-            'rounds': rounds,
-            'prize': hack.get('prize', 0),
-            'locationType': hack.get('locationType', 'online'),
-            'image': hack.get('image', ''),
-            'hint': hack.get('hint', ''),
-            'description': hack.get('description', ''),
-            'registration_count': reg_count,
-            'team_count': team_count,
-            'created_at': hack.get('created_at', ''),
-        }
-        hackathon_list.append(hack_info)
-    
+    # One query for the dashboard rows (counters are stored on each document);
+    # legacy documents without counters are backfilled with two grouped aggregations.
+    hackathons = list(
+        hackathons_col.find({'organizer_id': ObjectId(decoded['sub'])}, ORGANIZER_LIST_PROJECTION)
+        .sort('created_at', DESCENDING)
+    )
+    ensure_counters(hackathons)
+
+    hackathon_list = [serializers.hackathon_for_organizer(hack) for hack in hackathons]
     return jsonify({'hackathons': hackathon_list}), 200
 
 
@@ -792,6 +1177,10 @@ def organizer_participants(hackathon_id: str):
     if not hack or str(hack.get('organizer_id')) != decoded.get('sub'):
         return jsonify({'message': 'Forbidden'}), 403
 
+    export_format = (request.args.get('format') or data.get('format') or '').lower()
+    if export_format in ('ndjson', 'csv'):
+        return export_participants(ObjectId(hackathon_id), export_format)
+
     # Get all registrations for this hackathon
     registrations = list(registrations_col.find({'hackathon_id': ObjectId(hackathon_id)}))
     
@@ -804,145 +1193,390 @@ def organizer_participants(hackathon_id: str):
     teams = list(teams_col.find({'hackathon_id': ObjectId(hackathon_id)}))
     team_map = {}
     for team in teams:
+        summary = serializers.team_summary(team)
         for member_id in team.get('members', []):
-            team_map[str(member_id)] = {
-                'team_id': str(team['_id']),
-                'team_name': team.get('name', ''),
-                'team_code': team.get('code', ''),
-            }
+            team_map[str(member_id)] = summary
     
     participant_list = []
     for reg in registrations:
         user = user_map.get(str(reg['user_id']), {})
         team_info = team_map.get(str(reg['user_id']))
-        
-        participant_info = {
-            'id': str(reg['user_id']),
-            'name': reg.get('full_name') or user.get('name', 'Unknown'),
-            'email': user.get('email', ''),
-            'motivation': reg.get('motivation', ''),
-            'portfolio_link': reg.get('portfolio_link', ''),
-            'looking_for_team': reg.get('looking_for_team', True),
-            'team_code': reg.get('team_code', ''),
-            'role': reg.get('role', ''),
-            'skills': reg.get('skills', []),
-            'experience_level': reg.get('experience_level', ''),
-            'github': reg.get('github', ''),
-            'linkedin': reg.get('linkedin', ''),
-            'resume_link': reg.get('resume_link', ''),
-            'registration_date': (reg.get('created_at').isoformat() if hasattr(reg.get('created_at'), 'isoformat') else str(reg.get('created_at') or '')),
-            'team': team_info,
-        }
-        participant_list.append(participant_info)
+        participant_list.append(serializers.participant_for_organizer(reg, user, team_info))
     
     return jsonify({'participants': participant_list}), 200
 
 
+def iter_participant_batches(hackathon_oid: ObjectId, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield lists of organizer participant rows, resolving users and teams per
+    batch so memory stays bounded by batch_size regardless of hackathon size."""
+    cursor = registrations_col.find({'hackathon_id': hackathon_oid}).sort('_id', ASCENDING).batch_size(batch_size)
+    batch = []
+    for reg in cursor:
+        batch.append(reg)
+        if len(batch) >= batch_size:
+            yield resolve_participant_batch(hackathon_oid, batch)
+            batch = []
+    if batch:
+        yield resolve_participant_batch(hackathon_oid, batch)
+
+
+def resolve_participant_batch(hackathon_oid: ObjectId, regs: list) -> list:
+    user_ids = [reg['user_id'] for reg in regs]
+    users = users_col.find({'_id': {'$in': user_ids}}, {'name': 1, 'email': 1})
+    user_map = {str(u['_id']): u for u in users}
+    team_map = team_map_for(hackathon_oid, user_ids)
+    return [
+        serializers.participant_for_organizer(reg, user_map.get(str(reg['user_id']), {}), team_map.get(str(reg['user_id'])))
+        for reg in regs
+    ]
+
+
+def team_map_for(hackathon_oid: ObjectId, user_ids: list) -> dict:
+    """{user id: team summary} for the given users' teams in one hackathon."""
+    team_map = {}
+    if not user_ids:
+        return team_map
+    for team in teams_col.find({'hackathon_id': hackathon_oid, 'members': {'$in': user_ids}}, {'name': 1, 'code': 1, 'members': 1}):
+        summary = serializers.team_summary(team)
+        for member_id in team.get('members', []):
+            team_map[str(member_id)] = summary
+    return team_map
+
+
+PARTICIPANT_CSV_COLUMNS = [
+    'id', 'name', 'email', 'role', 'skills', 'experience_level', 'looking_for_team',
+    'team_id', 'team_name', 'team_code', 'motivation', 'portfolio_link', 'github',
+    'linkedin', 'resume_link', 'registration_date',
+]
+
+
+def export_participants(hackathon_oid: ObjectId, export_format: str) -> Response:
+    """Stream the organizer participant list as NDJSON or CSV."""
+    def ndjson_rows():
+        for rows in iter_participant_batches(hackathon_oid):
+            yield b''.join(json_provider.dumps_bytes(row) + b'\n' for row in rows)
+
+    def csv_rows():
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(PARTICIPANT_CSV_COLUMNS)
+        for rows in iter_participant_batches(hackathon_oid):
+            for row in rows:
+                team = row['team'] or {}
+                flat = {
+                    **row,
+                    'skills': ';'.join(str(s) for s in (row['skills'] or [])),
+                    'team_id': team.get('team_id', ''),
+                    'team_name': team.get('team_name', ''),
+                    'team_code': team.get('team_code', ''),
+                }
+                writer.writerow([flat.get(col, '') for col in PARTICIPANT_CSV_COLUMNS])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+
+    if export_format == 'csv':
+        body, mimetype = csv_rows(), 'text/csv'
+    else:
+        body, mimetype = ndjson_rows(), 'application/x-ndjson'
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=participants-{hackathon_oid}.{export_format}',
+    })
+
+
+@hackathons_bp.route('/organizer/registrations/import/<hackathon_id>', methods=['POST'])
+def organizer_import_registrations(hackathon_id: str):
+    """Register existing accounts in bulk from an uploaded CSV or NDJSON file.
+
+    multipart/form-data with `token` and `file`, or the raw file as the body
+    with `Authorization: Bearer <token>`. ?format=csv|ndjson overrides
+    detection from the file name and content type; ?report=errors lists only
+    the rows that failed. A file that is not UTF-8 or not parseable is 400,
+    with the row it stopped at and the report of the rows before it.
+    """
+    upload = request.files.get('file')
+    token = request.form.get('token') or ''
+    if not token and request.headers.get('Authorization', '').startswith('Bearer '):
+        token = request.headers['Authorization'][len('Bearer '):]
+    decoded = decode_jwt(token)
+    if not decoded:
+        return jsonify({'message': 'Unauthorized'}), 401
+    if decoded.get('user_type') != 'organizer':
+        return jsonify({'message': 'Forbidden'}), 403
+    try:
+        hack = hackathons_col.find_one({'_id': ObjectId(hackathon_id)}, {'organizer_id': 1})
+    except Exception:
+        hack = None
+    if not hack:
+        return jsonify({'message': 'Hackathon not found'}), 404
+    if str(hack.get('organizer_id')) != decoded.get('sub'):
+        return jsonify({'message': 'Forbidden'}), 403
+
+    if upload is not None:
+        stream, filename, mimetype = upload.stream, upload.filename, upload.mimetype
+    elif request.content_length and request.mimetype != 'multipart/form-data':
+        # Form parsing has already consumed a multipart body
+        stream, filename, mimetype = request.stream, '', request.mimetype
+    else:
+        return jsonify({'message': 'No file uploaded'}), 400
+    fmt = registration_import.detect_format(request.args.get('format'), filename, mimetype)
+    result = registration_import.import_registrations(
+        hack['_id'], stream, fmt, errors_only=request.args.get('report') == 'errors',
+    )
+    summary = result['summary']
+    if summary['created'] or summary['updated']:
+        bump_revision(hackathon_id, registration_count=summary['created'])
+    if result['error']:
+        return jsonify({'message': result['error']['message'], **result}), 400
+    return jsonify(result), 200
+
+
+PUBLIC_PARTICIPANT_PROJECTION = {'user_id': 1, 'full_name': 1, 'looking_for_team': 1, 'skills': 1, 'role': 1}
+
+
+@hackathons_bp.route('/organizer/auto-teams/<hackathon_id>', methods=['POST'])
+def organizer_auto_teams(hackathon_id: str):
+    """Partition the hackathon's unteamed registrants into balanced teams.
+
+    Body: token, team_size (2-5, default 5), dry_run (return the plan without writing).
+    Answers 409 while another run for the hackathon is still writing.
+    """
+    data = request.get_json(force=True) or {}
+    decoded = decode_jwt(data.get('token') or '')
+    if not decoded:
+        return jsonify({'message': 'Unauthorized'}), 401
+    try:
+        hack = hackathons_col.find_one({'_id': ObjectId(hackathon_id)}, {'organizer_id': 1})
+    except Exception:
+        hack = None
+    if not hack:
+        return jsonify({'message': 'Hackathon not found'}), 404
+    if str(hack.get('organizer_id')) != decoded.get('sub'):
+        return jsonify({'message': 'Forbidden'}), 403
+    try:
+        team_size = int(data.get('team_size') or MAX_TEAM_MEMBERS)
+    except (TypeError, ValueError):
+        team_size = 0
+    if not 2 <= team_size <= MAX_TEAM_MEMBERS:
+        return jsonify({'message': f'team_size must be between 2 and {MAX_TEAM_MEMBERS}'}), 400
+
+    dry_run = bool(data.get('dry_run'))
+    try:
+        docs = team_formation.form_teams(hack['_id'], team_size, MAX_TEAM_MEMBERS, dry_run=dry_run)
+    except team_formation.FormationInProgress:
+        return jsonify({'message': 'Team formation is already running for this hackathon'}), 409
+    if docs and not dry_run:
+        bump_revision(hackathon_id, team_count=len(docs))
+    return jsonify({
+        'dry_run': dry_run,
+        'teams_created': 0 if dry_run else len(docs),
+        'participants_placed': sum(len(doc['members']) for doc in docs),
+        'teams': [
+            {
+                'team_id': str(doc['_id']) if '_id' in doc else None,
+                'team_name': doc['name'],
+                'team_code': doc['code'],
+                'members': [str(m) for m in doc['members']],
+            }
+            for doc in docs
+        ],
+    }), 200
+
+
+@hackathons_bp.cli.command('form-teams')
+@click.argument('hackathon_id')
+@click.option('--team-size', default=MAX_TEAM_MEMBERS, show_default=True)
+@click.option('--dry-run', is_flag=True)
+def form_teams_command(hackathon_id, team_size, dry_run):
+    """Auto-form teams for a hackathon's solo registrants."""
+    start = time.perf_counter()
+    try:
+        docs = team_formation.form_teams(ObjectId(hackathon_id), team_size, MAX_TEAM_MEMBERS, dry_run=dry_run)
+    except team_formation.FormationInProgress:
+        raise click.ClickException('Team formation is already running for this hackathon')
+    if docs and not dry_run:
+        bump_revision(hackathon_id, team_count=len(docs))
+    placed = sum(len(doc['members']) for doc in docs)
+    verb = 'Would create' if dry_run else 'Created'
+    click.echo(f'{verb} {len(docs)} teams for {placed} registrants in {time.perf_counter() - start:.2f}s')
+
+
 @hackathons_bp.route('/participants/public/<hackathon_id>', methods=['GET'])
 def participants_public(hackathon_id: str):
     """Public-safe list of participants for a hackathon used by Find Team page.
     Does not require organizer privileges and returns limited fields.
-    """
-    try:
-        registrations = list(registrations_col.find({'hackathon_id': ObjectId(hackathon_id)}))
-    except Exception:
-        registrations = []
 
-    # user details
+    Query params: looking_for_team (true/false), in_team (true/false: on a
+    team of this hackathon or not), role (comma-separated), skills
+    (comma-separated; skills_match=any for $in, otherwise $all), limit and cursor
+    (next_cursor of the previous page). Without limit every match is returned.
+    """
+    if not ObjectId.is_valid(hackathon_id):
+        return jsonify({'participants': [], 'next_cursor': None}), 200
+    etag, unchanged = conditional_hackathon_view('participants', hackathon_id)
+    if unchanged is not None:
+        return unchanged
+    hackathon_oid = ObjectId(hackathon_id)
+
+    query = {'hackathon_id': hackathon_oid}
+    looking = (request.args.get('looking_for_team') or '').lower()
+    if looking in ('1', 'true'):
+        query['looking_for_team'] = True
+    elif looking in ('0', 'false'):
+        query['looking_for_team'] = False
+    in_team = (request.args.get('in_team') or '').lower()
+    if in_team in ('1', 'true', '0', 'false'):
+        members = teams_col.distinct('members', {'hackathon_id': hackathon_oid})
+        query['user_id'] = {'$in' if in_team in ('1', 'true') else '$nin': members}
+    roles = [r.strip() for r in (request.args.get('role') or '').split(',') if r.strip()]
+    if roles:
+        query['role'] = roles[0] if len(roles) == 1 else {'$in': roles}
+    skills = [sk.strip() for sk in (request.args.get('skills') or '').split(',') if sk.strip()]
+    if skills:
+        query['skills'] = {'$in' if request.args.get('skills_match') == 'any' else '$all': skills}
+    cursor = request.args.get('cursor')
+    if cursor:
+        if not ObjectId.is_valid(cursor):
+            return jsonify({'message': 'Invalid cursor'}), 400
+        query['_id'] = {'$gt': ObjectId(cursor)}
+
+    regs_cursor = registrations_col.find(query, PUBLIC_PARTICIPANT_PROJECTION).sort('_id', ASCENDING)
+    limit = parse_page_size(request.args['limit']) if request.args.get('limit') else None
+    if limit:
+        regs_cursor = regs_cursor.limit(limit + 1)
+    registrations = list(regs_cursor)
+    has_more = bool(limit) and len(registrations) > limit
+    if has_more:
+        registrations = registrations[:limit]
+
+    # Users and teams only for the participants on this page
     user_ids = [reg.get('user_id') for reg in registrations if reg.get('user_id')]
-    users = list(users_col.find({'_id': {'$in': user_ids}})) if user_ids else []
+    users = list(users_col.find({'_id': {'$in': user_ids}}, {'name': 1})) if user_ids else []
     user_map = {str(u['_id']): u for u in users}
-
-    # team info map
-    teams = list(teams_col.find({'hackathon_id': ObjectId(hackathon_id)}))
-    team_map = {}
-    for team in teams:
-        for member_id in team.get('members', []):
-            team_map[str(member_id)] = {
-                'team_id': str(team['_id']),
-                'team_name': team.get('name', ''),
-                'team_code': team.get('code', ''),
-            }
+    team_map = team_map_for(hackathon_oid, user_ids)
 
     participant_list = []
     for reg in registrations:
         uid = str(reg.get('user_id')) if reg.get('user_id') else ''
-        user = user_map.get(uid, {})
-        team_info = team_map.get(uid)
-        participant_info = {
-            'id': uid,
-            'name': reg.get('full_name') or user.get('name', 'Unknown'),
-            'looking_for_team': reg.get('looking_for_team', True),
-            'skills': reg.get('skills', []),
-            'role': reg.get('role', ''),
-            'motivation': reg.get('motivation', ''),
-            'portfolio_link': reg.get('portfolio_link', ''),
-            'team': team_info,
-        }
-        participant_list.append(participant_info)
+        participant_list.append(serializers.participant_public(reg, user_map.get(uid, {}), team_map.get(uid)))
 
-    return jsonify({'participants': participant_list}), 200
+    next_cursor = str(registrations[-1]['_id']) if has_more else None
+    return http_cache.with_etag(jsonify({'participants': participant_list, 'next_cursor': next_cursor}), etag), 200
 
 
-@hackathons_bp.route('/teams/invite/<hackathon_id>', methods=['POST'])
-def invite_participant(hackathon_id: str):
+@hackathons_bp.route('/match/<hackathon_id>', methods=['POST'])
+def match_teammates(hackathon_id: str):
+    """Top-k complementary teammates and open teams for the calling participant.
+
+    Body: token, k (default 10, max 50), kind ('participants', 'teams' or 'all').
+    """
     data = request.get_json(force=True) or {}
-    token = data.get('token')
-    user_id = data.get('user_id')
-    message = (data.get('message') or '').strip()
-    decoded = decode_jwt(token or '')
+    decoded = decode_jwt(data.get('token') or '')
     if not decoded:
         return jsonify({'message': 'Unauthorized'}), 401
+    if not ObjectId.is_valid(hackathon_id):
+        return jsonify({'message': 'Hackathon not found'}), 404
+    try:
+        k = max(1, min(int(data.get('k') or 10), 50))
+    except (TypeError, ValueError):
+        k = 10
+    kind = data.get('kind') or 'all'
+
+    hackathon_oid = ObjectId(hackathon_id)
+    index = matching.get_index(registrations_col, hackathon_oid)
+    user_id = ObjectId(decoded['sub'])
+    if str(user_id) not in index.rows:
+        return jsonify({'message': 'You must register for this hackathon first'}), 400
 
+    teams = list(teams_col.find({'hackathon_id': hackathon_oid}, {'name': 1, 'members': 1}))
+    in_team = {str(m) for team in teams for m in team.get('members', [])}
+    result = {}
+    with index.lock:
+        if kind in ('participants', 'all'):
+            result['participants'] = index.top_candidates(user_id, in_team, k)
+        if kind in ('teams', 'all'):
+            open_teams = [
+                team for team in teams
+                if len(team.get('members', [])) < MAX_TEAM_MEMBERS and user_id not in team.get('members', [])
+            ]
+            result['teams'] = index.top_teams(user_id, open_teams, k)
+
+    # full_name is optional on /register: fall back to the account name
+    unnamed = {ObjectId(p['user_id']): p for p in result.get('participants', []) if not p['name']}
+    if unnamed:
+        names = {u['_id']: u.get('name') for u in users_col.find({'_id': {'$in': list(unnamed)}}, {'name': 1})}
+        for uid, participant in unnamed.items():
+            participant['name'] = names.get(uid) or 'Unknown'
+    return jsonify(result), 200
+
+
+def parse_invite(data: dict) -> tuple:
+    """(decoded token, invited user id, message, error reply) from a /teams/invite body."""
+    decoded = decode_jwt(data.get('token') or '')
+    if not decoded:
+        return None, None, None, ({'message': 'Unauthorized'}, 401)
+    user_id = data.get('user_id')
     if not user_id:
-        return jsonify({'message': 'User ID is required'}), 400
+        return decoded, None, None, ({'message': 'User ID is required'}, 400)
+    return decoded, user_id, (data.get('message') or '').strip(), None
 
-    # Ensure inviter is leader of a team in this hackathon
-    leader_team = teams_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'leader_id': ObjectId(decoded['sub'])
-    })
-    if not leader_team:
-        return jsonify({'message': 'Only team leaders can invite participants'}), 403
 
-    # Ensure the invited user is registered for this hackathon
-    reg = registrations_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'user_id': ObjectId(user_id)
-    })
-    if not reg:
-        return jsonify({'message': 'User is not registered for this hackathon'}), 400
+def invite_lookups(hackathon_id: str, leader_id, user_id) -> list:
+    """(collection, filter, projection) for the inviter's team, the invitee's
+    registration and any team they are already on; see invite_error."""
+    return [
+        ('teams', {'hackathon_id': ObjectId(hackathon_id), 'leader_id': ObjectId(leader_id)}, {'_id': 1}),
+        ('registrations', registration_query(hackathon_id, user_id), {'_id': 1}),
+        ('teams', {'hackathon_id': ObjectId(hackathon_id), 'members': ObjectId(user_id)}, {'_id': 1}),
+    ]
 
-    # Prevent inviting users already in a team in this hackathon
-    existing_team = teams_col.find_one({
-        'hackathon_id': ObjectId(hackathon_id),
-        'members': ObjectId(user_id)
-    })
+
+def invite_error(leader_team, reg, existing_team) -> Optional[tuple]:
+    # Only team leaders invite, only registered users who are not on a team yet
+    if not leader_team:
+        return {'message': 'Only team leaders can invite participants'}, 403
+    if not reg:
+        return {'message': 'User is not registered for this hackathon'}, 400
     if existing_team:
-        return jsonify({'message': 'User is already in a team'}), 400
+        return {'message': 'User is already in a team'}, 400
+    return None
 
-    # Create or upsert an invitation request (reuse team_requests)
+
+def invitation_upsert(hackathon_id: str, team_id: ObjectId, user_id, message: str) -> tuple:
+    """(filter, update) creating or refreshing an invitation in team_requests."""
     now = datetime.utcnow()
-    try:
-        team_requests_col.update_one(
-            {
-                'team_id': leader_team['_id'],
-                'user_id': ObjectId(user_id)
-            },
-            {
-                '$setOnInsert': {
-                    'hackathon_id': ObjectId(hackathon_id),
-                    'created_at': now,
-                },
-                '$set': {
-                    'message': message or 'Team invitation',
-                    'status': 'pending',  # pending until user accepts/leader approves
-                    'invited_by_leader': True,
-                    'updated_at': now,
-                }
+    return (
+        {'team_id': team_id, 'user_id': ObjectId(user_id)},
+        {
+            '$setOnInsert': {
+                'hackathon_id': ObjectId(hackathon_id),
+                'created_at': now,
             },
-            upsert=True,
-        )
+            '$set': {
+                'message': message or 'Team invitation',
+                'status': 'pending',  # pending until user accepts/leader approves
+                'invited_by_leader': True,
+                'updated_at': now,
+            }
+        },
+    )
+
+
+@hackathons_bp.route('/teams/invite/<hackathon_id>', methods=['POST'])
+def invite_participant(hackathon_id: str):
+    decoded, user_id, message, error = parse_invite(request.get_json(force=True) or {})
+    if error:
+        return jsonify(error[0]), error[1]
+
+    leader_team, reg, existing_team = find_each(invite_lookups(hackathon_id, decoded['sub'], user_id))
+    error = invite_error(leader_team, reg, existing_team)
+    if error:
+        return jsonify(error[0]), error[1]
+
+    try:
+        team_requests_col.update_one(*invitation_upsert(hackathon_id, leader_team['_id'], user_id, message), upsert=True)
     except Exception as e:
         return jsonify({'message': f'Failed to send invitation: {str(e)}'}), 500
 
@@ -968,30 +1602,175 @@ def get_team_messages(hackathon_id: str):
         return jsonify({'message': 'Not part of any team'}), 404
     
     team = user_teams[0]
-    
-    # Get team messages
-    messages = list(team_messages_col.find({
-        'team_id': team['_id']
-    }).sort('created_at', DESCENDING).limit(50))
+
+    # Cursors: 'before' pages back through history, 'after' fetches only the
+    # delta since the client's newest message. Both are opaque values taken
+    # from before_cursor/after_cursor of an earlier response. Messages from
+    # other workers can become visible out of created_at order, so an 'after'
+    # reply also repeats the last MESSAGE_STREAM_OVERLAP seconds before the
+    # cursor, as the stream does; clients de-duplicate by id.
+    before, after = data.get('before'), data.get('after')
+    # has_more means older messages remain (default/before) or newer ones (after)
+    limit = parse_page_size(data.get('limit', 50))
+    query = {'team_id': team['_id']}
+    if before and after:
+        return jsonify({'message': 'Use either before or after, not both'}), 400
+    cursor = decode_cursor(before or after) if (before or after) else None
+    if (before or after) and (not cursor or cursor[0] is None):
+        return jsonify({'message': 'Invalid cursor'}), 400
+    if before:
+        query.update(keyset_filter(*cursor))
+    elif after:
+        query.update(keyset_newer_filter(*cursor))
+
+    # Get team messages (served from the (team_id, created_at, _id) index)
+    direction = ASCENDING if after else DESCENDING
+    messages = list(
+        team_messages_col.find(query)
+        .sort([('created_at', direction), ('_id', direction)])
+        .limit(limit + 1)
+    )
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if after:
+        messages.reverse()  # always newest first
+    before_cursor = encode_cursor(messages[-1]['created_at'], messages[-1]['_id']) if messages else before
+    after_cursor = encode_cursor(messages[0]['created_at'], messages[0]['_id']) if messages else after
+    if after:
+        newer = {msg['_id'] for msg in messages}
+        messages += [msg for msg in team_messages_col.find({
+            'team_id': team['_id'],
+            'created_at': {'$gte': cursor[0] - timedelta(seconds=MESSAGE_STREAM_OVERLAP), '$lte': cursor[0]},
+        }).sort([('created_at', DESCENDING), ('_id', DESCENDING)]).limit(MAX_PAGE_SIZE) if msg['_id'] not in newer]
     
     # Get user details for messages
-    user_ids = [msg['sender_id'] for msg in messages]
-    users = list(users_col.find({'_id': {'$in': user_ids}}))
+    user_ids = list({msg['sender_id'] for msg in messages})
+    users = list(users_col.find({'_id': {'$in': user_ids}}, {'name': 1})) if user_ids else []
     user_map = {str(u['_id']): u for u in users}
     
-    message_list = []
-    for msg in messages:
-        user = user_map.get(str(msg['sender_id']), {})
-        message_info = {
-            'id': str(msg['_id']),
-            'sender_id': str(msg['sender_id']),
-            'sender_name': user.get('name', 'Unknown'),
-            'message': msg.get('message', ''),
-            'timestamp': msg.get('created_at', '').isoformat() if msg.get('created_at') else '',
-        }
-        message_list.append(message_info)
+    message_list = [
+        serializers.team_message(msg, user_map.get(str(msg['sender_id']), {}).get('name', 'Unknown'))
+        for msg in messages
+    ]
     
-    return jsonify({'messages': message_list}), 200
+    return jsonify({
+        'messages': message_list,
+        'has_more': has_more,
+        'before_cursor': before_cursor,
+        'after_cursor': after_cursor,
+    }), 200
+
+
+def messages_since(team_id: ObjectId, since: Optional[datetime]) -> list:
+    """Public messages of a team created at or after since, oldest first."""
+    query = {'team_id': team_id}
+    if since is not None:
+        query['created_at'] = {'$gte': since}
+    messages = list(team_messages_col.find(query).sort([('created_at', ASCENDING), ('_id', ASCENDING)]))
+    sender_ids = list({msg['sender_id'] for msg in messages})
+    users = users_col.find({'_id': {'$in': sender_ids}}, {'name': 1}) if sender_ids else []
+    names = {str(u['_id']): u.get('name', 'Unknown') for u in users}
+    return [serializers.team_message(msg, names.get(str(msg['sender_id']), 'Unknown')) for msg in messages]
+
+
+def message_time(message: dict) -> datetime:
+    return datetime.fromisoformat(message['timestamp'])
+
+
+def message_events(team_id: ObjectId, last_id: Optional[str] = None, broker: Broker = None):
+    """SSE lines for stream_team_messages: replay after last_id, then live
+    messages from broker, with a MongoDB catch-up every MESSAGE_STREAM_HEARTBEAT."""
+    broker = broker or message_broker
+    overlap = timedelta(seconds=MESSAGE_STREAM_OVERLAP)
+    # Subscribed inside the generator so the finally below always releases it;
+    # subscribing before the replay means nothing published in between is missed.
+    subscription = broker.subscribe(str(team_id))
+    try:
+        # Messages from other workers can become visible out of _id and
+        # created_at order, so each catch-up re-reads the last `overlap` before
+        # the newest message the previous MongoDB read returned (local
+        # publishes do not move it) and skips ids already sent.
+        seen = {}  # message id -> created_at
+        read_up_to = None
+        pending = []
+        resume_from = None
+        if last_id:
+            resume_from = team_messages_col.find_one({'_id': ObjectId(last_id), 'team_id': team_id}, {'created_at': 1})
+        if resume_from:
+            seen[last_id] = read_up_to = resume_from['created_at']
+            pending = messages_since(team_id, read_up_to - overlap)
+        else:
+            # Start from now: whatever is already stored counts as seen
+            latest = team_messages_col.find_one({'team_id': team_id}, {'created_at': 1}, sort=[('created_at', DESCENDING)])
+            if latest:
+                read_up_to = latest['created_at']
+                for message in messages_since(team_id, read_up_to - overlap):
+                    seen[message['id']] = message_time(message)
+        for message in pending:
+            read_up_to = max(read_up_to, message_time(message))
+        last_catchup = time.monotonic()
+        deadline = last_catchup + MESSAGE_STREAM_MAX_SECONDS
+        yield 'retry: 3000\n\n'
+        while True:
+            for message in pending:
+                if message['id'] in seen:
+                    continue
+                seen[message['id']] = message_time(message)
+                yield f"id: {message['id']}\nevent: message\ndata: {json_provider.dumps(message)}\n\n"
+            if read_up_to is not None:
+                # Older than anything the next catch-up re-reads
+                seen = {mid: at for mid, at in seen.items() if at >= read_up_to - overlap}
+            if time.monotonic() >= deadline:
+                return
+            # Catch-ups run on a fixed schedule, however busy the local broker is
+            published = subscription.get(timeout=max(0.0, last_catchup + MESSAGE_STREAM_HEARTBEAT - time.monotonic()))
+            pending = [published] if published is not None else []
+            if time.monotonic() - last_catchup >= MESSAGE_STREAM_HEARTBEAT:
+                if published is None:
+                    yield ': keep-alive\n\n'
+                caught_up = messages_since(team_id, read_up_to - overlap if read_up_to else None)
+                last_catchup = time.monotonic()
+                for message in caught_up:
+                    created_at = message_time(message)
+                    read_up_to = created_at if read_up_to is None else max(read_up_to, created_at)
+                pending += caught_up
+    finally:
+        subscription.close()
+
+
+@hackathons_bp.route('/teams/messages/stream/<hackathon_id>', methods=['GET'])
+def stream_team_messages(hackathon_id: str):
+    """Server-Sent Events stream of new messages for the caller's team.
+
+    EventSource cannot send a body, so the token comes from the query string.
+    Resume with last_id (or the Last-Event-ID header the browser sends on
+    reconnect) to receive everything after that message first; messages from
+    the last MESSAGE_STREAM_OVERLAP seconds before it may be sent again, so
+    clients de-duplicate by event id. Streams close after
+    MESSAGE_STREAM_MAX_SECONDS and the browser reconnects.
+
+    Each open stream holds a worker thread for its whole lifetime: serve with
+    gthread or gevent workers (see Procfile), never plain sync workers.
+    """
+    decoded = decode_jwt(request.args.get('token') or '')
+    if not decoded:
+        return jsonify({'message': 'Unauthorized'}), 401
+
+    team = teams_col.find_one({
+        'hackathon_id': ObjectId(hackathon_id),
+        'members': ObjectId(decoded['sub'])
+    }, {'_id': 1})
+    if not team:
+        return jsonify({'message': 'Not part of any team'}), 404
+
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    if last_id and not ObjectId.is_valid(last_id):
+        return jsonify({'message': 'Invalid last_id'}), 400
+
+    return Response(message_events(team['_id'], last_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
 
 
 @hackathons_bp.route('/teams/messages/send/<hackathon_id>', methods=['POST'])
@@ -1027,6 +1806,7 @@ def send_team_message(hackathon_id: str):
     }
     
     res = team_messages_col.insert_one(message_doc)
+    message_broker.publish(str(team['_id']), serializers.team_message(message_doc, decoded.get('name') or 'Unknown'))
     return jsonify({'message': 'Message sent', 'id': str(res.inserted_id)}), 201
 
 
@@ -1061,6 +1841,7 @@ def update_team(hackathon_id: str):
     allowed_updates['updated_at'] = datetime.utcnow()
     
     teams_col.update_one({'_id': team['_id']}, {'$set': allowed_updates})
+    bump_revision(hackathon_id)
     return jsonify({'message': 'Team updated'}), 200
 
 
@@ -1073,41 +1854,26 @@ def get_my_team(hackathon_id: str):
         return jsonify({'message': 'Unauthorized'}), 401
 
     # Find user's team
-    user_teams = list(teams_col.find({
-        'hackathon_id': ObjectId(hackathon_id),
-        'members': ObjectId(decoded['sub'])
-    }))
-    
-    if not user_teams:
+    team = teams_col.find_one(my_team_query(hackathon_id, decoded['sub']))
+    if not team:
         return jsonify({'team': None}), 200
-    
-    team = user_teams[0]
-    
+
     # Get user details for team members
-    member_ids = team.get('members', [])
-    users = list(users_col.find({'_id': {'$in': member_ids}}))
+    users = users_col.find(*team_members_query(team))
+    return jsonify(my_team_reply(team, users)), 200
+
+
+def my_team_query(hackathon_id: str, user_id) -> dict:
+    return {'hackathon_id': ObjectId(hackathon_id), 'members': ObjectId(user_id)}
+
+
+def team_members_query(team: dict) -> tuple:
+    return {'_id': {'$in': team.get('members', [])}}, {'name': 1, 'email': 1}
+
+
+def my_team_reply(team: dict, users) -> dict:
     user_map = {str(u['_id']): u for u in users}
-    
-    team_info = {
-        'id': str(team['_id']),
-        'name': team.get('name', ''),
-        'description': team.get('description', ''),
-        'code': team.get('code', ''),
-        'leader_id': str(team.get('leader_id', '')),
-        'members': [
-            {
-                'id': str(member_id),
-                'name': user_map.get(str(member_id), {}).get('name', 'Unknown'),
-                'email': user_map.get(str(member_id), {}).get('email', ''),
-                'isLeader': str(member_id) == str(team.get('leader_id', ''))
-            }
-            for member_id in member_ids
-        ],
-        'max_members': 5,
-        'created_at': team.get('created_at', '').isoformat() if team.get('created_at') else '',
-    }
-    
-    return jsonify({'team': team_info}), 200
+    return {'team': serializers.team_public(team, user_map, mark_leader=True)}
 
 
 @hackathons_bp.route('/teams/remove-member/<hackathon_id>', methods=['POST'])
@@ -1145,6 +1911,7 @@ def remove_team_member(hackathon_id: str):
             '$set': {'updated_at': datetime.utcnow()}
         }
     )
+    bump_revision(hackathon_id)
     
     return jsonify({'message': 'Member removed'}), 200
 
@@ -1171,29 +1938,7 @@ def list_submissions(hackathon_id: str):
 
     docs = list(submissions_col.find({'hackathon_id': ObjectId(hackathon_id)}).sort('created_at', DESCENDING))
 
-    def to_public(s):
-        def to_iso(val):
-            return (val.isoformat() if hasattr(val, 'isoformat') else (val or ''))
-        return {
-            'id': str(s['_id']),
-            'hackathon_id': str(s.get('hackathon_id', '')),
-            'team_id': str(s.get('team_id', '')),
-            'team_name': s.get('team_name', ''),
-            'project_title': s.get('project_title', ''),
-            'project_description': s.get('project_description', ''),
-            'tech_stack': s.get('tech_stack', []),
-            'github_link': s.get('github_link'),
-            'video_link': s.get('video_link'),
-            'files': s.get('files', []),
-            'status': s.get('status', 'draft'),
-            'score': s.get('score'),
-            'feedback': s.get('feedback'),
-            'submitted_at': to_iso(s.get('submitted_at') or s.get('created_at') or ''),
-            'updated_at': to_iso(s.get('updated_at') or ''),
-            'created_at': to_iso(s.get('created_at') or ''),
-        }
-
-    return jsonify({'submissions': [to_public(s) for s in docs]}), 200
+    return jsonify({'submissions': [serializers.submission_public(s) for s in docs]}), 200
 
 
 @hackathons_bp.route('/submissions/get/<submission_id>', methods=['GET'])
@@ -1205,27 +1950,7 @@ def get_submission(submission_id: str):
     if not s:
         return jsonify({'message': 'Submission not found'}), 404
 
-    def to_iso(val):
-        return (val.isoformat() if hasattr(val, 'isoformat') else (val or ''))
-    public = {
-        'id': str(s['_id']),
-        'hackathon_id': str(s.get('hackathon_id', '')),
-        'team_id': str(s.get('team_id', '')),
-        'team_name': s.get('team_name', ''),
-        'project_title': s.get('project_title', ''),
-        'project_description': s.get('project_description', ''),
-        'tech_stack': s.get('tech_stack', []),
-        'github_link': s.get('github_link'),
-        'video_link': s.get('video_link'),
-        'files': s.get('files', []),
-        'status': s.get('status', 'draft'),
-        'score': s.get('score'),
-        'feedback': s.get('feedback'),
-        'submitted_at': to_iso(s.get('submitted_at') or s.get('created_at') or ''),
-        'updated_at': to_iso(s.get('updated_at') or ''),
-        'created_at': to_iso(s.get('created_at') or ''),
-    }
-    return jsonify({'submission': public}), 200
+    return jsonify({'submission': serializers.submission_public(s)}), 200
 
 
 @hackathons_bp.route('/submissions/my/<hackathon_id>', methods=['POST'])
@@ -1247,24 +1972,4 @@ def my_submission(hackathon_id: str):
     if not s:
         return jsonify({'submission': None}), 200
 
-    def to_iso(val):
-        return (val.isoformat() if hasattr(val, 'isoformat') else (val or ''))
-    public = {
-        'id': str(s['_id']),
-        'hackathon_id': str(s.get('hackathon_id', '')),
-        'team_id': str(s.get('team_id', '')),
-        'team_name': s.get('team_name', ''),
-        'project_title': s.get('project_title', ''),
-        'project_description': s.get('project_description', ''),
-        'tech_stack': s.get('tech_stack', []),
-        'github_link': s.get('github_link'),
-        'video_link': s.get('video_link'),
-        'files': s.get('files', []),
-        'status': s.get('status', 'draft'),
-        'score': s.get('score'),
-        'feedback': s.get('feedback'),
-        'submitted_at': to_iso(s.get('submitted_at') or s.get('created_at') or ''),
-        'updated_at': to_iso(s.get('updated_at') or ''),
-        'created_at': to_iso(s.get('created_at') or ''),
-    }
-    return jsonify({'submission': public}), 200
+    return jsonify({'submission': serializers.submission_public(s)}), 200
@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+import os
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+# Worker processes per app process (so gunicorn workers x HASH_POOL_SIZE in total).
+# 0 hashes inline on the request thread, e.g. for local development.
+HASH_POOL_SIZE = int(os.environ.get('HASH_POOL_SIZE', str(min(4, os.cpu_count() or 1))))
+# Hashes allowed in flight (running + queued) before new requests get a fast 503
+HASH_MAX_PENDING = int(os.environ.get('HASH_MAX_PENDING', str(max(1, HASH_POOL_SIZE) * 8)))
+HASH_TIMEOUT_SECONDS = float(os.environ.get('HASH_TIMEOUT_SECONDS', '10'))
+# Parameters for new hashes; logins with a hash made under other parameters are rehashed
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+
+
+class HashingBusy(Exception):
+    """The hashing queue is full; the caller should answer 503 and retry later."""
+
+
+_executor = None
+_pending = 0
+_lock = Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Created on first use so each forked gunicorn worker gets its own pool
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=HASH_POOL_SIZE)
+    return _executor
+
+
+def _discard_executor(broken: ProcessPoolExecutor):
+    # A worker process died: drop the pool so the next hash starts a fresh one
+    global _executor
+    with _lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False)
+
+
+def _release(_future=None):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _run(fn, *args):
+    global _pending
+    if HASH_POOL_SIZE <= 0:
+        return fn(*args)
+    with _lock:
+        if _pending >= HASH_MAX_PENDING:
+            raise HashingBusy()
+        _pending += 1
+    executor = _get_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except RuntimeError:
+        # BrokenProcessPool, or 'cannot schedule new futures after shutdown'
+        # when another thread discarded this pool since _get_executor()
+        _release()
+        _discard_executor(executor)
+        raise HashingBusy()
+    # Released when the hash finishes, not when the caller stops waiting, so
+    # timed-out hashes still running in the pool count against the cap
+    future.add_done_callback(_release)
+    try:
+        return future.result(timeout=HASH_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        raise HashingBusy()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise HashingBusy()
+
+
+def hash_password(password: str) -> str:
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    if not password_hash:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    # Werkzeug hashes look like "<method>$<salt>$<hash>"
+    return (password_hash or '').split('$', 1)[0] != PASSWORD_HASH_METHOD
+
+
+def pending() -> int:
+    return _pending
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,89 @@
+"""
+Conditional GET and response compression for the public read endpoints.
+
+Views derive an ETag from a cheap version token (a revision counter) before
+running their main query, so a matching If-None-Match is answered with 304
+without touching the payload. Large responses are compressed with brotli when
+the optional `brotli` package is installed and the client accepts it, gzip
+otherwise.
+"""
+
+import gzip
+import hashlib
+import os
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/html', 'text/plain'}
+
+
+def etag_for(*parts) -> str:
+    """Strong ETag for a view at a given version, e.g. etag_for('get', id, revision)."""
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def not_modified(etag: str):
+    """304 response when the client already holds this version, else None.
+
+    Compressed responses carry '<etag>-<encoding>' (see compress), so those
+    validators match too.
+    """
+    inm = request.if_none_match
+    if not inm:
+        return None
+    for tag in (etag, f'{etag}-br', f'{etag}-gzip'):
+        if inm.contains(tag):
+            return with_etag(current_app.response_class(status=304), tag)
+    return None
+
+
+def with_etag(response, etag: str):
+    response.set_etag(etag)
+    # Browsers may keep the body but must revalidate before reusing it
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _encoding():
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(response):
+    """after_request hook: compress eligible bodies above COMPRESS_MIN_SIZE."""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = _encoding()
+    body = response.get_data()
+    if encoding is None or len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    if encoding == 'br':
+        data = brotli.compress(body, quality=min(COMPRESS_LEVEL, 11))
+    else:
+        data = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # A different representation needs a different strong validator
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress)
@@ -0,0 +1,255 @@
+"""
+Teammate matching over a hackathon's registrations.
+
+Each worker keeps a per-hackathon SkillIndex: binary bag-of-words matrices of
+registrants' skills and role words plus their experience level. The first
+match request loads every registration; later requests only apply
+registrations whose updated_at moved since the last sync, so registering or
+editing a profile reaches the index without a full rebuild. Entries expire
+after MATCH_INDEX_TTL seconds and are then rebuilt from scratch.
+
+Scores favour candidates who bring skills the user lacks, with some shared
+ground, a different role and a similar experience level (see WEIGHTS).
+"""
+
+from datetime import datetime, timedelta
+from threading import Lock
+import os
+import re
+
+import numpy as np
+
+from cache import TTLCache
+
+MATCH_INDEX_SIZE = int(os.environ.get('MATCH_INDEX_SIZE', '64'))
+MATCH_INDEX_TTL = float(os.environ.get('MATCH_INDEX_TTL', '600'))
+# Re-read this much before the last sync to tolerate clock skew between workers
+SYNC_OVERLAP = timedelta(seconds=5)
+
+WEIGHTS = {'complement': 0.5, 'shared': 0.15, 'role': 0.2, 'experience': 0.15}
+EXPERIENCE_LEVELS = {'beginner': 0.0, 'intermediate': 1.0, 'advanced': 2.0, 'expert': 2.0}
+# Unknown or free-text levels are treated as intermediate
+DEFAULT_EXPERIENCE = 1.0
+
+REGISTRATION_PROJECTION = {
+    'user_id': 1, 'full_name': 1, 'skills': 1, 'role': 1,
+    'experience_level': 1, 'looking_for_team': 1, 'updated_at': 1,
+}
+
+
+def skill_terms(skills) -> list:
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return sorted({s.strip().lower() for s in (skills or []) if isinstance(s, str) and s.strip()})
+
+
+def role_terms(role) -> list:
+    return sorted(set(re.findall(r'[a-z0-9+#.]+', (role or '').lower())))
+
+
+def experience(level) -> float:
+    return EXPERIENCE_LEVELS.get((level or '').strip().lower(), DEFAULT_EXPERIENCE)
+
+
+class Vocabulary:
+    def __init__(self):
+        self.columns = {}
+        self.terms = []
+
+    def add(self, terms) -> list:
+        cols = []
+        for term in terms:
+            col = self.columns.get(term)
+            if col is None:
+                col = self.columns[term] = len(self.terms)
+                self.terms.append(term)
+            cols.append(col)
+        return cols
+
+
+def _capacity(needed: int, current: int) -> int:
+    # Double when full so appends stay amortized O(1)
+    return current if needed <= current else max(needed, current * 2)
+
+
+def _grow(array: np.ndarray, rows: int, cols: int = 0) -> np.ndarray:
+    """array zero-padded to at least `rows` rows (and `cols` columns if 2-D)."""
+    shape = (_capacity(rows, array.shape[0]),) + ((_capacity(cols, array.shape[1]),) if array.ndim == 2 else ())
+    if shape == array.shape:
+        return array
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[tuple(slice(0, n) for n in array.shape)] = array
+    return grown
+
+
+def _cosine(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each binary row of matrix with a binary vector."""
+    return (matrix @ vector) / np.sqrt(np.maximum(matrix.sum(axis=1) * vector.sum(), 1.0))
+
+
+def _score(complement, shared, role_overlap, experience_gap) -> np.ndarray:
+    return (WEIGHTS['complement'] * complement + WEIGHTS['shared'] * shared
+            + WEIGHTS['role'] * (1 - role_overlap) + WEIGHTS['experience'] * (1 - experience_gap / 2))
+
+
+class SkillIndex:
+    def __init__(self):
+        self.lock = Lock()
+        self.skill_vocab = Vocabulary()
+        self.role_vocab = Vocabulary()
+        self.skills = np.zeros((16, 32), dtype=np.float32)
+        self.roles = np.zeros((16, 8), dtype=np.float32)
+        self.experience = np.zeros(16, dtype=np.float32)
+        self.looking = np.zeros(16, dtype=bool)
+        self.user_ids = []
+        self.names = []
+        self.rows = {}  # str(user_id) -> row
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def upsert(self, reg: dict):
+        """Insert or replace the row of one registration (REGISTRATION_PROJECTION fields)."""
+        uid = str(reg['user_id'])
+        row = self.rows.get(uid)
+        if row is None:
+            row = self.rows[uid] = len(self.user_ids)
+            self.user_ids.append(reg['user_id'])
+            self.names.append('')
+        skill_cols = self.skill_vocab.add(skill_terms(reg.get('skills')))
+        role_cols = self.role_vocab.add(role_terms(reg.get('role')))
+
+        n = len(self.user_ids)
+        self.skills = _grow(self.skills, n, len(self.skill_vocab.terms))
+        self.roles = _grow(self.roles, n, len(self.role_vocab.terms))
+        self.experience = _grow(self.experience, n)
+        self.looking = _grow(self.looking, n)
+
+        self.skills[row] = 0
+        self.skills[row, skill_cols] = 1
+        self.roles[row] = 0
+        self.roles[row, role_cols] = 1
+        self.experience[row] = experience(reg.get('experience_level'))
+        self.looking[row] = reg.get('looking_for_team', True)
+        self.names[row] = reg.get('full_name') or ''
+        updated_at = reg.get('updated_at')
+        if updated_at and (self.synced_at is None or updated_at > self.synced_at):
+            self.synced_at = updated_at
+
+    def _view(self):
+        n = len(self.user_ids)
+        return (self.skills[:n, :len(self.skill_vocab.terms)], self.roles[:n, :len(self.role_vocab.terms)],
+                self.experience[:n])
+
+    def skills_of(self, row: int) -> list:
+        return [self.skill_vocab.terms[c] for c in np.flatnonzero(self.skills[row, :len(self.skill_vocab.terms)])]
+
+    def top_candidates(self, user_id, exclude: set, k: int) -> list:
+        """Best k registrants for user_id who are looking for a team and not in `exclude` (str ids)."""
+        row = self.rows[str(user_id)]
+        skills, roles, exp = self._view()
+        su = skills[row]
+        # Skills each candidate has that the user lacks, relative to the best candidate
+        missing = skills @ (1 - su)
+        scores = _score(
+            missing / max(float(missing.max(initial=0)), 1.0),
+            _cosine(skills, su),
+            _cosine(roles, roles[row]) if roles[row].any() else 0.5,
+            np.abs(exp - exp[row]),
+        )
+        eligible = self.looking[:len(self.user_ids)].copy()
+        eligible[row] = False
+        for uid in exclude:
+            r = self.rows.get(uid)
+            if r is not None:
+                eligible[r] = False
+        scores = np.where(eligible, scores, -np.inf)
+        return self._top(scores, k, row)
+
+    def top_teams(self, user_id, teams: list, k: int) -> list:
+        """Best k of `teams` (with 'members') for user_id, scored on the union of their members."""
+        row = self.rows[str(user_id)]
+        member_rows = [[self.rows[str(m)] for m in t.get('members', []) if str(m) in self.rows] for t in teams]
+        teams = [t for t, rows in zip(teams, member_rows) if rows]
+        member_rows = [rows for rows in member_rows if rows]
+        if not teams:
+            return []
+        skills, roles, exp = self._view()
+        # Aggregate members per team in one pass: rows of each team are contiguous in flat
+        sizes = np.array([len(rows) for rows in member_rows])
+        flat = np.fromiter((r for rows in member_rows for r in rows), dtype=np.intp, count=int(sizes.sum()))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        team_skills = np.maximum.reduceat(skills[flat], starts, axis=0)
+        team_roles = np.maximum.reduceat(roles[flat], starts, axis=0)
+        team_exp = np.add.reduceat(exp[flat], starts) / sizes
+        su = skills[row]
+        # Here complement is what the user brings to each team
+        scores = _score(
+            ((1 - team_skills) @ su) / max(float(su.sum()), 1.0),
+            _cosine(team_skills, su),
+            _cosine(team_roles, roles[row]) if roles[row].any() else 0.5,
+            np.abs(team_exp - exp[row]),
+        )
+        top = np.argsort(-scores)[:k]
+        mine = set(self.skills_of(row))
+        results = []
+        for i in top:
+            team_terms = {self.skill_vocab.terms[c] for c in np.flatnonzero(team_skills[i])}
+            results.append({
+                'team_id': str(teams[i]['_id']),
+                'name': teams[i].get('name', ''),
+                'members': len(teams[i].get('members', [])),
+                'score': round(float(scores[i]), 4),
+                'skills_you_add': sorted(mine - team_terms),
+            })
+        return results
+
+    def _top(self, scores: np.ndarray, k: int, row: int) -> list:
+        finite = int(np.isfinite(scores).sum())
+        k = min(k, finite)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        mine = set(self.skills_of(row))
+        return [{
+            'user_id': str(self.user_ids[i]),
+            'name': self.names[i],
+            'skills': self.skills_of(i),
+            'complementary_skills': [s for s in self.skills_of(i) if s not in mine],
+            'score': round(float(scores[i]), 4),
+        } for i in top]
+
+
+_indexes = TTLCache(maxsize=MATCH_INDEX_SIZE, ttl=MATCH_INDEX_TTL)
+_build_lock = Lock()
+
+
+def get_index(registrations_col, hackathon_id) -> SkillIndex:
+    """Index for hackathon_id, built on first use and caught up on later calls."""
+    index = _indexes.get(str(hackathon_id))
+    if index is None:
+        with _build_lock:
+            index = _indexes.get(str(hackathon_id))
+            if index is None:
+                index = SkillIndex()
+                with index.lock:
+                    for reg in registrations_col.find({'hackathon_id': hackathon_id}, REGISTRATION_PROJECTION):
+                        index.upsert(reg)
+                    if index.synced_at is None:
+                        # Only legacy documents without updated_at so far
+                        index.synced_at = datetime.utcnow()
+                _indexes.set(str(hackathon_id), index)
+                return index
+    with index.lock:
+        query = {'hackathon_id': hackathon_id}
+        if index.synced_at is not None:
+            query['updated_at'] = {'$gte': index.synced_at - SYNC_OVERLAP}
+        for reg in registrations_col.find(query, REGISTRATION_PROJECTION):
+            index.upsert(reg)
+    return index
+
+
+def drop_index(hackathon_id):
+    _indexes.delete(str(hackathon_id))
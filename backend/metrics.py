@@ -0,0 +1,378 @@
+"""
+Per-request instrumentation: route latency histograms, MongoDB round trips
+per request, slow-request logs and an opt-in sampling profiler.
+
+A pymongo command listener attributes every command (name, collection,
+duration) to the request running on that thread, so each route reports how
+many round trips it makes and how long it waits on the database. Responses
+carry a Server-Timing header (app and db time), requests slower than
+SLOW_REQUEST_MS are logged with their command breakdown, and everything is
+exposed per worker at GET /metrics (JSON, or ?format=prometheus).
+
+With PROFILING_ENABLED=1 a request sent with `X-Profile: 1` is sampled every
+PROFILE_INTERVAL_MS by a background thread; the collapsed stacks are kept in
+memory and fetched from GET /metrics/profiles/<id> (the id comes back in the
+X-Profile-Id response header).
+
+/metrics and /metrics/profiles are only served when METRICS_TOKEN is set, and
+then require `Authorization: Bearer <token>`; without it they 404.
+"""
+
+from collections import Counter, deque
+from contextvars import ContextVar
+from threading import Event, Lock, Thread, get_ident
+import hmac
+import logging
+import os
+import sys
+import time
+import uuid
+
+from flask import Blueprint, Response, g, jsonify, request
+from pymongo import monitoring
+
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '500'))
+SLOW_LOG_SIZE = int(os.environ.get('SLOW_LOG_SIZE', '50'))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '2'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '20'))
+
+# Upper bounds in ms; the last bucket is +Inf
+LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+logger = logging.getLogger('inovatehub.metrics')
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+class Histogram:
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        i = 0
+        while i < len(self.bounds) and value > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)."""
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max
+        return 0.0
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = Counter()
+        self.db_commands = 0
+        self.db_ms = 0.0
+        self.max_db_commands = 0
+
+
+class RequestStats:
+    """Commands issued while serving one request."""
+
+    __slots__ = ('started', 'commands', 'pending')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.commands = []  # (command name, collection, ms)
+        self.pending = {}   # driver request_id -> collection
+
+    @property
+    def db_ms(self) -> float:
+        return sum(ms for _, _, ms in self.commands)
+
+    def breakdown(self) -> list:
+        """Commands grouped by (name, collection), slowest first."""
+        grouped = {}
+        for name, coll, ms in self.commands:
+            entry = grouped.setdefault((name, coll), {'command': name, 'collection': coll, 'count': 0, 'ms': 0.0})
+            entry['count'] += 1
+            entry['ms'] += ms
+        return sorted(
+            ({**e, 'ms': round(e['ms'], 2)} for e in grouped.values()),
+            key=lambda e: -e['ms'],
+        )
+
+
+_current = ContextVar('request_stats', default=None)
+_lock = Lock()
+_routes = {}          # 'METHOD /rule' -> RouteStats
+_commands = Counter()  # (name, collection) -> count
+_command_ms = Counter()
+_slow = deque(maxlen=SLOW_LOG_SIZE)
+_profiles = {}        # id -> profile dict, oldest first
+_started_at = time.time()
+
+# Handshakes and heartbeats are driver housekeeping, not request work
+IGNORED_COMMANDS = {'hello', 'ismaster', 'isMaster', 'ping', 'saslStart', 'saslContinue', 'endSessions'}
+
+
+class CommandTimer(monitoring.CommandListener):
+    def started(self, event):
+        stats = _current.get()
+        if stats is not None and event.command_name not in IGNORED_COMMANDS:
+            coll = event.command.get(event.command_name)
+            stats.pending[event.request_id] = coll if isinstance(coll, str) else ''
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        stats = _current.get()
+        if stats is None or event.request_id not in stats.pending:
+            return
+        coll = stats.pending.pop(event.request_id)
+        stats.commands.append((event.command_name, coll, event.duration_micros / 1000))
+
+
+class Sampler:
+    """Samples one thread's Python stack at a fixed interval until stopped."""
+
+    def __init__(self, thread_id: int, interval_ms: float):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def summary(self, top: int = 25) -> dict:
+        """Hottest collapsed stacks (flamegraph input) plus self and inclusive counts per function."""
+        own, inclusive = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += n
+            for name in set(frames):
+                inclusive[name] += n
+        return {
+            'samples': self.samples,
+            'interval_ms': self.interval * 1000,
+            'self': own.most_common(top),
+            'inclusive': inclusive.most_common(top),
+            'stacks': [{'stack': s, 'samples': n} for s, n in self.stacks.most_common(top)],
+        }
+
+
+def route_key() -> str:
+    rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    return f'{request.method} {rule}'
+
+
+def before_request():
+    stats = RequestStats()
+    g._metrics_token = _current.set(stats)
+    g._metrics_stats = stats
+    if PROFILING_ENABLED and request.headers.get('X-Profile') == '1':
+        g._metrics_sampler = Sampler(get_ident(), PROFILE_INTERVAL_MS).start()
+
+
+def record_route(key: str, status: int, elapsed_ms: float, commands=()):
+    """Add one served request to the per-route stats; also called by the ASGI
+    views (async_views.py), which report no db commands."""
+    with _lock:
+        route = _routes.get(key)
+        if route is None:
+            route = _routes[key] = RouteStats()
+        route.latency.observe(elapsed_ms)
+        route.statuses[status] += 1
+        route.db_commands += len(commands)
+        route.db_ms += sum(ms for _, _, ms in commands)
+        route.max_db_commands = max(route.max_db_commands, len(commands))
+        for name, coll, ms in commands:
+            _commands[(name, coll)] += 1
+            _command_ms[(name, coll)] += ms
+
+
+def after_request(response):
+    stats = g.pop('_metrics_stats', None)
+    if stats is None:
+        return response
+    elapsed_ms = (time.perf_counter() - stats.started) * 1000
+    db_ms = stats.db_ms
+    key = route_key()
+
+    record_route(key, response.status_code, elapsed_ms, stats.commands)
+
+    response.headers.add(
+        'Server-Timing',
+        f'app;dur={elapsed_ms:.1f}, db;dur={db_ms:.1f};desc="{len(stats.commands)} commands"',
+    )
+
+    if elapsed_ms >= SLOW_REQUEST_MS:
+        entry = {
+            'at': time.time(),
+            'route': key,
+            'path': request.path,
+            'status': response.status_code,
+            'ms': round(elapsed_ms, 1),
+            'db_ms': round(db_ms, 1),
+            'db_commands': len(stats.commands),
+            'breakdown': stats.breakdown(),
+        }
+        _slow.append(entry)
+        logger.warning(
+            'slow request %s %.0fms (db %.0fms in %d commands): %s', key, elapsed_ms, db_ms, len(stats.commands),
+            ', '.join(f"{e['command']} {e['collection']} x{e['count']} {e['ms']}ms" for e in entry['breakdown']),
+        )
+
+    sampler = g.pop('_metrics_sampler', None)
+    if sampler is not None:
+        sampler.stop()
+        profile_id = uuid.uuid4().hex[:12]
+        with _lock:
+            _profiles[profile_id] = {'route': key, 'path': request.path, 'ms': round(elapsed_ms, 1),
+                                     **sampler.summary()}
+            while len(_profiles) > PROFILE_KEEP:
+                _profiles.pop(next(iter(_profiles)))
+        response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+def teardown_request(_exc):
+    # Also covers requests that failed before after_request ran
+    sampler = g.pop('_metrics_sampler', None)
+    if sampler is not None:
+        sampler.stop()
+    token = g.pop('_metrics_token', None)
+    if token is not None:
+        _current.reset(token)
+
+
+def snapshot() -> dict:
+    with _lock:
+        routes = {
+            key: {
+                'requests': r.latency.count,
+                'statuses': {str(s): n for s, n in r.statuses.items()},
+                'latency_ms': {
+                    'mean': round(r.latency.total / max(r.latency.count, 1), 2),
+                    'p50': r.latency.quantile(0.5),
+                    'p95': r.latency.quantile(0.95),
+                    'p99': r.latency.quantile(0.99),
+                    'max': round(r.latency.max, 2),
+                    'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], r.latency.counts)),
+                },
+                'db': {
+                    'commands_per_request': round(r.db_commands / max(r.latency.count, 1), 2),
+                    'max_commands': r.max_db_commands,
+                    'ms_per_request': round(r.db_ms / max(r.latency.count, 1), 2),
+                },
+            }
+            for key, r in sorted(_routes.items())
+        }
+        commands = [
+            {'command': name, 'collection': coll, 'count': n, 'ms': round(_command_ms[(name, coll)], 2)}
+            for (name, coll), n in _commands.most_common()
+        ]
+        return {
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - _started_at, 1),
+            'slow_request_ms': SLOW_REQUEST_MS,
+            'routes': routes,
+            'db_commands': commands,
+            'slow_requests': list(_slow),
+            'profiles': list(_profiles),
+        }
+
+
+def prometheus_text() -> str:
+    lines = [
+        '# TYPE http_request_duration_ms histogram',
+    ]
+    with _lock:
+        for key, r in sorted(_routes.items()):
+            method, rule = key.split(' ', 1)
+            labels = f'method="{method}",route="{rule}"'
+            cumulative = 0
+            for bound, n in zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], r.latency.counts):
+                cumulative += n
+                lines.append(f'http_request_duration_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_ms_sum{{{labels}}} {r.latency.total:.3f}')
+            lines.append(f'http_request_duration_ms_count{{{labels}}} {r.latency.count}')
+        lines.append('# TYPE mongo_commands_total counter')
+        for (name, coll), n in sorted(_commands.items()):
+            lines.append(f'mongo_commands_total{{command="{name}",collection="{coll}"}} {n}')
+        lines.append('# TYPE mongo_command_duration_ms_total counter')
+        for (name, coll), ms in sorted(_command_ms.items()):
+            lines.append(f'mongo_command_duration_ms_total{{command="{name}",collection="{coll}"}} {ms:.3f}')
+    return '\n'.join(lines) + '\n'
+
+
+def _authorized() -> bool:
+    if not METRICS_TOKEN:
+        return False
+    return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}')
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    if not _authorized():
+        return jsonify({'message': 'Unauthorized'}), 401
+    if request.args.get('format') == 'prometheus':
+        return Response(prometheus_text(), mimetype='text/plain; version=0.0.4')
+    return jsonify(snapshot())
+
+
+@metrics_bp.route('/metrics/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    if not _authorized():
+        return jsonify({'message': 'Unauthorized'}), 401
+    with _lock:
+        profile = _profiles.get(profile_id)
+    if profile is None:
+        return jsonify({'message': 'Profile not found'}), 404
+    return jsonify(profile)
+
+
+def init_metrics(app):
+    """Register the command listener and request hooks. Call before the first
+    MongoClient is created (db.get_client is lazy, so at app setup)."""
+    monitoring.register(CommandTimer())
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+    # Route and Mongo stats are not public: no token, no endpoint
+    if METRICS_TOKEN:
+        app.register_blueprint(metrics_bp)
+    else:
+        logger.info('METRICS_TOKEN is not set; /metrics is disabled')
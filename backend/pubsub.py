@@ -0,0 +1,72 @@
+from collections import defaultdict
+from threading import Lock
+import queue
+
+
+class Subscription:
+    def __init__(self, broker: 'Broker', channel: str, maxsize: int):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout: float = None):
+        """Next published message, or None if nothing arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Broker:
+    """In-process publish/subscribe fan-out.
+
+    Only reaches subscribers in the same process: streams served by another
+    worker must also catch up from the database (see stream_team_messages).
+    A subscriber that stops draining its queue loses messages instead of
+    blocking publishers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._channels = defaultdict(set)
+        self._lock = Lock()
+
+    def subscribe(self, channel: str) -> Subscription:
+        sub = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._channels[channel].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = self._channels.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._channels[sub.channel]
+
+    def publish(self, channel: str, message) -> int:
+        """Deliver message to every subscriber of channel; returns how many got it."""
+        with self._lock:
+            subs = list(self._channels.get(channel, ()))
+        delivered = 0
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(message)
+                delivered += 1
+            except queue.Full:
+                pass
+        return delivered
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._channels.get(channel, ()))
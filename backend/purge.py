@@ -0,0 +1,188 @@
+"""
+Cascade delete of a hackathon.
+
+The hackathon document is deleted and a purge_jobs document recorded in one
+small transaction; from then on every view that resolves the hackathon 404s.
+Its child documents (team messages, submissions, team requests, registrations,
+teams) are purged in batches outside the transaction by a background thread,
+so no single transaction grows with the size of the hackathon. Progress is
+recorded on the job for the organizer to poll.
+
+A job is claimed atomically with a lease that the purging thread renews after
+every batch. Jobs whose lease expired (their worker died) or that failed are
+picked up again by:
+
+    flask --app app hackathons resume-purges
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Lock
+import os
+import time
+
+from bson import ObjectId
+
+from db import collection, run_transaction
+
+PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', '1000'))
+# Pause between batches so a big purge does not starve request traffic
+PURGE_PAUSE_SECONDS = float(os.environ.get('PURGE_PAUSE_SECONDS', '0.05'))
+PURGE_WORKERS = int(os.environ.get('PURGE_WORKERS', '1'))
+# A running job whose lease was not renewed for this long is considered abandoned
+PURGE_LEASE_SECONDS = float(os.environ.get('PURGE_LEASE_SECONDS', '60'))
+
+hackathons_col = collection('hackathons')
+registrations_col = collection('registrations')
+teams_col = collection('teams')
+team_requests_col = collection('team_requests')
+team_messages_col = collection('team_messages')
+submissions_col = collection('submissions')
+purge_jobs_col = collection('purge_jobs')
+
+# Child collections purged in the background, in this order (teams last:
+# messages are found through the job's team_ids, not through the teams)
+PURGED_COLLECTIONS = {
+    'team_messages': team_messages_col,
+    'submissions': submissions_col,
+    'team_requests': team_requests_col,
+    'registrations': registrations_col,
+    'teams': teams_col,
+}
+
+_executor = None
+_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created on first use so each forked gunicorn worker gets its own threads
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PURGE_WORKERS, thread_name_prefix='purge')
+    return _executor
+
+
+def delete_hackathon(hackathon_id: ObjectId, organizer_id: ObjectId) -> ObjectId:
+    """Delete the hackathon document, queue the purge of its children and
+    return the purge job id."""
+    job_id = ObjectId()
+
+    def delete_core(session):
+        team_ids = teams_col.distinct('_id', {'hackathon_id': hackathon_id}, session=session)
+        hackathons_col.delete_one({'_id': hackathon_id}, session=session)
+        now = datetime.utcnow()
+        purge_jobs_col.insert_one({
+            '_id': job_id,
+            'hackathon_id': hackathon_id,
+            'organizer_id': organizer_id,
+            'team_ids': team_ids,
+            'status': 'queued',
+            'total': {},
+            'deleted': {name: 0 for name in PURGED_COLLECTIONS},
+            'created_at': now,
+            'updated_at': now,
+        }, session=session)
+
+    run_transaction(delete_core)
+    _get_executor().submit(run_purge, job_id)
+    return job_id
+
+
+def child_query(name: str, job: dict) -> dict:
+    if name == 'team_messages':
+        # Messages only reference their team
+        return {'team_id': {'$in': job['team_ids']}}
+    return {'hackathon_id': job['hackathon_id']}
+
+
+class LeaseLost(Exception):
+    """Another process claimed the job after this one's lease expired."""
+
+
+def claimable(now: datetime) -> dict:
+    """Jobs nobody is working on: queued, failed, or running with an expired lease."""
+    return {'$or': [
+        {'status': {'$in': ['queued', 'failed']}},
+        {'status': 'running', 'lease_until': {'$lt': now}},
+    ]}
+
+
+def purge_batches(name: str, job: dict, lease: ObjectId):
+    col = PURGED_COLLECTIONS[name]
+    query = child_query(name, job)
+    while True:
+        ids = [doc['_id'] for doc in col.find(query, {'_id': 1}).limit(PURGE_BATCH_SIZE)]
+        if not ids:
+            return
+        deleted = col.delete_many({'_id': {'$in': ids}}).deleted_count
+        now = datetime.utcnow()
+        # Records progress and renews the lease, but only while we still hold it
+        renewed = purge_jobs_col.update_one(
+            {'_id': job['_id'], 'lease': lease},
+            {
+                '$inc': {f'deleted.{name}': deleted},
+                '$set': {'updated_at': now, 'lease_until': now + timedelta(seconds=PURGE_LEASE_SECONDS)},
+            },
+        )
+        if not renewed.matched_count:
+            raise LeaseLost()
+        if PURGE_PAUSE_SECONDS:
+            time.sleep(PURGE_PAUSE_SECONDS)
+
+
+def run_purge(job_id: ObjectId) -> bool:
+    """Purge the job's child documents; False if the job was not claimable."""
+    now = datetime.utcnow()
+    lease = ObjectId()
+    job = purge_jobs_col.find_one_and_update(
+        {'_id': job_id, **claimable(now)},
+        {'$set': {
+            'status': 'running',
+            'lease': lease,
+            'lease_until': now + timedelta(seconds=PURGE_LEASE_SECONDS),
+            'updated_at': now,
+        }},
+    )
+    if not job:
+        return False
+    try:
+        # Totals are what is left now; on a resumed job 'deleted' already counts earlier batches
+        totals = {name: job['deleted'].get(name, 0) + col.count_documents(child_query(name, job))
+                  for name, col in PURGED_COLLECTIONS.items()}
+        purge_jobs_col.update_one({'_id': job_id, 'lease': lease}, {'$set': {'total': totals}})
+        for name in PURGED_COLLECTIONS:
+            purge_batches(name, job, lease)
+    except LeaseLost:
+        return True
+    except Exception as e:
+        purge_jobs_col.update_one(
+            {'_id': job_id, 'lease': lease},
+            {'$set': {'status': 'failed', 'error': str(e), 'updated_at': datetime.utcnow()}},
+        )
+        return True
+    now = datetime.utcnow()
+    purge_jobs_col.update_one(
+        {'_id': job_id, 'lease': lease},
+        {'$set': {'status': 'done', 'finished_at': now, 'updated_at': now}},
+    )
+    return True
+
+
+def unfinished_jobs() -> list:
+    """Jobs resume-purges may claim; running jobs with a live lease are left alone."""
+    return [job['_id'] for job in purge_jobs_col.find(claimable(datetime.utcnow()), {'_id': 1})]
+
+
+def job_progress(job: dict) -> dict:
+    return {
+        'id': str(job['_id']),
+        'hackathon_id': str(job['hackathon_id']),
+        'status': job.get('status', 'queued'),
+        'total': job.get('total', {}),
+        'deleted': job.get('deleted', {}),
+        'error': job.get('error'),
+        'created_at': job.get('created_at'),
+        'finished_at': job.get('finished_at'),
+    }
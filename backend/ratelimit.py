@@ -0,0 +1,291 @@
+"""
+Token-bucket rate limiting for the hot write endpoints.
+
+Each rule gives an endpoint one bucket per user (the JWT `sub`) and/or per
+client IP, holding `count` tokens and refilled at count/seconds per second, so
+short bursts are allowed but the sustained rate is capped. A request that
+finds any of its buckets empty is answered 429 with Retry-After before the
+view runs, and takes no token from its other buckets.
+
+Rules default to DEFAULT_RULES and can be replaced per endpoint with
+RATE_LIMITS, e.g.
+
+    RATE_LIMITS="hackathons.send_team_message=user:60/60,ip:600/60;auth.signup=ip:3/60"
+
+Buckets live in process memory by default (each worker limits on its own).
+RATE_LIMIT_BACKEND=mongo keeps them in the rate_limits collection, one atomic
+update per check, so all workers share them. Checks fail open if the shared
+backend is unreachable.
+
+IP buckets key on the address RATE_LIMIT_PROXY_HOPS entries from the right of
+X-Forwarded-For. The default of 0 ignores the header, as clients that reach the
+app directly (docker-compose) could set it to anything. Behind proxies, set it
+to their number: the Procfile sets 1 for the platform router, a CDN in front
+of that makes 2. Left at 0 behind a proxy, every client shares the proxy's
+address and ip limits become site-wide; the first forwarded request logs a
+warning.
+"""
+
+from datetime import datetime, timedelta
+from threading import Lock
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+
+from flask import jsonify, request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from db import collection, declare_index
+from tokens import decode_jwt
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') != '0'
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+# Reverse proxies in front of the app that append to X-Forwarded-For; 0 trusts none
+RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', '0'))
+# Memory backend: past this many buckets, refilled ones are dropped, then the
+# least recently used
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+
+logger = logging.getLogger('inovatehub.ratelimit')
+
+rate_limits_col = collection('rate_limits')
+# Buckets are dropped once they would have refilled completely
+declare_index(rate_limits_col, [('expires_at', 1)], expireAfterSeconds=0)
+
+
+class Limit:
+    def __init__(self, scope: str, count: int, seconds: float):
+        if scope not in ('user', 'ip'):
+            raise ValueError(f'unknown rate limit scope {scope!r}')
+        self.scope = scope
+        self.burst = count
+        self.rate = count / seconds
+
+    def __repr__(self):
+        return f'Limit({self.scope!r}, {self.burst}, {self.burst / self.rate:g})'
+
+
+# Endpoint -> limits; IP limits are looser since many users can share one address
+DEFAULT_RULES = {
+    'auth.signup': [Limit('ip', 5, 60)],
+    'hackathons.send_team_message': [Limit('user', 30, 60), Limit('ip', 300, 60)],
+    'hackathons.request_join_team': [Limit('user', 20, 60), Limit('ip', 200, 60)],
+    'hackathons.invite_participant': [Limit('user', 30, 60), Limit('ip', 200, 60)],
+}
+
+
+def parse_rules(spec: str) -> dict:
+    """'endpoint=scope:count/seconds,...;endpoint=...' -> {endpoint: [Limit]}"""
+    rules = {}
+    for entry in filter(None, (e.strip() for e in spec.split(';'))):
+        endpoint, _, limits = entry.partition('=')
+        rules[endpoint.strip()] = []
+        for limit in filter(None, (l.strip() for l in limits.split(','))):
+            scope, _, rate = limit.partition(':')
+            count, _, seconds = rate.partition('/')
+            rules[endpoint.strip()].append(Limit(scope, int(count), float(seconds)))
+    return rules
+
+
+RULES = {**DEFAULT_RULES, **parse_rules(os.environ.get('RATE_LIMITS', ''))}
+
+
+class MemoryBackend:
+    """Buckets in a dict: {key: [tokens, updated_at, full_at]}, least recently
+    used first."""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = Lock()
+
+    def take(self, buckets: list, now: float) -> float:
+        """Take one token from each (key, Limit) bucket; returns 0 if allowed,
+        else seconds until all have one, and then takes none."""
+        with self._lock:
+            tokens = []
+            for key, limit in buckets:
+                bucket = self._buckets.get(key)
+                tokens.append(limit.burst if bucket is None
+                              else min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate))
+            wait = max([(1 - t) / limit.rate for t, (_, limit) in zip(tokens, buckets) if t < 1], default=0.0)
+            if wait:
+                return wait
+            for (key, limit), t in zip(buckets, tokens):
+                # Re-inserted so the dict stays in least recently used order
+                if self._buckets.pop(key, None) is None and len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                self._buckets[key] = [t - 1, now, now + (limit.burst - t + 1) / limit.rate]
+            return 0.0
+
+    def _prune(self, now: float):
+        # A refilled bucket is the same as no bucket
+        for key in [k for k, b in self._buckets.items() if b[2] <= now]:
+            del self._buckets[key]
+        # Then the least recently used, with headroom so this is not run on every new key
+        excess = len(self._buckets) - self.max_keys * 9 // 10
+        for key in list(itertools.islice(self._buckets, max(excess, 0))):
+            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class MongoBackend:
+    """Buckets shared by every worker, updated atomically with a pipeline update."""
+
+    blocking = True
+
+    def __init__(self, col=rate_limits_col):
+        self.col = col
+
+    def take(self, buckets: list, now: float) -> float:
+        """Same contract as MemoryBackend.take. The buckets are read first and
+        charged only if all have a token; one that emptied in between (another
+        worker) gets the tokens already taken back."""
+        docs = {doc['_id']: doc for doc in self.col.find(
+            {'_id': {'$in': [key for key, _ in buckets]}}, {'tokens': 1, 'ts': 1})}
+        wait = 0.0
+        for key, limit in buckets:
+            doc = docs.get(key)
+            if doc is not None:
+                tokens = min(limit.burst, doc['tokens'] + (now - doc['ts']) * limit.rate)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / limit.rate)
+        if wait:
+            return wait
+        taken = []
+        for key, limit in buckets:
+            wait = self._take_one(key, limit, now)
+            if wait:
+                for charged, charged_limit in taken:
+                    self.col.update_one({'_id': charged}, [
+                        {'$set': {'tokens': {'$min': [charged_limit.burst, {'$add': ['$tokens', 1]}]}}},
+                    ])
+                return wait
+            taken.append((key, limit))
+        return 0.0
+
+    def _take_one(self, key: str, limit: Limit, now: float) -> float:
+        refilled = {'$min': [limit.burst, {'$add': [
+            {'$ifNull': ['$tokens', limit.burst]},
+            {'$multiply': [{'$subtract': [now, {'$ifNull': ['$ts', now]}]}, limit.rate]},
+        ]}]}
+        allowed = {'$gte': ['$tokens', 1]}
+        pipeline = [
+            {'$set': {'tokens': refilled, 'ts': now}},
+            {'$set': {
+                'allowed': allowed,
+                'tokens': {'$cond': [allowed, {'$subtract': ['$tokens', 1]}, '$tokens']},
+                'expires_at': datetime.utcnow() + timedelta(seconds=limit.burst / limit.rate),
+            }},
+        ]
+        for attempt in range(2):
+            try:
+                doc = self.col.find_one_and_update(
+                    {'_id': key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER,
+                    projection={'tokens': 1, 'allowed': 1},
+                )
+                break
+            except DuplicateKeyError:
+                # Two first requests raced to insert the bucket; the loser updates it
+                if attempt:
+                    raise
+        return 0.0 if doc['allowed'] else (1 - doc['tokens']) / limit.rate
+
+
+def make_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'mongo':
+        return MongoBackend()
+    raise ValueError(f'unknown RATE_LIMIT_BACKEND {name!r}')
+
+
+backend = make_backend()
+
+
+def check(endpoint: str, user_id, ip, now: float = None) -> float:
+    """Take a token from each bucket of endpoint; 0 if allowed, else the
+    Retry-After in seconds (and no bucket is charged)."""
+    limits = RULES.get(endpoint)
+    if not RATE_LIMIT_ENABLED or not limits:
+        return 0.0
+    now = time.time() if now is None else now
+    buckets = []
+    for limit in limits:
+        identity = user_id if limit.scope == 'user' else ip
+        if identity:
+            buckets.append((f'{endpoint}:{limit.scope}:{identity}', limit))
+    if not buckets:
+        return 0.0
+    try:
+        return backend.take(buckets, now)
+    except Exception:
+        logger.exception('rate limit check failed for %s, allowing the request', endpoint)
+        return 0.0
+
+
+async def check_async(endpoint: str, user_id, ip) -> float:
+    """check() for the ASGI views; a shared backend runs off the event loop."""
+    if backend.blocking and RULES.get(endpoint):
+        return await asyncio.to_thread(check, endpoint, user_id, ip)
+    return check(endpoint, user_id, ip)
+
+
+_warned_forwarded_for = False
+
+
+def warn_unused_forwarded_for():
+    global _warned_forwarded_for
+    if not _warned_forwarded_for:
+        _warned_forwarded_for = True
+        logger.warning(
+            'X-Forwarded-For received with RATE_LIMIT_PROXY_HOPS=0; if the app is behind '
+            'proxies, set it to their number, or ip limits apply to all clients together')
+
+
+def client_ip(remote_addr: str, forwarded_for: str) -> str:
+    """Client address, taken RATE_LIMIT_PROXY_HOPS entries from the right of X-Forwarded-For."""
+    if forwarded_for and not RATE_LIMIT_PROXY_HOPS:
+        warn_unused_forwarded_for()
+    if RATE_LIMIT_PROXY_HOPS and forwarded_for:
+        hops = [h.strip() for h in forwarded_for.split(',') if h.strip()]
+        if len(hops) >= RATE_LIMIT_PROXY_HOPS:
+            return hops[-RATE_LIMIT_PROXY_HOPS]
+    return remote_addr or ''
+
+
+def retry_after_header(wait: float) -> str:
+    return str(max(1, math.ceil(wait)))
+
+
+def too_many_requests(wait: float):
+    res = jsonify({'message': 'Too many requests, please slow down'})
+    res.headers['Retry-After'] = retry_after_header(wait)
+    return res, 429
+
+
+def limit_request():
+    """before_request hook: answer 429 when the endpoint's buckets are empty."""
+    if request.endpoint not in RULES or not RATE_LIMIT_ENABLED:
+        return None
+    user_id = None
+    if any(limit.scope == 'user' for limit in RULES[request.endpoint]):
+        data = request.get_json(force=True, silent=True)
+        claims = decode_jwt((data or {}).get('token') or '') if isinstance(data, dict) else None
+        user_id = claims.get('sub') if claims else None
+    wait = check(request.endpoint, user_id, client_ip(request.remote_addr, request.headers.get('X-Forwarded-For')))
+    if wait > 0:
+        return too_many_requests(wait)
+    return None
+
+
+def init_rate_limits(app):
+    app.before_request(limit_request)
@@ -0,0 +1,290 @@
+"""
+Bulk registration import for organizers.
+
+An uploaded CSV (with a header row) or NDJSON file is read as a stream. Each
+row names an existing account by `email` or `user_id` (`id` also works, so a
+participant export can be re-imported). It may also carry the profile
+fields of /register, using the column names of the export. Rows are validated
+and resolved to accounts IMPORT_BATCH_SIZE at a time. Each batch is written
+with one unordered bulk_write of upserts on the unique (user_id,
+hackathon_id) key, so re-importing a file updates registrations in place
+instead of duplicating them.
+
+The file must be UTF-8. One that is not (or that the csv module cannot parse)
+stops the import at the row where that is found: the rows before it have been
+imported, and re-uploading the fixed file updates them in place.
+"""
+
+from datetime import datetime
+import csv
+import os
+import time
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db import collection
+import json_provider
+
+registrations_col = collection('registrations')
+users_col = collection('users')
+
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '1000'))
+IMPORT_MAX_ROWS = int(os.environ.get('IMPORT_MAX_ROWS', '100000'))
+MAX_FIELD_LENGTH = 2000
+MAX_SKILLS = 50
+FORMATS = ('csv', 'ndjson')
+
+# Upload column -> registration field
+TEXT_FIELDS = {
+    'name': 'full_name',
+    'full_name': 'full_name',
+    'role': 'role',
+    'experience_level': 'experience_level',
+    'motivation': 'motivation',
+    'portfolio_link': 'portfolio_link',
+    'github': 'github',
+    'linkedin': 'linkedin',
+    'resume_link': 'resume_link',
+    'team_code': 'team_code',
+}
+# What /register stores for fields a new registration's row leaves out
+INSERT_DEFAULTS = {
+    'full_name': '', 'role': '', 'experience_level': '', 'motivation': '', 'portfolio_link': '',
+    'github': '', 'linkedin': '', 'resume_link': '', 'team_code': '', 'skills': [], 'looking_for_team': True,
+}
+TRUE_VALUES = {'true', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'no', 'n', '0'}
+
+
+class RowError(ValueError):
+    pass
+
+
+class FileError(ValueError):
+    """The upload cannot be read past `row`."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(f'Row {row}: {message}' if row else message)
+        self.row = row
+
+
+def detect_format(explicit: str, filename: str, mimetype: str) -> str:
+    explicit = (explicit or '').lower()
+    if explicit in FORMATS:
+        return explicit
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    return 'csv'
+
+
+def decoded_lines(stream):
+    # Decoded line by line (not by the chunk, as TextIOWrapper does) so a bad
+    # byte is reported at the row it is in, before that row is used
+    for i, line in enumerate(stream):
+        yield line.decode('utf-8-sig' if i == 0 else 'utf-8')
+
+
+def read_rows(stream, fmt: str):
+    """Yield (row number, dict or RowError) from a binary stream, one row at a
+    time; raises FileError where the stream stops being readable."""
+    n = 0
+    try:
+        if fmt == 'csv':
+            for row in csv.DictReader(decoded_lines(stream)):
+                n += 1
+                yield n, {(k or '').strip().lower(): v for k, v in row.items() if k is not None}
+            return
+        for line in decoded_lines(stream):
+            if not line.strip():
+                continue
+            n += 1
+            try:
+                row = json_provider.loads(line)
+            except ValueError:
+                yield n, RowError('Invalid JSON')
+                continue
+            yield n, row if isinstance(row, dict) else RowError('Each line must be a JSON object')
+    except UnicodeDecodeError:
+        raise FileError(n + 1, 'the file is not UTF-8 text; save it as UTF-8 (in Excel, "CSV UTF-8")')
+    except csv.Error as e:
+        raise FileError(n + 1, f'could not be read as CSV ({e})')
+
+
+def _text(value, column: str) -> str:
+    if value is None:
+        return ''
+    if not isinstance(value, (str, int, float)):
+        raise RowError(f'{column} must be text')
+    value = str(value).strip()
+    if len(value) > MAX_FIELD_LENGTH:
+        raise RowError(f'{column} is longer than {MAX_FIELD_LENGTH} characters')
+    return value
+
+
+def _skills(value) -> list:
+    if isinstance(value, str):
+        value = value.replace(';', ',').split(',')
+    if not isinstance(value, list):
+        raise RowError('skills must be a list or a ;-separated string')
+    skills = [_text(s, 'skills') for s in value]
+    skills = [s for s in skills if s]
+    if len(skills) > MAX_SKILLS:
+        raise RowError(f'More than {MAX_SKILLS} skills')
+    return skills
+
+
+def _flag(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError('looking_for_team must be true or false')
+
+
+def validate(row: dict):
+    """(user ObjectId or None, email or None, registration fields) for one row; raises RowError."""
+    raw_id = row.get('user_id') or row.get('id')
+    email = _text(row.get('email'), 'email').lower()
+    user_id = None
+    if raw_id:
+        try:
+            user_id = ObjectId(str(raw_id).strip())
+        except (InvalidId, TypeError):
+            raise RowError('user_id is not a valid id')
+    elif not email:
+        raise RowError('email or user_id is required')
+
+    fields = {}
+    for column, field in TEXT_FIELDS.items():
+        if column in row and row[column] not in (None, ''):
+            fields[field] = _text(row[column], column)
+    if row.get('skills') not in (None, ''):
+        fields['skills'] = _skills(row['skills'])
+    if row.get('looking_for_team') not in (None, ''):
+        fields['looking_for_team'] = _flag(row['looking_for_team'])
+    return user_id, (None if user_id else email), fields
+
+
+class ImportReport:
+    def __init__(self, errors_only: bool):
+        self.errors_only = errors_only
+        self.rows = []
+        self.counts = {'created': 0, 'updated': 0, 'error': 0}
+
+    def add(self, n: int, status: str, user_id=None, error: str = None):
+        self.counts[status] += 1
+        if status == 'error':
+            self.rows.append({'row': n, 'status': status, 'error': error})
+        elif not self.errors_only:
+            self.rows.append({'row': n, 'status': status, 'user_id': str(user_id)})
+
+
+def resolve_accounts(batch: list) -> dict:
+    """{email or ObjectId: ObjectId} for the accounts the batch refers to, in at most two queries."""
+    emails = [email for _, user_id, email, _ in batch if email]
+    ids = [user_id for _, user_id, _, _ in batch if user_id]
+    found = {}
+    if emails:
+        for user in users_col.find({'email': {'$in': emails}}, {'email': 1}):
+            found[user['email']] = user['_id']
+    if ids:
+        for user in users_col.find({'_id': {'$in': ids}}, {'_id': 1}):
+            found[user['_id']] = user['_id']
+    return found
+
+
+def write_batch(hackathon_id: ObjectId, batch: list, seen: dict, report: ImportReport):
+    """Resolve, de-duplicate and upsert one batch of validated rows."""
+    accounts = resolve_accounts(batch)
+    now = datetime.utcnow()
+    ops, op_rows = [], []
+    for n, user_id, email, fields in batch:
+        account = accounts.get(user_id or email)
+        if account is None:
+            report.add(n, 'error', error='No account with this email' if email else 'Unknown user_id')
+            continue
+        if account in seen:
+            report.add(n, 'error', error=f'Same participant as row {seen[account]}')
+            continue
+        seen[account] = n
+        ops.append(UpdateOne(
+            {'hackathon_id': hackathon_id, 'user_id': account},
+            {
+                '$setOnInsert': {
+                    'created_at': now,
+                    **{k: v for k, v in INSERT_DEFAULTS.items() if k not in fields},
+                },
+                '$set': {**fields, 'status': 'Confirmed', 'updated_at': now},
+            },
+            upsert=True,
+        ))
+        op_rows.append((n, account))
+    if not ops:
+        return
+
+    try:
+        result = registrations_col.bulk_write(ops, ordered=False)
+        upserted = set(result.upserted_ids)
+        failed = {}
+    except BulkWriteError as e:
+        # Unordered: every other operation still ran
+        upserted = {u['index'] for u in e.details.get('upserted', [])}
+        failed = {w['index']: w.get('errmsg', 'Write failed') for w in e.details.get('writeErrors', [])}
+    for i, (n, account) in enumerate(op_rows):
+        if i in failed:
+            # Most likely a concurrent /register for the same participant; the row can be retried
+            report.add(n, 'error', error='Could not be saved, please retry this row')
+        else:
+            report.add(n, 'created' if i in upserted else 'updated', account)
+
+
+def import_registrations(hackathon_id: ObjectId, stream, fmt: str, errors_only: bool = False) -> dict:
+    """Validate and upsert every row of the upload; returns the summary and
+    per-row report, and under 'error' why the file could not be read to the end."""
+    began = time.perf_counter()
+    report = ImportReport(errors_only)
+    seen = {}  # account -> first row that registered it
+    batch, total, truncated, error = [], 0, False, None
+    try:
+        for n, row in read_rows(stream, fmt):
+            if total >= IMPORT_MAX_ROWS:
+                truncated = True
+                break
+            total += 1
+            if isinstance(row, RowError):
+                report.add(n, 'error', error=str(row))
+                continue
+            try:
+                user_id, email, fields = validate(row)
+            except RowError as e:
+                report.add(n, 'error', error=str(e))
+                continue
+            batch.append((n, user_id, email, fields))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                write_batch(hackathon_id, batch, seen, report)
+                batch = []
+    except FileError as e:
+        # Everything before the unreadable row is imported, so the report stays true
+        error = {'row': e.row, 'message': str(e)}
+    if batch:
+        write_batch(hackathon_id, batch, seen, report)
+
+    report.rows.sort(key=lambda r: r['row'])
+    return {
+        'summary': {
+            'rows': total,
+            **report.counts,
+            'truncated': truncated,
+            'max_rows': IMPORT_MAX_ROWS,
+            'seconds': round(time.perf_counter() - began, 3),
+        },
+        'rows': report.rows,
+        'error': error,
+    }
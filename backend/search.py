@@ -0,0 +1,133 @@
+"""
+Full-text and faceted hackathon search.
+
+Backed by one weighted MongoDB text index over name, theme, tracks and
+description. One aggregation returns the ranked page, the total and the facet
+counts (theme, locationType, prize range). Each facet ignores its own filter,
+so the UI can show how many results picking another value of it would give.
+
+Nothing inside $facet can use an index, so the facet stage only ever sees a
+bounded input: the text matches for a query, or for an empty query (browse)
+the newest BROWSE_WINDOW hackathons, read from the created_at index. Browse
+totals, facets and non-default sorts cover that window only.
+"""
+
+import os
+
+from pymongo import TEXT
+
+from db import collection, declare_index
+from serializers import CARD_PROJECTION
+
+hackathons_col = collection('hackathons')
+
+TEXT_WEIGHTS = {'name': 10, 'theme': 5, 'tracks': 5, 'description': 1}
+declare_index(
+    hackathons_col,
+    [(field, TEXT) for field in TEXT_WEIGHTS],
+    weights=TEXT_WEIGHTS,
+    default_language='english',
+    name='hackathon_text',
+)
+
+# Lower bounds of the prize facet buckets; the last one is open-ended
+PRIZE_BOUNDARIES = [0, 1000, 5000, 10000, 50000]
+SORTS = ('relevance', 'newest', 'prize_desc', 'prize_asc')
+MAX_RESULTS = 50
+BROWSE_WINDOW = int(os.environ.get('SEARCH_BROWSE_WINDOW', '1000'))
+
+
+def prize_label(lower) -> str:
+    i = PRIZE_BOUNDARIES.index(lower)
+    return f'{lower}+' if i == len(PRIZE_BOUNDARIES) - 1 else f'{lower}-{PRIZE_BOUNDARIES[i + 1]}'
+
+
+PRIZE_RANGES = {prize_label(lower): lower for lower in PRIZE_BOUNDARIES}
+
+
+def prize_clause(labels: list) -> dict:
+    ranges = []
+    for label in labels:
+        lower = PRIZE_RANGES[label]
+        i = PRIZE_BOUNDARIES.index(lower)
+        bounds = {'$gte': lower}
+        if i + 1 < len(PRIZE_BOUNDARIES):
+            bounds['$lt'] = PRIZE_BOUNDARIES[i + 1]
+        ranges.append({'prize': bounds})
+    return ranges[0] if len(ranges) == 1 else {'$or': ranges}
+
+
+def filter_clauses(themes: list, locations: list, prizes: list) -> dict:
+    """{facet name: match clause} for the filters that are set."""
+    clauses = {}
+    if themes:
+        clauses['theme'] = {'theme': {'$in': themes}}
+    if locations:
+        clauses['locationType'] = {'locationType': {'$in': locations}}
+    if prizes:
+        clauses['prize'] = prize_clause(prizes)
+    return clauses
+
+
+def _match(clauses: list) -> list:
+    return [{'$match': {'$and': clauses}}] if clauses else []
+
+
+def count_by(field: str) -> list:
+    # Same as $sortByCount, with a stable order for equal counts
+    return [{'$group': {'_id': field, 'count': {'$sum': 1}}}, {'$sort': {'count': -1, '_id': 1}}]
+
+
+def build_pipeline(q: str, clauses: dict, sort: str, skip: int, limit: int) -> list:
+    pipeline = []
+    if q:
+        # $text must be the first stage; the score travels with each document
+        pipeline.append({'$match': {'$text': {'$search': q}}})
+        pipeline.append({'$project': {**CARD_PROJECTION, 'score': {'$meta': 'textScore'}}})
+    else:
+        # Served by the (created_at, _id) index; bounds what $facet scans
+        pipeline.append({'$sort': {'created_at': -1, '_id': -1}})
+        pipeline.append({'$limit': BROWSE_WINDOW})
+        pipeline.append({'$project': CARD_PROJECTION})
+
+    order = {
+        'relevance': {'score': -1, 'created_at': -1, '_id': -1} if q else {'created_at': -1, '_id': -1},
+        'newest': {'created_at': -1, '_id': -1},
+        'prize_desc': {'prize': -1, '_id': -1},
+        'prize_asc': {'prize': 1, '_id': 1},
+    }[sort]
+
+    def others(name):
+        return [clause for facet, clause in clauses.items() if facet != name]
+
+    pipeline.append({'$facet': {
+        'results': _match(list(clauses.values())) + [{'$sort': order}, {'$skip': skip}, {'$limit': limit}],
+        'total': _match(list(clauses.values())) + [{'$count': 'n'}],
+        'theme': _match(others('theme')) + count_by('$theme'),
+        'locationType': _match(others('locationType')) + count_by('$locationType'),
+        'prize': _match(others('prize')) + [{'$bucket': {
+            'groupBy': '$prize',
+            'boundaries': PRIZE_BOUNDARIES + [float('inf')],
+            'default': 'other',
+        }}],
+    }})
+    return pipeline
+
+
+def search(q: str, themes: list, locations: list, prizes: list, sort: str, skip: int, limit: int) -> dict:
+    """Ranked page of hackathon documents plus total and facet counts."""
+    clauses = filter_clauses(themes, locations, prizes)
+    out = next(hackathons_col.aggregate(build_pipeline(q, clauses, sort, skip, limit)), None) or {}
+    prize_counts = {b['_id']: b['count'] for b in out.get('prize', [])}
+    return {
+        'results': out.get('results', []),
+        'total': (out.get('total') or [{'n': 0}])[0]['n'],
+        'facets': {
+            'theme': [{'value': f['_id'], 'count': f['count']} for f in out.get('theme', []) if f['_id']],
+            'locationType': [{'value': f['_id'], 'count': f['count']} for f in out.get('locationType', []) if f['_id']],
+            'prize': [
+                {'value': prize_label(lower), 'count': prize_counts.get(lower, 0)}
+                for lower in PRIZE_BOUNDARIES
+            ],
+        },
+    }
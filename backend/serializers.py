@@ -0,0 +1,201 @@
+"""
+Public shapes of the domain documents, shared by the Flask views, async views
+and exports so each entity is serialized one way everywhere. Values may be
+left as datetime/ObjectId; the app's JSON provider (json_provider.py) encodes
+them, but ids are stringified here because clients compare them as strings.
+"""
+
+from typing import Optional
+
+
+def to_iso(val):
+    return val.isoformat() if hasattr(val, 'isoformat') else (val or '')
+
+
+def normalize_rounds(rounds) -> list:
+    # Normalize rounds to include 'start'/'end' if only 'date' exists
+    normalized = []
+    for r in (rounds or []):
+        if isinstance(r, dict):
+            normalized.append({
+                'name': r.get('name', ''),
+                'description': r.get('description', ''),
+                'start': r.get('start') or r.get('date') or '',
+                'end': r.get('end') or '',
+            })
+    return normalized
+
+
+# --- Hackathons ---
+
+# Fields hackathon_card reads; long text (description, rules, faq...) is only served by /get
+CARD_PROJECTION = {
+    'name': 1, 'theme': 1, 'date': 1, 'start_date': 1, 'end_date': 1, 'rounds': 1,
+    'prize': 1, 'locationType': 1, 'image': 1, 'hint': 1, 'tracks': 1, 'created_at': 1,
+}
+
+
+def hackathon_card(h: dict) -> dict:
+    """Fields rendered by hackathon cards (/list)."""
+    return {
+        'id': str(h['_id']),
+        'name': h.get('name', ''),
+        'theme': h.get('theme', ''),
+        'date': h.get('date', ''),
+        'start_date': h.get('start_date', h.get('date', '')),
+        'end_date': h.get('end_date', ''),
+        'rounds': normalize_rounds(h.get('rounds')),
+        'prize': h.get('prize', 0),
+        'locationType': h.get('locationType', 'online'),
+        'image': h.get('image', ''),
+        'hint': h.get('hint', ''),
+        'tracks': h.get('tracks', []),
+    }
+
+
+def hackathon_detail(h: dict) -> dict:
+    """Public detail page (/get) including the denormalized counters."""
+    return {
+        **hackathon_card(h),
+        'location': h.get('location'),
+        'description': h.get('description', ''),
+        'rules': h.get('rules', ''),
+        'team_size': h.get('team_size', 0),
+        'prizes': h.get('prizes', ''),
+        'sponsors': h.get('sponsors', []),
+        'faq': h.get('faq', []),
+        'registration_count': h.get('registration_count', 0),
+        'team_count': h.get('team_count', 0),
+    }
+
+
+def hackathon_for_organizer(h: dict) -> dict:
+    card = hackathon_card(h)
+    card.pop('tracks')
+    return {
+        **card,
+        'description': h.get('description', ''),
+        'registration_count': h.get('registration_count', 0),
+        'team_count': h.get('team_count', 0),
+        'created_at': to_iso(h.get('created_at', '')),
+    }
+
+
+def hackathon_registered(h: dict) -> dict:
+    """A hackathon in the participant's own registrations list."""
+    return {
+        'id': str(h['_id']),
+        'name': h.get('name', ''),
+        'theme': h.get('theme', ''),
+        'date': h.get('date', ''),
+        'rounds': h.get('rounds', []),
+        'prize': h.get('prize', 0),
+        'locationType': h.get('locationType', 'online'),
+        'image': h.get('image', ''),
+        'hint': h.get('hint', ''),
+        'description': h.get('description', ''),
+        'registrationStatus': 'Confirmed',
+    }
+
+
+# --- Teams ---
+
+def team_public(team: dict, user_map: dict, mark_leader: bool = False) -> dict:
+    """Team with members resolved from user_map ({str(user id): user doc})."""
+    leader_id = str(team.get('leader_id', ''))
+    members = []
+    for member_id in team.get('members', []):
+        user = user_map.get(str(member_id), {})
+        member = {
+            'id': str(member_id),
+            'name': user.get('name', 'Unknown'),
+            'email': user.get('email', ''),
+        }
+        if mark_leader:
+            member['isLeader'] = str(member_id) == leader_id
+        members.append(member)
+    return {
+        'id': str(team['_id']),
+        'name': team.get('name', ''),
+        'description': team.get('description', ''),
+        'code': team.get('code', ''),
+        'leader_id': leader_id,
+        'members': members,
+        'max_members': 5,
+        'created_at': to_iso(team.get('created_at', '')),
+    }
+
+
+def team_summary(team: dict) -> dict:
+    return {
+        'team_id': str(team['_id']),
+        'team_name': team.get('name', ''),
+        'team_code': team.get('code', ''),
+    }
+
+
+def team_message(msg: dict, sender_name: str) -> dict:
+    return {
+        'id': str(msg['_id']),
+        'sender_id': str(msg['sender_id']),
+        'sender_name': sender_name,
+        'message': msg.get('message', ''),
+        'timestamp': to_iso(msg.get('created_at', '')),
+    }
+
+
+# --- Participants ---
+
+def participant_public(reg: dict, user: dict, team_info: Optional[dict]) -> dict:
+    """Public-safe participant (Find Team page)."""
+    return {
+        'id': str(reg.get('user_id')) if reg.get('user_id') else '',
+        'name': reg.get('full_name') or user.get('name', 'Unknown'),
+        'looking_for_team': reg.get('looking_for_team', True),
+        'skills': reg.get('skills', []),
+        'role': reg.get('role', ''),
+        'team': team_info,
+    }
+
+
+def participant_for_organizer(reg: dict, user: dict, team_info: Optional[dict]) -> dict:
+    return {
+        'id': str(reg['user_id']),
+        'name': reg.get('full_name') or user.get('name', 'Unknown'),
+        'email': user.get('email', ''),
+        'motivation': reg.get('motivation', ''),
+        'portfolio_link': reg.get('portfolio_link', ''),
+        'looking_for_team': reg.get('looking_for_team', True),
+        'team_code': reg.get('team_code', ''),
+        'role': reg.get('role', ''),
+        'skills': reg.get('skills', []),
+        'experience_level': reg.get('experience_level', ''),
+        'github': reg.get('github', ''),
+        'linkedin': reg.get('linkedin', ''),
+        'resume_link': reg.get('resume_link', ''),
+        'registration_date': to_iso(reg.get('created_at') or ''),
+        'team': team_info,
+    }
+
+
+# --- Submissions ---
+
+def submission_public(s: dict) -> dict:
+    return {
+        'id': str(s['_id']),
+        'hackathon_id': str(s.get('hackathon_id', '')),
+        'team_id': str(s.get('team_id', '')),
+        'team_name': s.get('team_name', ''),
+        'project_title': s.get('project_title', ''),
+        'project_description': s.get('project_description', ''),
+        'tech_stack': s.get('tech_stack', []),
+        'github_link': s.get('github_link'),
+        'video_link': s.get('video_link'),
+        'files': s.get('files', []),
+        'status': s.get('status', 'draft'),
+        'score': s.get('score'),
+        'feedback': s.get('feedback'),
+        'submitted_at': to_iso(s.get('submitted_at') or s.get('created_at') or ''),
+        'updated_at': to_iso(s.get('updated_at') or ''),
+        'created_at': to_iso(s.get('created_at') or ''),
+    }
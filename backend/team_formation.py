@@ -0,0 +1,204 @@
+"""
+Organizer-triggered auto team formation for a hackathon's solo registrants.
+
+Registrants who are looking for a team and are not on one are split into
+n // team_size teams (more if that would overfill max_members) whose sizes
+differ by at most one, so a remainder joins existing teams instead of forming
+a team of one. They are ordered by role, then experience and skill count, and
+dealt out in a snake draft, so each role and experience band is spread across
+the teams instead of clumping. All teams are written with insert_many and the
+placed registrations are flagged in a single update_many, so tens of
+thousands of registrants take a handful of round trips.
+
+Only one run per hackathon writes at a time (a lease on the hackathon
+document). Someone who joined a team by hand while the run was writing ends
+up on both; resolve_double_membership keeps them on the older team and pulls
+them from the other (dissolving an auto team left with one member), and the
+manual join paths run it too.
+"""
+
+from datetime import datetime, timedelta
+import math
+import os
+import random
+import string
+
+from db import collection
+from matching import experience, skill_terms
+
+hackathons_col = collection('hackathons')
+registrations_col = collection('registrations')
+teams_col = collection('teams')
+
+CODE_ALPHABET = string.ascii_uppercase + string.digits
+WRITE_BATCH_SIZE = 1000
+# Longest a crashed run can keep the hackathon locked
+FORMATION_LOCK_SECONDS = float(os.environ.get('FORMATION_LOCK_SECONDS', '300'))
+
+
+class FormationInProgress(Exception):
+    """Another auto team formation run holds the hackathon's lock."""
+
+
+def unteamed_registrants(hackathon_id) -> list:
+    in_team = set(teams_col.distinct('members', {'hackathon_id': hackathon_id}))
+    regs = registrations_col.find(
+        {'hackathon_id': hackathon_id, 'looking_for_team': True},
+        {'user_id': 1, 'full_name': 1, 'skills': 1, 'role': 1, 'experience_level': 1},
+    )
+    return [reg for reg in regs if reg['user_id'] not in in_team]
+
+
+def partition(regs: list, team_size: int, max_members: int = None) -> list:
+    """Balanced teams (lists of registrations) of team_size members; the
+    remainder is spread over them, as long as no team exceeds max_members."""
+    if len(regs) < 2:
+        return []
+    n_teams = max(len(regs) // team_size, math.ceil(len(regs) / (max_members or len(regs))), 1)
+    ordered = sorted(regs, key=lambda r: (
+        (r.get('role') or '').strip().lower(),
+        -experience(r.get('experience_level')),
+        -len(skill_terms(r.get('skills'))),
+    ))
+    teams = [[] for _ in range(n_teams)]
+    for i, reg in enumerate(ordered):
+        lap, pos = divmod(i, n_teams)
+        teams[pos if lap % 2 == 0 else n_teams - 1 - pos].append(reg)
+    return teams
+
+
+def unique_codes(n: int, rng: random.Random) -> list:
+    """n team codes, none used by an existing team (one lookup per round)."""
+    codes = set()
+    while len(codes) < n:
+        batch = {''.join(rng.choices(CODE_ALPHABET, k=6)) for _ in range(n - len(codes))} - codes
+        taken = set(teams_col.distinct('code', {'code': {'$in': list(batch)}}))
+        codes |= batch - taken
+    return list(codes)
+
+
+def extra_memberships(teams, user_ids) -> list:
+    """(team_id, user_id) for every membership of the given users beyond their
+    oldest (lowest _id) team in `teams`."""
+    wanted = set(user_ids)
+    kept = {}
+    extra = []
+    for team in sorted(teams, key=lambda t: t['_id']):
+        for uid in team.get('members', []):
+            if uid not in wanted:
+                continue
+            if uid in kept:
+                extra.append((team['_id'], uid))
+            else:
+                kept[uid] = team['_id']
+    return extra
+
+
+def resolve_double_membership(hackathon_id, user_ids: list) -> list:
+    """Pull users found on more than one team of the hackathon from all but
+    their oldest team; returns the (team_id, user_id) pairs pulled. A leader
+    pulled from a team hands it to its first remaining member."""
+    if not user_ids:
+        return []
+    extra = extra_memberships(teams_col.find(*memberships_query(hackathon_id, user_ids)), user_ids)
+    for team_id, uid in extra:
+        teams_col.update_one({'_id': team_id}, pull_member_update(uid))
+        team = teams_col.find_one({'_id': team_id, 'leader_id': uid}, {'members': 1})
+        if team and team.get('members'):
+            teams_col.update_one({'_id': team_id}, {'$set': {'leader_id': team['members'][0]}})
+    return extra
+
+
+def memberships_query(hackathon_id, user_ids: list) -> tuple:
+    return {'hackathon_id': hackathon_id, 'members': {'$in': user_ids}}, {'members': 1}
+
+
+def pull_member_update(user_id) -> dict:
+    return {'$pull': {'members': user_id}, '$set': {'updated_at': datetime.utcnow()}}
+
+
+def acquire_lock(hackathon_id) -> bool:
+    now = datetime.utcnow()
+    return hackathons_col.update_one(
+        {'_id': hackathon_id, '$or': [
+            {'auto_teams_locked_until': {'$exists': False}},
+            {'auto_teams_locked_until': {'$lt': now}},
+        ]},
+        {'$set': {'auto_teams_locked_until': now + timedelta(seconds=FORMATION_LOCK_SECONDS)}},
+    ).modified_count == 1
+
+
+def release_lock(hackathon_id):
+    hackathons_col.update_one({'_id': hackathon_id}, {'$unset': {'auto_teams_locked_until': ''}})
+
+
+def form_teams(hackathon_id, team_size: int, max_members: int, dry_run: bool = False, rng=None) -> list:
+    """Partition the unteamed registrants and create their teams; returns the
+    team documents. Raises FormationInProgress while another run is writing."""
+    if dry_run:
+        return plan_teams(hackathon_id, team_size, max_members, rng)
+    if not acquire_lock(hackathon_id):
+        raise FormationInProgress()
+    try:
+        return write_teams(hackathon_id, plan_teams(hackathon_id, team_size, max_members, rng))
+    finally:
+        release_lock(hackathon_id)
+
+
+def plan_teams(hackathon_id, team_size: int, max_members: int, rng=None) -> list:
+    groups = partition(unteamed_registrants(hackathon_id), team_size, max_members)
+    if not groups:
+        return []
+    codes = unique_codes(len(groups), rng or random.SystemRandom())
+    now = datetime.utcnow()
+    docs = []
+    for group, code in zip(groups, codes):
+        # The most experienced member leads
+        group.sort(key=lambda r: -experience(r.get('experience_level')))
+        docs.append({
+            'hackathon_id': hackathon_id,
+            'name': f'Team {code}',
+            'description': 'Formed automatically by the organizer',
+            'code': code,
+            'leader_id': group[0]['user_id'],
+            'members': [r['user_id'] for r in group],
+            'max_members': max_members,
+            'auto_formed': True,
+            'created_at': now,
+            'updated_at': now,
+        })
+    return docs
+
+
+def write_teams(hackathon_id, docs: list) -> list:
+    if not docs:
+        return docs
+    now = docs[0]['created_at']
+    for i in range(0, len(docs), WRITE_BATCH_SIZE):
+        teams_col.insert_many(docs[i:i + WRITE_BATCH_SIZE], ordered=False)
+    placed = [m for doc in docs for m in doc['members']]
+    for i in range(0, len(placed), WRITE_BATCH_SIZE * 10):
+        registrations_col.update_many(
+            {'hackathon_id': hackathon_id, 'user_id': {'$in': placed[i:i + WRITE_BATCH_SIZE * 10]}},
+            {'$set': {'looking_for_team': False, 'updated_at': now}},
+        )
+
+    # Manual joins that raced with this run: the older team keeps the member
+    pulled = resolve_double_membership(hackathon_id, placed)
+    if not pulled:
+        return docs
+    by_id = {doc['_id']: doc for doc in docs}
+    for team_id, uid in pulled:
+        if team_id in by_id:
+            by_id[team_id]['members'].remove(uid)
+            if by_id[team_id]['leader_id'] == uid and by_id[team_id]['members']:
+                by_id[team_id]['leader_id'] = by_id[team_id]['members'][0]
+    # A team left with one member is dissolved; they wait for the next run
+    lone = [doc for doc in docs if len(doc['members']) < 2]
+    if lone:
+        teams_col.delete_many({'_id': {'$in': [doc['_id'] for doc in lone]}, 'auto_formed': True})
+        registrations_col.update_many(
+            {'hackathon_id': hackathon_id, 'user_id': {'$in': [m for doc in lone for m in doc['members']]}},
+            {'$set': {'looking_for_team': True, 'updated_at': now}},
+        )
+    return [doc for doc in docs if len(doc['members']) >= 2]
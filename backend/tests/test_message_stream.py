@@ -0,0 +1,104 @@
+"""
+Team message stream (hackathons.message_events) against the in-process broker
+and mongomock:
+
+    pip install pytest mongomock==4.3.0
+    python -m pytest backend/tests
+"""
+
+from datetime import datetime, timedelta
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bson import ObjectId  # noqa: E402
+
+import db  # noqa: E402
+import hackathons  # noqa: E402
+from pubsub import Broker  # noqa: E402
+import serializers  # noqa: E402
+
+
+@pytest.fixture
+def team(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(db, 'get_client', lambda: client)
+    monkeypatch.setattr(db, 'get_db', lambda: client['test'])
+    monkeypatch.setattr(hackathons, 'MESSAGE_STREAM_HEARTBEAT', 0.2)
+    monkeypatch.setattr(hackathons, 'MESSAGE_STREAM_OVERLAP', 0.1)
+    monkeypatch.setattr(hackathons, 'MESSAGE_STREAM_MAX_SECONDS', 1.5)
+    user_id = ObjectId()
+    hackathons.users_col.insert_one({'_id': user_id, 'name': 'Ada'})
+    team_id = hackathons.teams_col.insert_one({'hackathon_id': ObjectId(), 'members': [user_id]}).inserted_id
+    return team_id, user_id
+
+
+def insert_message(team_id, user_id, text, created_at=None) -> dict:
+    doc = {'team_id': team_id, 'sender_id': user_id, 'message': text, 'created_at': created_at or datetime.utcnow()}
+    hackathons.team_messages_col.insert_one(doc)
+    return doc
+
+
+def sent_ids(lines) -> list:
+    return [line.split('\n', 1)[0][len('id: '):] for line in lines if line.startswith('id: ')]
+
+
+def test_broker_fans_out_and_drops_for_full_queues():
+    broker = Broker(queue_size=1)
+    a, b = broker.subscribe('t'), broker.subscribe('t')
+    assert broker.publish('t', 1) == 2
+    a.get(timeout=0)
+    assert broker.publish('t', 2) == 1  # b never drained
+    assert a.get(timeout=0) == 2 and b.get(timeout=0) == 1 and b.get(timeout=0) is None
+    a.close()
+    b.close()
+    assert broker.subscriber_count('t') == 0
+
+
+def test_catch_up_runs_while_local_messages_keep_arriving(team):
+    team_id, user_id = team
+    broker = Broker()
+    events = hackathons.message_events(team_id, broker=broker)
+    next(events)  # subscribed and started
+
+    # Written by another worker: only a catch-up from MongoDB can deliver it
+    remote = insert_message(team_id, user_id, 'from another worker')
+    local = []
+
+    def send_locally():
+        # Busier than the heartbeat, for longer than the overlap
+        for i in range(12):
+            doc = insert_message(team_id, user_id, f'local {i}')
+            local.append(str(doc['_id']))
+            broker.publish(str(team_id), serializers.team_message(doc, 'Ada'))
+            time.sleep(0.06)
+
+    sender = threading.Thread(target=send_locally)
+    sender.start()
+    ids = sent_ids(events)
+    sender.join()
+
+    assert str(remote['_id']) in ids
+    assert set(local) <= set(ids)
+    assert len(ids) == len(set(ids))
+    assert broker.subscriber_count(str(team_id)) == 0
+
+
+def test_resume_replays_overlap_once_and_picks_up_late_inserts(team):
+    team_id, user_id = team
+    now = datetime.utcnow()
+    first = insert_message(team_id, user_id, 'first', now - timedelta(seconds=0.05))
+    last = insert_message(team_id, user_id, 'last', now)
+    events = hackathons.message_events(team_id, last_id=str(last['_id']), broker=Broker())
+    next(events)
+    # Visible late, dated before the newest message already sent
+    late = insert_message(team_id, user_id, 'late', now - timedelta(seconds=0.02))
+
+    ids = sent_ids(events)
+    assert ids == [str(first['_id']), str(late['_id'])]
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+import os
+import time
+from typing import Optional
+
+import jwt
+
+from cache import TTLCache
+
+
+JWT_SECRET = os.environ.get('JWT_SECRET', 'change_me_dev_secret')
+JWT_EXPIRES_MINUTES = int(os.environ.get('JWT_EXPIRES_MINUTES', '60'))
+JWT_CACHE_SIZE = int(os.environ.get('JWT_CACHE_SIZE', '4096'))
+# Upper bound on how long verified claims are reused; never past the token's exp
+JWT_CACHE_TTL = float(os.environ.get('JWT_CACHE_TTL', '300'))
+
+# sha256(token) -> verified claims. Only successful verifications are cached.
+jwt_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL)
+
+
+def create_jwt(user_id: str, email: str, user_type: str, name: str) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        'sub': user_id,
+        'email': email,
+        'user_type': user_type,
+        'name': name,
+        'iat': int(now.timestamp()),
+        'exp': int((now + timedelta(minutes=JWT_EXPIRES_MINUTES)).timestamp()),
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm='HS256')
+
+
+def verify_jwt(token: str) -> Optional[dict]:
+    """Full HS256 verification, bypassing the cache."""
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
+    except Exception:
+        return None
+
+
+def decode_jwt(token: str) -> Optional[dict]:
+    if not token:
+        return None
+    key = hashlib.sha256(token.encode()).digest()
+    claims = jwt_cache.get(key)
+    if claims is not None:
+        # Entries never outlive exp, but the monotonic TTL and wall clock can drift
+        if claims.get('exp', 0) > time.time():
+            return dict(claims)
+        jwt_cache.delete(key)
+    claims = verify_jwt(token)
+    if claims is None:
+        return None
+    remaining = claims.get('exp', 0) - time.time()
+    if remaining > 0:
+        jwt_cache.set(key, claims, ttl=min(JWT_CACHE_TTL, remaining))
+    return dict(claims)
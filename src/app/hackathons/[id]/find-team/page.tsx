@@ -27,19 +27,21 @@ import {
 } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
 import { useParams, useRouter } from "next/navigation";
-import { apiService } from "@/lib/api";
+import { apiService, PublicParticipant } from "@/lib/api";
 import { getCookie } from "@/hooks/use-auth";
 import Link from "next/link";
-import { Team, SoloParticipant } from "@/lib/data";
 
- 
+
+const SOLO_PAGE_SIZE = 50;
 
 export default function FindTeamPage() {
   const [filter, setFilter] = useState("teams");
   const [searchTerm, setSearchTerm] = useState("");
   const { toast } = useToast();
   const [teams, setTeams] = useState<any[]>([]);
-  const [soloParticipants, setSoloParticipants] = useState<SoloParticipant[]>([]);
+  const [soloParticipants, setSoloParticipants] = useState<PublicParticipant[]>([]);
+  const [soloCursor, setSoloCursor] = useState<string | null>(null);
+  const [loadingMoreSolo, setLoadingMoreSolo] = useState(false);
   const [loading, setLoading] = useState(true);
   const [requestedTeams, setRequestedTeams] = useState<string[]>([]);
   const [invitedParticipants, setInvitedParticipants] = useState<string[]>([]);
@@ -48,7 +50,7 @@ export default function FindTeamPage() {
   // AI matcher state
   const [aiSkills, setAiSkills] = useState("");
   const [aiInterests, setAiInterests] = useState("");
-  const [aiMatches, setAiMatches] = useState<SoloParticipant[]>([]);
+  const [aiMatches, setAiMatches] = useState<PublicParticipant[]>([]);
   const [aiSearching, setAiSearching] = useState(false);
   const [creating, setCreating] = useState(false);
   const [teamName, setTeamName] = useState("");
@@ -71,17 +73,14 @@ export default function FindTeamPage() {
         return;
       }
 
-      // Load teams
-      const teamsRes = await apiService.listTeams(hackathonId);
+      // Load teams that still have room
+      const teamsRes = await apiService.listTeams(hackathonId, { open: true });
       setTeams(teamsRes.teams || []);
 
-      // Load participants (public-safe) scoped to this hackathon
-      const base = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:5000';
-      const url = new URL(`/hackathons/participants/public/${encodeURIComponent(hackathonId)}`, base).toString();
-      const resp = await fetch(url, { cache: 'no-store' });
-      const participantsRes = await resp.json();
-      const solo = (participantsRes.participants || []).filter((p: any) => !p.team);
-      setSoloParticipants(solo);
+      // First page of the participants not on a team yet (public-safe)
+      const participantsRes = await apiService.listPublicParticipants(hackathonId, { inTeam: false, limit: SOLO_PAGE_SIZE });
+      setSoloParticipants(participantsRes.participants || []);
+      setSoloCursor(participantsRes.next_cursor || null);
       if (token) {
         try {
           const invRes = await apiService.listInvitations(token);
@@ -98,6 +97,20 @@ export default function FindTeamPage() {
     }
   };
 
+  const loadMoreSolo = async () => {
+    if (!soloCursor) return;
+    try {
+      setLoadingMoreSolo(true);
+      const res = await apiService.listPublicParticipants(hackathonId, { inTeam: false, limit: SOLO_PAGE_SIZE, cursor: soloCursor });
+      setSoloParticipants(prev => [...prev, ...(res.participants || [])]);
+      setSoloCursor(res.next_cursor || null);
+    } catch (error: any) {
+      toast({ title: 'Error', description: error.message || 'Failed to load participants' });
+    } finally {
+      setLoadingMoreSolo(false);
+    }
+  };
+
   const handleRequestToJoin = async (teamId: string, teamName: string) => {
     try {
       const token = getCookie('authToken');
@@ -254,7 +267,7 @@ export default function FindTeamPage() {
                       <CardContent className="p-4 flex items-center justify-between">
                         <div className="flex items-center gap-3">
                           <Avatar className="h-10 w-10">
-                            <AvatarImage src={participant.avatar} />
+                            <AvatarImage src="" />
                             <AvatarFallback>{getInitials(participant.name)}</AvatarFallback>
                           </Avatar>
                           <div>
@@ -420,11 +433,11 @@ export default function FindTeamPage() {
                   </div>
                 ) : (
                   filteredParticipants.map(participant => (
-                    <Card key={participant.name} className="bg-secondary/50">
+                    <Card key={participant.id} className="bg-secondary/50">
                       <CardContent className="p-6 flex justify-between items-center">
                         <div className="flex items-center gap-4">
                           <Avatar className="h-12 w-12">
-                            <AvatarImage src={participant.avatar} />
+                            <AvatarImage src="" />
                             <AvatarFallback>{getInitials(participant.name)}</AvatarFallback>
                           </Avatar>
                           <div>
@@ -471,6 +484,13 @@ export default function FindTeamPage() {
                     </Card>
                   ))
                 )}
+                {soloCursor && (
+                  <div className="flex justify-center">
+                    <Button variant="outline" onClick={loadMoreSolo} disabled={loadingMoreSolo}>
+                      {loadingMoreSolo ? 'Loading...' : 'Load more participants'}
+                    </Button>
+                  </div>
+                )}
               </div>
             )}
 
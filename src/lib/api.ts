@@ -91,6 +91,19 @@ export interface Participant {
   };
 }
 
+export interface PublicParticipant {
+  id: string;
+  name: string;
+  looking_for_team: boolean;
+  skills: string[];
+  role: string;
+  team: {
+    team_id: string;
+    team_name: string;
+    team_code: string;
+  } | null;
+}
+
 export interface Submission {
   id: string;
   hackathon_id: string;
@@ -142,6 +155,58 @@ export interface UpdateSubmissionRequest {
   };
 }
 
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+export interface HackathonSearchResponse {
+  hackathons: any[];
+  total: number;
+  facets: { theme: FacetCount[]; locationType: FacetCount[]; prize: FacetCount[] };
+  next_offset: number | null;
+}
+
+export interface TeammateMatch {
+  user_id: string;
+  name: string;
+  skills: string[];
+  complementary_skills: string[];
+  score: number;
+}
+
+export interface TeamMatch {
+  team_id: string;
+  name: string;
+  members: number;
+  score: number;
+  skills_you_add: string[];
+}
+
+export interface PurgeJob {
+  id: string;
+  hackathon_id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  total: Record<string, number>;
+  deleted: Record<string, number>;
+  error?: string | null;
+  created_at: string;
+  finished_at?: string | null;
+}
+
+export interface RegistrationImportResult {
+  summary: {
+    rows: number;
+    created: number;
+    updated: number;
+    error: number;
+    truncated: boolean;
+    max_rows: number;
+    seconds: number;
+  };
+  rows: { row: number; status: 'created' | 'updated' | 'error'; user_id?: string; error?: string }[];
+}
+
 class ApiService {
   private baseUrl: string;
 
@@ -231,6 +296,27 @@ class ApiService {
     return this.request<{ hackathons: any[] }>('/hackathons/list');
   }
 
+  async searchHackathons(params: {
+    q?: string;
+    theme?: string[];
+    locationType?: string[];
+    prize?: string[];
+    sort?: 'relevance' | 'newest' | 'prize_desc' | 'prize_asc';
+    limit?: number;
+    offset?: number;
+  } = {}): Promise<HackathonSearchResponse> {
+    const query = new URLSearchParams();
+    if (params.q) query.set('q', params.q);
+    if (params.theme?.length) query.set('theme', params.theme.join(','));
+    if (params.locationType?.length) query.set('locationType', params.locationType.join(','));
+    if (params.prize?.length) query.set('prize', params.prize.join(','));
+    if (params.sort) query.set('sort', params.sort);
+    if (params.limit) query.set('limit', String(params.limit));
+    if (params.offset) query.set('offset', String(params.offset));
+    const qs = query.toString();
+    return this.request<HackathonSearchResponse>(`/hackathons/search${qs ? `?${qs}` : ''}`);
+  }
+
   async getHackathon(id: string): Promise<any> {
     return this.request<any>(`/hackathons/get/${id}`);
   }
@@ -294,8 +380,41 @@ class ApiService {
     });
   }
 
-  async listTeams(hackathonId: string): Promise<{ teams: Team[] }> {
-    return this.request<{ teams: Team[] }>(`/hackathons/teams/list/${hackathonId}`);
+  async listTeams(
+    hackathonId: string,
+    params: { open?: boolean; limit?: number; cursor?: string } = {}
+  ): Promise<{ teams: Team[]; next_cursor?: string | null }> {
+    const query = new URLSearchParams();
+    if (params.open) query.set('open', '1');
+    if (params.limit) query.set('limit', String(params.limit));
+    if (params.cursor) query.set('cursor', params.cursor);
+    const qs = query.toString();
+    return this.request<{ teams: Team[]; next_cursor?: string | null }>(`/hackathons/teams/list/${hackathonId}${qs ? `?${qs}` : ''}`);
+  }
+
+  async listPublicParticipants(
+    hackathonId: string,
+    params: { inTeam?: boolean; limit?: number; cursor?: string } = {}
+  ): Promise<{ participants: PublicParticipant[]; next_cursor?: string | null }> {
+    const query = new URLSearchParams();
+    if (params.inTeam !== undefined) query.set('in_team', params.inTeam ? '1' : '0');
+    if (params.limit) query.set('limit', String(params.limit));
+    if (params.cursor) query.set('cursor', params.cursor);
+    const qs = query.toString();
+    return this.request<{ participants: PublicParticipant[]; next_cursor?: string | null }>(
+      `/hackathons/participants/public/${encodeURIComponent(hackathonId)}${qs ? `?${qs}` : ''}`
+    );
+  }
+
+  async matchTeammates(
+    token: string,
+    hackathonId: string,
+    params: { k?: number; kind?: 'participants' | 'teams' | 'all' } = {}
+  ): Promise<{ participants?: TeammateMatch[]; teams?: TeamMatch[] }> {
+    return this.request<{ participants?: TeammateMatch[]; teams?: TeamMatch[] }>(`/hackathons/match/${hackathonId}`, {
+      method: 'POST',
+      body: JSON.stringify({ token, ...params }),
+    });
   }
 
   async joinTeam(token: string, hackathonId: string, teamCode: string): Promise<{ message: string }> {
@@ -398,13 +517,37 @@ class ApiService {
     });
   }
 
-  async deleteHackathon(token: string, hackathonId: string): Promise<{ message: string }> {
-    return this.request<{ message: string }>(`/hackathons/organizer/delete/${hackathonId}`, {
+  async deleteHackathon(token: string, hackathonId: string): Promise<{ message: string; purge_job_id?: string }> {
+    return this.request<{ message: string; purge_job_id?: string }>(`/hackathons/organizer/delete/${hackathonId}`, {
       method: 'DELETE',
       body: JSON.stringify({ token }),
     });
   }
 
+  // Background cleanup of a deleted hackathon's messages and submissions
+  async getPurgeProgress(token: string, jobId: string): Promise<{ job: PurgeJob }> {
+    return this.request<{ job: PurgeJob }>(`/hackathons/organizer/purge/${jobId}`, {
+      method: 'POST',
+      body: JSON.stringify({ token }),
+    });
+  }
+
+  // CSV (header row) or NDJSON of existing accounts, by email or user_id
+  async importRegistrations(token: string, hackathonId: string, file: File, errorsOnly = false): Promise<RegistrationImportResult> {
+    const formData = new FormData();
+    formData.append('token', token);
+    formData.append('file', file);
+
+    return this.request<RegistrationImportResult>(
+      `/hackathons/organizer/registrations/import/${hackathonId}${errorsOnly ? '?report=errors' : ''}`,
+      {
+        method: 'POST',
+        body: formData,
+        headers: {}, // Let browser set content-type for FormData
+      },
+    );
+  }
+
   async updateHackathon(token: string, hackathonId: string, updates: any): Promise<{ message: string }> {
     return this.request<{ message: string }>(`/hackathons/organizer/update/${hackathonId}`, {
       method: 'PUT',